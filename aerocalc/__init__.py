@@ -45,6 +45,12 @@
 #                   * Added some meat to SSEC module
 #                   * Added interpolator module, with functions for linear
 #                     interpolation in one, two or three dimensions
+# 0.14   18 Oct 26   * Submodules are imported on first use (PEP 562), so
+#                      that importing the package does not import numpy.
+#                    * Added batch module, to convert delimited air data
+#                      files with the airspeed functions.
+#                    * Added memo module, an opt-in memo of the scalar
+#                      airspeed and standard atmosphere conversions.
 #
 # #############################################################################
 #
@@ -57,7 +63,6 @@
 #
 # #############################################################################
 
-from . import airspeed, constants, default_units, std_atm, unit_conversion
 """Various aeronautical engineering calculations
 
 This package contains the following modules:
@@ -65,12 +70,17 @@ This package contains the following modules:
 airspeed        - airspeed conversions and calculations.  Provides interactive
                   mode when run directly, e.g. 'python airspeed.py'
 airspeed_p3k    - Python 3 compatible variant of airspeed module.
+batch           - convert delimited air data files with the airspeed
+                  functions, e.g. 'python -m aerocalc.batch cas2tas'.
 default_units   - defines default units to be used by all modules.  May be
-                  overridden by a user units file.
+                  overridden by a user units file, or per thread or asyncio
+                  task with the units() context manager.
 cd              - drag related calculations.
 cl              - lift related calculations.
 constants       - constants used by all modules.
 interpolator    - linear interpolation in one, two or three dimensions
+memo            - opt-in memo of the scalar airspeed and standard atmosphere
+                  conversions, for tables and sweeps.
 ssec            - static source error correction calculations.
 std_atm         - standard atmosphere parametres and calculations.
 unit_conversion - convert various aeronautical parametres between commonly
@@ -83,3 +93,32 @@ E-mail: kevin01 -at- kilohotel.com
 """
 
 VERSION = '0.13.2'
+
+import sys
+
+_SUBMODULES = ('airspeed', 'batch', 'cd', 'cl', 'constants',
+               'default_units', 'interpolator', 'memo', 'ssec', 'std_atm',
+               'unit_conversion', 'val_input')
+
+if sys.version_info < (3, 7):
+
+    # no module __getattr__, so import the submodules that were always
+    # imported with the package
+
+    from . import airspeed, constants, default_units, std_atm, unit_conversion
+
+
+def __getattr__(name):
+    """
+    Import a submodule the first time it is used, e.g. aerocalc.std_atm.
+    """
+
+    if name in _SUBMODULES:
+        module = __name__ + '.' + name
+        __import__(module)
+        return sys.modules[module]
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
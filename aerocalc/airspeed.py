@@ -44,16 +44,30 @@
 # 0.28   18 Nov 08   Add ioat2tas
 # 0.29   30 Jun 09   Python 3.0 compatibility
 # 0.30   11 Mar 11   Rework interactive mode to remember the last function used
+# 0.31   18 Oct 26   Solve supersonic dp2cas by Newton's method, over arrays
+#                    dp_over_p2mach, mach2dp_over_p and cas2dp work on arrays
+#                    All speed conversions work on arrays, and compute the
+#                    static pressure and density once per call
+#                    Add air_data
+#                    Temperatures may be a std_atm.Atmosphere
+#                    ioat2tas finds the mach number from the CAS and altitude,
+#                    then the temperature and TAS, over arrays and in both
+#                    regimes.  mach2temp and tas2temp accept arrays.
+#                    The interactive mode imports val_input and ast when
+#                    it is used, not at import
+#                    Add batch conversion of delimited files, in the batch
+#                    module
+#                    The scalar conversions use the memo module, when it is
+#                    enabled
+#                    dp2eas, dp2tas, eas2dp and tas2dp, and the EAS and TAS
+#                    conversions built on them, work at supersonic speeds,
+#                    with the delta pressure to speed relations shared with
+#                    dp2cas and cas2dp
 # #############################################################################
 #
 # To Do:  1. Add functions:
 #
-#         2. Extend the following functions to work at M > 1 and CAS > 661.48:
-#             dp_over_p2mach
-#             dp2eas
-#             dp2tas
-#             eas2dp
-#             tas2dp
+#         2. Done.
 #
 #         3. Test the following functions:
 #             cas2eas
@@ -76,7 +90,13 @@
 #         8. Done.
 #
 #
-# Done    7. Rework the interactive functions to respect the default units.
+# Done    2. Extend the following functions to work at M > 1 and CAS > 661.48:
+#             dp2eas
+#             dp2tas
+#             eas2dp
+#             tas2dp
+#
+#         7. Rework the interactive functions to respect the default units.
 #
 #         8. Rework interactive functions to share data between runs.
 
@@ -94,18 +114,24 @@ Equivalent Air Speed (EAS), True Air Speed (TAS) and mach number.
 
 Convert between pitot static system pressures and air speed.
 
+The conversions accept scalars or arrays for the speeds, pressures,
+altitudes and temperatures.  Arrays are broadcast against each other, so
+whole time histories may be reduced in one call.  The temperature may also be
+a std_atm.Atmosphere, for a non-standard day.
+
 Provide interactive airspeed conversions when script is run directly, e.g.
-'python airspeed.py'.
+'python airspeed.py'.  Delimited data files are converted without prompting
+by the batch module, e.g. 'python -m aerocalc.batch cas2tas < data.csv'.
 
 Not compatible with Python 3.  For Python 3, use airspeed_p3k.
 """
 
 import numpy as np
-import ast
 
 from . import std_atm as SA
+from .std_atm import _to_array, _from_array
 from . import constants
-from .val_input import safe_input
+from . import memo
 
 try:
     from .default_units import *
@@ -122,7 +148,6 @@ except ImportError:
     default_avgas_units = 'lb'
 
 from . import unit_conversion as U
-from . import val_input as VI
 
 Rho0 = constants.Rho0  # Density at sea level, kg/m**3
 P0 = constants.P0  # Pressure at sea level, pa
@@ -137,6 +162,62 @@ A0 = constants.A0  # speed of sound at sea level, std day, m/s
 
 F = (1.25 ** 2.5 * (2.4 ** 2.) ** 2.5) * 1.2
 
+_mps2kt = U.converter('speed', 'm/s', 'kt')
+
+# delta p over p at mach 1.  Above this value the pitot tube is behind a
+# normal shock, and the supersonic (Rayleigh pitot) relation applies.
+
+_SONIC_DP_OVER_P = 1.2 ** 3.5 - 1.
+
+# #############################################################################
+#
+# atmospheric quantities shared by the conversions
+#
+# #############################################################################
+
+
+def _is_std(temp):
+    """
+    Return True if temp is the string 'std', which selects the standard
+    temperature at the altitude.
+    """
+
+    return isinstance(temp, str) and temp == 'std'
+
+
+def _temp_or_std(temp, altitude, temp_units, alt_units):
+    """
+    Return the temperature in deg K.  If temp is 'std', return the standard
+    temperature at the altitude.  If temp is an Atmosphere, return its
+    temperature at the pressure altitude.
+    """
+
+    if _is_std(temp):
+        return SA.alt2temp(altitude, alt_units=alt_units, temp_units='K')
+    if isinstance(temp, SA.Atmosphere):
+        return temp.press_alt2temp(altitude, alt_units=alt_units,
+                                   temp_units='K')
+    return U.temp_conv(_to_array(temp), from_units=temp_units, to_units='K')
+
+
+def _density(P, T):
+    """
+    Return the density in kg/m**3, given the pressure in pa and the
+    temperature in deg K.
+    """
+
+    return Rho0 * ((P / P0) / (T / 288.15))
+
+
+def _recovery2temp(indicated_temp, mach, recovery_factor):
+    """
+    Return the ambient temperature in deg K, given the indicated temperature
+    in deg K, the mach number and the temperature probe's recovery factor.
+    """
+
+    return indicated_temp / (1. + (0.2 * recovery_factor) * mach ** 2.)
+
+
 # #############################################################################
 #
 # delta pressure to speed
@@ -150,6 +231,39 @@ F = (1.25 ** 2.5 * (2.4 ** 2.) ** 2.5) * 1.2
 # #############################################################################
 
 
+def _dp_over_p2speed(dp_over_p, Pref, Rhoref, Aref):
+    """
+    Return the speed in m/s for a delta p over the reference pressure, given
+    the reference pressure in pa, density in kg/m**3 and speed of sound in
+    m/s.
+
+    The reference conditions are sea level for CAS, the static pressure and
+    sea level density for EAS, and the static pressure and density for TAS.
+    The subsonic (isentropic) relation applies up to the delta p over p at
+    mach 1, and the supersonic (Rayleigh pitot) relation above it, element by
+    element.
+    """
+
+    supersonic = dp_over_p > _SONIC_DP_OVER_P
+    if not np.any(supersonic):
+        return np.sqrt(((7. * Pref) * (1. / Rhoref))
+                       * ((dp_over_p + 1.) ** (2. / 7.) - 1.))
+
+    (dp_over_p, Pref, Rhoref, Aref) = np.broadcast_arrays(dp_over_p, Pref,
+                                                          Rhoref, Aref)
+    supersonic = np.broadcast_to(supersonic, dp_over_p.shape)
+    subsonic = ~supersonic
+    speed = np.empty(dp_over_p.shape)
+
+    speed[subsonic] = np.sqrt(((7. * Pref[subsonic]) * (1. / Rhoref[subsonic]))
+                              * ((dp_over_p[subsonic] + 1.) ** (2. / 7.)
+                                 - 1.))
+    speed[supersonic] = (Aref[supersonic]
+                         * _super_dp_over_p2mach(dp_over_p[supersonic]))
+
+    return speed
+
+
 def _dp2speed(
     dp,
     Pref,
@@ -157,22 +271,52 @@ def _dp2speed(
     press_units=default_press_units,
     speed_units=default_speed_units,
 ):
+    """
+    Return the EAS or TAS for a given delta pressure, with the static
+    pressure in pa as the reference pressure, and the sea level or ambient
+    density in kg/m**3 as the reference density.  Subsonic or supersonic.
+    """
 
     dp = U.press_conv(dp, from_units=press_units, to_units='pa')
-    speed = np.sqrt(((7. * Pref) * (1. / Rhoref)) * ((dp / Pref + 1.)
-                                                    ** (2. / 7.) - 1.))
+    speed = _dp_over_p2speed(dp / Pref, Pref, Rhoref,
+                             np.sqrt((1.4 * Pref) * (1. / Rhoref)))
 
-    # check to confirm the speed is less than 661.48 kt
+    return U.speed_conv(speed, from_units='m/s', to_units=speed_units)
 
-    speed_kt = U.speed_conv(speed, from_units='m/s', to_units='kt')
-    if speed_kt > 661.48:
-        raise ValueError(
-            'The function _dp2speed only works if the speed is less than or equal to 661.48 kt')
-    speed = U.speed_conv(speed, from_units='m/s', to_units=speed_units)
 
-    return speed
+def _super_dp_over_p2mach(dp_over_p):
+    """
+    Return the mach number for a given supersonic delta p over p (pitot
+    pressure - static pressure) / static pressure.
 
+    Solves the Rayleigh pitot relation by Newton's method, with its analytic
+    derivative.  The initial guess is from the first terms of the series
+    expansion of the relation in 1 / mach**2.  It is within 2% of the root,
+    and slightly above it, so the iteration converges monotonically, in at
+    most four steps.
 
+    Works on scalars or arrays.  dp_over_p must be at least the value at mach
+    1 (_SONIC_DP_OVER_P).
+    """
+
+    dp_over_p = np.asarray(dp_over_p, dtype=float)
+    mach2 = (7. ** 2.5 / F) * (dp_over_p + 1.) - 5. / 14.
+    mach = np.sqrt(mach2 - (5. / 56.) / mach2)
+
+    for i in range(20):
+        mach2 = mach * mach
+        denom = 7. * mach2 - 1.
+        error = (F * mach ** 7.) / denom ** 2.5 - 1. - dp_over_p
+        slope = ((7. * F) * mach ** 6. * (2. * mach2 - 1.)) / denom ** 3.5
+        step = error / slope
+        mach = mach - step
+        if not np.any(np.fabs(step) > 1e-13 * mach):
+            break
+
+    return mach
+
+
+@memo.memoize
 def dp2cas(dp, press_units=default_press_units,
            speed_units=default_speed_units):
     """
@@ -187,6 +331,8 @@ def dp2cas(dp, press_units=default_press_units,
 
     If the units are not specified, the units in default_units.py are used.
 
+    dp may be a scalar or an array, and may be subsonic or supersonic.
+
     Examples:
 
     Determine the CAS in kt that is equivalent to a differential pressure
@@ -200,64 +346,14 @@ def dp2cas(dp, press_units=default_press_units,
     105.88271367435266
     """
 
-    try:
-
-        # subsonic case
-
-        cas = _dp2speed(dp, P0, Rho0, press_units, speed_units)
-        return cas
-    except ValueError:
-
-        # supersonic case - need to iterate a solution.  Set upper and lower
-        # guesses, and iterate until we zero in on a cas that produces the
-        # desired differential pressure.
-
-        dp_seek = U.press_conv(dp, from_units=press_units, to_units='pa'
-                               )
-
-        low = 340.  # initial lower guess, m/s
-
-        # This function works up to approximately 6,600 kt CAS.  The upper
-        # limit can be extended by increasing the value of the initial upper
-        # guess ("high").
-
-        high = 3400.  # initial upper guess, m/s
-
-        # confirm initial low and high are OK:
-
-        dp_low = _super_cas2dp(low)
-        if dp_low > dp_seek:
-            raise ValueError('Initial lower cas guess is too high.')
-
-        dp_high = _super_cas2dp(high)
-        if dp_high < dp_seek:
-            raise ValueError('Initial upper cas guess is too low.')
-
-        guess = (low + high) / 2.
-        dp_guess = _super_cas2dp(guess)
-
-        # keep iterating until dp is within 0.001% of desired value
-
-        while np.fabs(dp_guess - dp_seek) / dp_seek > 1e-5:
-            if dp_guess > dp_seek:
-                high = guess
-            else:
-                low = guess
-
-            guess = (low + high) / 2.
-            dp_guess = _super_cas2dp(guess)
-
-    # the supersonic solution is in m/s, so we need to convert to the
-    # desired units.
+    dp = U.press_conv(_to_array(dp), from_units=press_units, to_units='pa')
+    cas = _dp_over_p2speed(dp / P0, P0, Rho0, A0)
+    cas = U.speed_conv(cas, from_units='m/s', to_units=speed_units)
 
-    cas = U.speed_conv(guess, from_units='m/s', to_units=speed_units)
-
-    # Supersonic case.  The subsonic case is returned way up at the top,
-    # inside the try statement.
-
-    return cas
+    return _from_array(cas)
 
 
+@memo.memoize
 def dp2eas(
     dp,
     altitude,
@@ -280,15 +376,16 @@ def dp2eas(
 
     If the units are not specified, the units in default_units.py are used.
 
-    This first version only works for EAS < 661.48 kt.
+    dp may be a scalar or an array, and may be subsonic or supersonic.
     """
 
     P = SA.alt2press(altitude, alt_units, press_units='pa')
 
-    eas = _dp2speed(dp, P, Rho0, press_units, speed_units)
-    return eas
+    eas = _dp2speed(_to_array(dp), P, Rho0, press_units, speed_units)
+    return _from_array(eas)
 
 
+@memo.memoize
 def dp2tas(
     dp,
     altitude,
@@ -311,23 +408,20 @@ def dp2tas(
     The altitude may be in feet ('ft'), metres ('m'), kilometres ('km'),
     statute miles, ('sm') or nautical miles ('nm').
 
-    The temperature may be in deg C, F, K or R.
+    The temperature may be in deg C, F, K or R, or 'std' for the standard
+    temperature, or a std_atm.Atmosphere.
 
     If the units are not specified, the units in default_units.py are used.
 
-    This first version only works for TAS < 661.48 kt.
+    dp may be a scalar or an array, and may be subsonic or supersonic.
     """
 
     P = SA.alt2press(altitude, alt_units, press_units='pa')
+    T = _temp_or_std(temp, altitude, temp_units, alt_units)
 
-    press_ratio = SA.alt2press_ratio(altitude, alt_units)
-    temp_ratio = U.temp_conv(temp, from_units=temp_units, to_units='K')\
-        / 288.15
-    density_ratio = press_ratio / temp_ratio
-    Rho = Rho0 * density_ratio
-
-    tas = _dp2speed(dp, P, Rho, press_units, speed_units)
-    return tas
+    tas = _dp2speed(_to_array(dp), P, _density(P, T), press_units,
+                    speed_units)
+    return _from_array(tas)
 
 
 # #############################################################################
@@ -343,6 +437,40 @@ def dp2tas(
 # #############################################################################
 
 
+def _super_mach2dp_over_p(M):
+    """
+    Return the delta p over p for a supersonic mach number, from the Rayleigh
+    pitot relation.
+    """
+
+    return (F * M ** 7.) / (7. * M ** 2. - 1.) ** 2.5 - 1.
+
+
+def _speed2dp_over_p(speed, Pref, Rhoref, Aref):
+    """
+    Return the delta p over the reference pressure for a speed in m/s, given
+    the reference pressure in pa, density in kg/m**3 and speed of sound in
+    m/s.  The inverse of _dp_over_p2speed.
+    """
+
+    supersonic = speed > Aref
+    if not np.any(supersonic):
+        return ((Rhoref * speed ** 2.) / (7. * Pref) + 1.) ** 3.5 - 1.
+
+    (speed, Pref, Rhoref, Aref) = np.broadcast_arrays(speed, Pref, Rhoref,
+                                                      Aref)
+    supersonic = np.broadcast_to(supersonic, speed.shape)
+    subsonic = ~supersonic
+    dp_over_p = np.empty(speed.shape)
+
+    dp_over_p[subsonic] = ((Rhoref[subsonic] * speed[subsonic] ** 2.)
+                           / (7. * Pref[subsonic]) + 1.) ** 3.5 - 1.
+    dp_over_p[supersonic] = _super_mach2dp_over_p(speed[supersonic]
+                                                  / Aref[supersonic])
+
+    return dp_over_p
+
+
 def _speed2dp(
     speed,
     Pref,
@@ -351,33 +479,20 @@ def _speed2dp(
     speed_units=default_speed_units,
 ):
     """ Return a delta pressure (the difference between the pitot and
-    static pressures) for a given speed.  Subsonic equation.
+    static pressures) for a given EAS or TAS, with the static pressure in pa
+    as the reference pressure, and the sea level or ambient density in
+    kg/m**3 as the reference density.  Subsonic or supersonic.
     """
 
     speed = U.speed_conv(speed, from_units=speed_units, to_units='m/s')
-    dp = Pref * (((Rhoref * speed ** 2.) / (7. * Pref) + 1.) ** 3.5
-                 - 1.)
+    dp = Pref * _speed2dp_over_p(speed, Pref, Rhoref,
+                                 np.sqrt((1.4 * Pref) * (1. / Rhoref)))
     dp = U.press_conv(dp, from_units='pa', to_units=press_units)
 
     return dp
 
 
-def _super_cas2dp(mcas):
-    """Return the  differential pressure (difference between pitot and static
-    pressures) for a given CAS.
-
-    This function only works for speed in m/s, and pressure in pa.
-
-    This function is only intended for CAS > 661.48 kt.
-    """
-
-    dp_over_P0 = (F * (mcas / A0) ** 7.) / (7. * (mcas / A0) ** 2. - 1.)\
-        ** 2.5 - 1.
-    dp = dp_over_P0 * P0
-
-    return dp
-
-
+@memo.memoize
 def cas2dp(cas, speed_units=default_speed_units,
            press_units=default_press_units):
     """
@@ -391,30 +506,19 @@ def cas2dp(cas, speed_units=default_speed_units,
     'lb/in**2', 'psf', 'lb/ft**2 'hpa', 'mb' or 'pa'.
 
     If the units are not specified, the units in default_units.py are used.
-    """
-
-    # check to confirm the speed is less than 661.48 kt
-#   kcas = U.speed_conv(cas, from_units = speed_units, to_units = 'kt')
 
-    mcas = U.speed_conv(cas, from_units=speed_units, to_units='m/s')
-
-#   if kcas > 661.48:
-
-    if mcas > A0:
-
-        # supersonic case
-
-        dp = _super_cas2dp(mcas)
-        dp = U.press_conv(dp, from_units='pa', to_units=press_units)
-    else:
+    cas may be a scalar or an array, and may be subsonic or supersonic.
+    """
 
-        # subsonic case
+    mcas = U.speed_conv(_to_array(cas), from_units=speed_units,
+                        to_units='m/s')
+    dp = P0 * _speed2dp_over_p(mcas, P0, Rho0, A0)
+    dp = U.press_conv(dp, from_units='pa', to_units=press_units)
 
-        dp = _speed2dp(cas, P0, Rho0, press_units=press_units,
-                       speed_units=speed_units)
-    return dp
+    return _from_array(dp)
 
 
+@memo.memoize
 def eas2dp(
     eas,
     altitude,
@@ -437,24 +541,19 @@ def eas2dp(
 
     If the units are not specified, the units in default_units.py are used.
 
-    This first version only works for CAS < 661.48 kt.
-
+    eas may be a scalar or an array, and may be subsonic or supersonic.
     """
 
-    # check to confirm the speed is less than 661.48 kt
-
-    keas = U.speed_conv(eas, from_units=speed_units, to_units='kt')
-    if keas > 661.48:
-        raise ValueError(
-            'The function eas2dp only works if the eas is less than or equal to 661.48 kt')
+    eas = _to_array(eas)
 
     P = SA.alt2press(altitude, alt_units=alt_units, press_units='pa')
     dp = _speed2dp(eas, P, Rho0, press_units=press_units,
                    speed_units=speed_units)
 
-    return dp
+    return _from_array(dp)
 
 
+@memo.memoize
 def tas2dp(
     tas,
     altitude,
@@ -477,34 +576,25 @@ def tas2dp(
     The altitude may be in feet ('ft'), metres ('m'), kilometres ('km'),
     statute miles, ('sm') or nautical miles ('nm').
 
-    The temperature may be in deg C, F, K or R.
+    The temperature may be in deg C, F, K or R, or 'std' for the standard
+    temperature, or a std_atm.Atmosphere.
 
     If the units are not specified, the units in default_units.py are used.
 
-    This first version only works for CAS < 661.48 kt.
-
+    tas may be a scalar or an array, and may be subsonic or supersonic.
     """
 
-    # check to confirm the speed is less than 661.48 kt
-
-    ktas = U.speed_conv(tas, from_units=speed_units, to_units='kt')
-    if ktas > 661.48:
-        raise ValueError(
-            'The function tas2dp only works if the tas is less than or equal to 661.48 kt')
+    tas = _to_array(tas)
 
     P = SA.alt2press(altitude, alt_units=alt_units, press_units='pa')
-
-    press_ratio = SA.alt2press_ratio(altitude, alt_units)
-    temp_ratio = U.temp_conv(temp, from_units=temp_units, to_units='K')\
-        / 288.15
-    density_ratio = press_ratio / temp_ratio
-    Rho = Rho0 * density_ratio
-    dp = _speed2dp(tas, P, Rho, press_units=press_units,
+    T = _temp_or_std(temp, altitude, temp_units, alt_units)
+    dp = _speed2dp(tas, P, _density(P, T), press_units=press_units,
                    speed_units=speed_units)
 
-    return dp
+    return _from_array(dp)
 
 
+@memo.memoize
 def cas2eas(
     cas,
     altitude,
@@ -522,11 +612,11 @@ def cas2eas(
     If the units are not specified, the units in default_units.py are used.
     """
 
-    dp = cas2dp(cas, speed_units)
-    eas = dp2eas(dp, altitude, alt_units=alt_units,
-                 speed_units=speed_units)
+    dp = cas2dp(cas, speed_units, press_units='pa')
+    P = SA.alt2press(altitude, alt_units=alt_units, press_units='pa')
+    eas = _dp2speed(dp, P, Rho0, press_units='pa', speed_units=speed_units)
 
-    return eas
+    return _from_array(eas)
 
 
 def i_cas2eas(data_items):
@@ -560,6 +650,7 @@ def i_cas2eas(data_items):
     print(return_string)
 
 
+@memo.memoize
 def cas2tas(
     cas,
     altitude,
@@ -583,21 +674,13 @@ def cas2tas(
 
     """
 
-    if temp == 'std':
-        temp = SA.alt2temp(altitude, temp_units=temp_units,
-                           alt_units=alt_units)
-
-    dp = cas2dp(cas, speed_units)
-    tas = dp2tas(
-        dp,
-        altitude,
-        temp,
-        speed_units=speed_units,
-        alt_units=alt_units,
-        temp_units=temp_units,
-    )
+    dp = cas2dp(cas, speed_units, press_units='pa')
+    P = SA.alt2press(altitude, alt_units=alt_units, press_units='pa')
+    T = _temp_or_std(temp, altitude, temp_units, alt_units)
+    tas = _dp2speed(dp, P, _density(P, T), press_units='pa',
+                    speed_units=speed_units)
 
-    return tas
+    return _from_array(tas)
 
 
 def i_cas2tas(data_items):
@@ -645,6 +728,7 @@ def i_cas2tas(data_items):
     print(return_string)
 
 
+@memo.memoize
 def eas2tas(
     eas,
     altitude,
@@ -668,21 +752,15 @@ def eas2tas(
 
     """
 
-    if temp == 'std':
-        temp = SA.alt2temp(altitude, temp_units=temp_units,
-                           alt_units=alt_units)
+    eas = _to_array(eas)
 
-    dp = eas2dp(eas, altitude, speed_units, alt_units)
-    tas = dp2tas(
-        dp,
-        altitude,
-        temp,
-        speed_units=speed_units,
-        alt_units=alt_units,
-        temp_units=temp_units,
-    )
+    P = SA.alt2press(altitude, alt_units=alt_units, press_units='pa')
+    T = _temp_or_std(temp, altitude, temp_units, alt_units)
+    dp = _speed2dp(eas, P, Rho0, press_units='pa', speed_units=speed_units)
+    tas = _dp2speed(dp, P, _density(P, T), press_units='pa',
+                    speed_units=speed_units)
 
-    return tas
+    return _from_array(tas)
 
 
 def i_eas2tas(data_items):
@@ -730,6 +808,7 @@ def i_eas2tas(data_items):
     print(return_string)
 
 
+@memo.memoize
 def eas2cas(
     eas,
     altitude,
@@ -757,8 +836,8 @@ def eas2cas(
     248.54048779668804
     """
 
-    dp = eas2dp(eas, altitude, speed_units, alt_units)
-    cas = dp2cas(dp, speed_units=speed_units)
+    dp = eas2dp(eas, altitude, speed_units, alt_units, press_units='pa')
+    cas = dp2cas(dp, press_units='pa', speed_units=speed_units)
 
     return cas
 
@@ -800,6 +879,7 @@ def i_eas2cas(data_items):
     print(return_string)
 
 
+@memo.memoize
 def tas2cas(
     tas,
     altitude,
@@ -844,19 +924,13 @@ def tas2cas(
     282.145887847616
     """
 
-    if temp == 'std':
-        temp = SA.alt2temp(altitude, temp_units=temp_units,
-                           alt_units=alt_units)
+    tas = _to_array(tas)
 
-    dp = tas2dp(
-        tas,
-        altitude,
-        temp,
-        speed_units,
-        alt_units=alt_units,
-        temp_units=temp_units,
-    )
-    cas = dp2cas(dp, speed_units=speed_units)
+    P = SA.alt2press(altitude, alt_units=alt_units, press_units='pa')
+    T = _temp_or_std(temp, altitude, temp_units, alt_units)
+    dp = _speed2dp(tas, P, _density(P, T), press_units='pa',
+                   speed_units=speed_units)
+    cas = dp2cas(dp, press_units='pa', speed_units=speed_units)
 
     return cas
 
@@ -915,6 +989,7 @@ def i_tas2cas(data_items):
     print(return_string)
 
 
+@memo.memoize
 def tas2eas(
     tas,
     altitude,
@@ -938,22 +1013,15 @@ def tas2eas(
 
     """
 
-    if temp == 'std':
-        temp = SA.alt2temp(altitude, temp_units=temp_units,
-                           alt_units=alt_units)
+    tas = _to_array(tas)
 
-    dp = tas2dp(
-        tas,
-        altitude,
-        temp,
-        speed_units,
-        alt_units=alt_units,
-        temp_units=temp_units,
-    )
-    eas = dp2eas(dp, altitude, alt_units=alt_units,
-                 speed_units=speed_units)
+    P = SA.alt2press(altitude, alt_units=alt_units, press_units='pa')
+    T = _temp_or_std(temp, altitude, temp_units, alt_units)
+    dp = _speed2dp(tas, P, _density(P, T), press_units='pa',
+                   speed_units=speed_units)
+    eas = _dp2speed(dp, P, Rho0, press_units='pa', speed_units=speed_units)
 
-    return eas
+    return _from_array(eas)
 
 
 def i_tas2eas(data_items):
@@ -1025,57 +1093,23 @@ def dp_over_p2mach(dp_over_p):
     """
     Return the mach number for a given delta p over p.
 
-    Mach must be less than or equal to 10.
+    dp_over_p may be a scalar or an array, and may be subsonic or
+    supersonic.
     """
 
 #   mach = (5*( (dp_over_p + 1)**(2/7.) -1) )**0.5
 
-    mach = np.sqrt(5. * ((dp_over_p + 1.) ** (2. / 7.) - 1.))
-
-    if mach <= 1.:
-        return mach
-    else:
-
-        # supersonic case - need to iterate a solution.  Set upper and lower
-        # guesses, and iterate until we zero in on a mach that produces the
-        # desired result.
-
-        dp_over_p_seek = dp_over_p
-
-        low = 1.  # initial lower guess for mach
-
-        # This function works up to Mach 10  The upper limit can be
-        # extended by increasing the value of the initial upper guess
-        # ("high").
-
-        high = 10.  # initial upper guess for mach
-
-        # confirm initial low and high are OK:
-
-        dp_over_p_low = mach2dp_over_p(low)
-        if dp_over_p_low > dp_over_p_seek:
-            raise ValueError('Initial lower mach guess is too high.')
-
-        dp_over_p_high = mach2dp_over_p(high)
-        if dp_over_p_high < dp_over_p_seek:
-            raise ValueError('Initial upper mach guess is too low.')
-
-        guess = (low + high) / 2.
-        dp_over_p_guess = mach2dp_over_p(guess)
+    dp_over_p = _to_array(dp_over_p)
+    supersonic = dp_over_p > _SONIC_DP_OVER_P
+    subsonic = ~supersonic
+    mach = np.empty_like(dp_over_p)
 
-        # keep iterating until dp is within 0.001% of desired value
+    mach[subsonic] = np.sqrt(5. * ((dp_over_p[subsonic] + 1.) ** (2. / 7.)
+                                   - 1.))
+    if np.any(supersonic):
+        mach[supersonic] = _super_dp_over_p2mach(dp_over_p[supersonic])
 
-        while np.fabs(dp_over_p_guess - dp_over_p_seek) / dp_over_p_seek\
-                > 1e-5:
-            if dp_over_p_guess > dp_over_p_seek:
-                high = guess
-            else:
-                low = guess
-
-            guess = (low + high) / 2.
-            dp_over_p_guess = mach2dp_over_p(guess)
-
-    return guess
+    return _from_array(mach)
 
 
 def mach2dp_over_p(M):
@@ -1084,18 +1118,23 @@ def mach2dp_over_p(M):
     The result is equal to:
     (pitot pressure - static pressure) / static pressure
 
+    M may be a scalar or an array.
+
     Example - determine the delta p over p at mach 0.4:
 
     >>> mach2dp_over_p(.4)
     0.11655196580975336
     """
 
-    if M <= 1.:
-        dp_over_p = (M ** 2. / 5. + 1.) ** 3.5 - 1.
-    else:
-        dp_over_p = (F * M ** 7.) / (7. * M ** 2. - 1.) ** 2.5 - 1.
+    M = _to_array(M)
+    supersonic = M > 1.
+    subsonic = ~supersonic
+    dp_over_p = np.empty_like(M)
 
-    return dp_over_p
+    dp_over_p[subsonic] = (M[subsonic] ** 2. / 5. + 1.) ** 3.5 - 1.
+    dp_over_p[supersonic] = _super_mach2dp_over_p(M[supersonic])
+
+    return _from_array(dp_over_p)
 
 
 # #############################################################################
@@ -1107,6 +1146,7 @@ def mach2dp_over_p(M):
 # #############################################################################
 
 
+@memo.memoize
 def cas_mach2alt(
     cas,
     mach,
@@ -1166,6 +1206,7 @@ def i_cas_mach2alt(data_items):
     print(return_string)
 
 
+@memo.memoize
 def cas_alt2mach(
     cas,
     altitude,
@@ -1254,6 +1295,7 @@ def _cas_alt2mach2(
     return mach
 
 
+@memo.memoize
 def mach_alt2cas(
     mach,
     altitude,
@@ -1321,6 +1363,7 @@ def i_mach_alt2cas(data_items):
 # #############################################################################
 
 
+@memo.memoize
 def mach2tas(
     mach,
     temp='std',
@@ -1368,17 +1411,22 @@ def mach2tas(
     499.99796329569176
     """
 
-    if temp == 'std':
-        if altitude != 'blank':
-            temp = SA.alt2temp(altitude, temp_units=temp_units,
-                               alt_units=alt_units)
-        else:
+    if _is_std(temp):
+        if isinstance(altitude, str):
             raise ValueError(
                 'At least one of the temperature or altitude must be specified.')
+        temp = SA.alt2temp(altitude, temp_units=temp_units,
+                           alt_units=alt_units)
+    elif isinstance(temp, SA.Atmosphere):
+        temp = temp.press_alt2temp(altitude, alt_units=alt_units,
+                                   temp_units=temp_units)
+    else:
+        temp = _to_array(temp)
 
-    tas = mach * SA.temp2speed_of_sound(temp, temp_units, speed_units)
+    tas = _to_array(mach) * SA.temp2speed_of_sound(temp, temp_units,
+                                                   speed_units)
 
-    return tas
+    return _from_array(tas)
 
 
 def i_mach2tas(data_items):
@@ -1423,6 +1471,7 @@ def i_mach2tas(data_items):
     print(('TAS = ', tas, speed_units))
 
 
+@memo.memoize
 def tas2mach(
     tas,
     temp='std',
@@ -1470,18 +1519,21 @@ def tas2mach(
     0.55787687746166581
     """
 
-    if temp == 'std':
-        if altitude != 'blank':
-            temp = SA.alt2temp(altitude, temp_units=temp_units,
-                               alt_units=alt_units)
-        else:
+    if _is_std(temp):
+        if isinstance(altitude, str):
             raise ValueError(
                 'At least one of the temperature or altitude must be specified.')
-    A = SA.temp2speed_of_sound(temp, temp_units, speed_units)
-
-    mach = tas / SA.temp2speed_of_sound(temp, temp_units, speed_units)
+        temp = SA.alt2temp(altitude, temp_units=temp_units,
+                           alt_units=alt_units)
+    elif isinstance(temp, SA.Atmosphere):
+        temp = temp.press_alt2temp(altitude, alt_units=alt_units,
+                                   temp_units=temp_units)
+    else:
+        temp = _to_array(temp)
+    mach = _to_array(tas) / SA.temp2speed_of_sound(temp, temp_units,
+                                                   speed_units)
 
-    return mach
+    return _from_array(mach)
 
 
 def i_tas2mach(data_items):
@@ -1539,6 +1591,7 @@ def i_tas2mach(data_items):
 # #############################################################################
 
 
+@memo.memoize
 def mach2temp(
     mach,
     indicated_temp,
@@ -1567,19 +1620,23 @@ def mach2temp(
 
     >>> mach2temp(0.3, 75, 0.9, temp_units = 'F')
     66.476427868529839
+
+    The inputs may be scalars or arrays, which are broadcast against each
+    other.
     """
 
-    indicated_temp = U.temp_conv(indicated_temp, from_units=temp_units,
-                                 to_units='K')
-    ambient_temp = indicated_temp / (1. + (0.2 * recovery_factor) * mach
-                                     ** 2.)
+    indicated_temp = U.temp_conv(_to_array(indicated_temp),
+                                 from_units=temp_units, to_units='K')
+    ambient_temp = _recovery2temp(indicated_temp, _to_array(mach),
+                                  _to_array(recovery_factor))
 
     ambient_temp = U.temp_conv(ambient_temp, from_units='K',
                                to_units=temp_units)
 
-    return ambient_temp
+    return _from_array(ambient_temp)
 
 
+@memo.memoize
 def tas2temp(
     tas,
     indicated_temp,
@@ -1598,51 +1655,155 @@ def tas2temp(
 
     If the units are not specified, the units in default_units.py are used.
 
+    The inputs may be scalars or arrays, which are broadcast against each
+    other.
     """
 
-    indicated_temp = U.temp_conv(indicated_temp, from_units=temp_units,
-                                 to_units='K')
-    tas = U.speed_conv(tas, from_units=speed_units, to_units='kt')
+    indicated_temp = U.temp_conv(_to_array(indicated_temp),
+                                 from_units=temp_units, to_units='K')
+    tas = U.speed_conv(_to_array(tas), from_units=speed_units, to_units='kt')
 
     # value 7592.4732909142658 was adjusted to make the result equal that
     # obtained using mach2temp
 
-    ambient_temp = indicated_temp - (recovery_factor * tas ** 2.)\
+    ambient_temp = indicated_temp - (_to_array(recovery_factor) * tas ** 2.)\
         / 7592.4732909142658
 
     ambient_temp = U.temp_conv(ambient_temp, from_units='K',
                                to_units=temp_units)
 
-    return ambient_temp
+    return _from_array(ambient_temp)
 
 
+@memo.memoize
 def ioat2tas(ioat, cas, alt, recovery_factor, temp_units=default_temp_units,
              speed_units=default_speed_units, alt_units=default_alt_units):
     """
-    Return true airspeed, given indicated outside air temperature, calibrated airspeed, altitude and OAT probe recovery factor
+    Return true airspeed, given indicated outside air temperature, calibrated
+    airspeed, altitude and OAT probe recovery factor.
+
+    The mach number depends only on the CAS and altitude, so it is found
+    first, and the ambient temperature and TAS follow from it directly,
+    without iterating between the TAS and temperature.  The CAS may be
+    subsonic or supersonic, each element in its own regime.
+
+    The inputs may be scalars or arrays (e.g. an air data time history),
+    which are broadcast against each other.
+
+    Example:
+
+    TAS at 250 kt CAS, 10,000 ft and an indicated temperature of 0 deg C,
+    with a probe recovery factor of 0.95:
+    >>> ioat2tas(0, 250, 10000, 0.95)
+    285.77900069525657
     """
-    tas_guess = cas2tas(
-        cas,
-        alt,
-        ioat,
-        speed_units=speed_units,
-        alt_units=alt_units,
-        temp_units=temp_units)
-    oat = tas2temp(
-        tas_guess,
-        ioat,
-        recovery_factor,
-        speed_units=speed_units,
-        temp_units=temp_units)
-    tas = cas2tas(
-        cas,
-        alt,
-        oat,
-        speed_units=speed_units,
-        alt_units=alt_units,
-        temp_units=temp_units)
 
-    return tas
+    dp = cas2dp(cas, speed_units, press_units='pa')
+    P = SA.alt2press(alt, alt_units=alt_units, press_units='pa')
+    mach = dp_over_p2mach(dp / P)
+    T = _recovery2temp(U.temp_conv(_to_array(ioat), temp_units, 'K'), mach,
+                       _to_array(recovery_factor))
+    tas = mach * SA.temp2speed_of_sound(T, temp_units='K',
+                                        speed_units=speed_units)
+
+    return _from_array(tas)
+
+# #############################################################################
+#
+# air data reduction
+#
+#    delta pressure, static pressure and indicated temperature to CAS, EAS,
+#    TAS, mach, pressure altitude, ambient temperature and density
+#
+# #############################################################################
+
+_AIR_DATA_DTYPE = np.dtype([
+    ('cas', float),
+    ('eas', float),
+    ('tas', float),
+    ('mach', float),
+    ('press_alt', float),
+    ('temp', float),
+    ('density', float),
+])
+
+
+def air_data(
+    dp,
+    Ps,
+    ioat,
+    recovery_factor,
+    press_units=default_press_units,
+    speed_units=default_speed_units,
+    alt_units=default_alt_units,
+    temp_units=default_temp_units,
+    density_units=default_density_units,
+):
+    """
+    Return the air data, given the differential pressure (dp, the difference
+    between the pitot and static pressures), the static pressure (Ps), the
+    indicated outside air temperature (ioat) and the temperature probe's
+    recovery factor.
+
+    The result is a numpy structured array, with the broadcast shape of the
+    inputs, and the fields:
+        'cas', 'eas', 'tas', 'mach' - airspeeds and mach number
+        'press_alt' - pressure altitude
+        'temp' - ambient temperature
+        'density' - ambient density
+
+    The mach number is found once from dp / Ps, and the other quantities are
+    derived from it, the static pressure and the ambient temperature.  The
+    speeds may be subsonic or supersonic.  If all the inputs are scalars, a
+    single record is returned.
+
+    The pressure units may be in inches of HG, mm of HG, psi, lb/ft^2,
+    hpa and mb.  The units are specified as: 'in HG', 'mm HG', 'psi',
+    'lb/in**2', 'psf', 'lb/ft**2 'hpa', 'mb' or 'pa'.
+
+    The speed units may be 'kt', 'mph', 'km/h', 'm/s' and 'ft/s'.
+
+    The altitude may be in feet ('ft'), metres ('m'), kilometres ('km'),
+    statute miles, ('sm') or nautical miles ('nm').
+
+    The temperature may be in deg C, F, K or R.
+
+    The density units may be 'lb/ft**3', 'slug/ft**3' or 'kg/m**3'.
+
+    If the units are not specified, the units in default_units.py are used.
+
+    Example:
+
+    Determine the air data with a differential pressure of 5 in HG, static
+    pressure of 20 in HG, indicated temperature of 0 deg C and a recovery
+    factor of 0.95:
+    >>> data = air_data(5, 20, 0, 0.95)
+    >>> data['cas'], data['mach']
+    (314.25271984613073, 0.57372274779252426)
+    """
+
+    dp = U.press_conv(_to_array(dp), from_units=press_units, to_units='pa')
+    Ps = U.press_conv(_to_array(Ps), from_units=press_units, to_units='pa')
+    ioat = U.temp_conv(_to_array(ioat), from_units=temp_units, to_units='K')
+    shape = np.broadcast(dp, Ps, ioat, recovery_factor).shape
+    data = np.empty(shape, dtype=_AIR_DATA_DTYPE)
+
+    mach = dp_over_p2mach(dp / Ps)
+    T = _recovery2temp(ioat, mach, recovery_factor)
+
+    data['mach'] = mach
+    data['cas'] = dp2cas(dp, press_units='pa', speed_units=speed_units)
+    data['eas'] = U.speed_conv(mach * np.sqrt((1.4 / Rho0) * Ps),
+                               from_units='m/s', to_units=speed_units)
+    data['tas'] = mach * SA.temp2speed_of_sound(T, temp_units='K',
+                                                speed_units=speed_units)
+    data['press_alt'] = SA.press2alt(Ps, press_units='pa',
+                                     alt_units=alt_units)
+    data['temp'] = U.temp_conv(T, from_units='K', to_units=temp_units)
+    data['density'] = U.density_conv(_density(Ps, T), from_units='kg/m**3',
+                                     to_units=density_units)
+
+    return data[()] if data.ndim == 0 else data
 
 # #############################################################################
 #
@@ -1654,6 +1815,8 @@ def ioat2tas(ioat, cas, alt, recovery_factor, temp_units=default_temp_units,
 
 
 def _get_alt(data_items):  # pragma: no cover
+    from . import val_input as VI
+
     try:
         prompt = 'Altitude = [' + str(data_items['altitude']) + '] '
         value = VI.get_input2(prompt,
@@ -1670,6 +1833,8 @@ def _get_alt(data_items):  # pragma: no cover
 
 def _get_alt_units(data_items):  # pragma: no cover
 
+    from . import val_input as VI
+
     if data_items['alt_units'] == 'ft':
         prompt = 'altitude units = [ft], m, km, sm, nm: '
     elif data_items['alt_units'] == 'm':
@@ -1697,6 +1862,8 @@ def _get_alt_units(data_items):  # pragma: no cover
 
 
 def _get_CAS(data_items):  # pragma: no cover
+    from . import val_input as VI
+
     try:
         prompt = 'CAS = [' + str(data_items['cas']) + '] '
         value = VI.get_input2(prompt,
@@ -1712,6 +1879,8 @@ def _get_CAS(data_items):  # pragma: no cover
 
 
 def _get_EAS(data_items):  # pragma: no cover
+    from . import val_input as VI
+
     try:
         prompt = 'EAS = [' + str(data_items['eas']) + '] '
         value = VI.get_input2(prompt,
@@ -1727,6 +1896,8 @@ def _get_EAS(data_items):  # pragma: no cover
 
 
 def _get_TAS(data_items):  # pragma: no cover
+    from . import val_input as VI
+
     try:
         prompt = 'TAS = [' + str(data_items['tas']) + '] '
         value = VI.get_input2(prompt,
@@ -1742,6 +1913,8 @@ def _get_TAS(data_items):  # pragma: no cover
 
 
 def _get_speed_units(data_items):  # pragma: no cover
+    from . import val_input as VI
+
     if data_items['speed_units'] == 'kt':
         prompt = 'speed units = [kt], mph, km/h, m/s, ft/s: '
     elif data_items['speed_units'] == 'mph':
@@ -1768,6 +1941,8 @@ def _get_speed_units(data_items):  # pragma: no cover
 
 
 def _get_mach(data_items):  # pragma: no cover
+    from . import val_input as VI
+
     try:
         prompt = 'Mach = [' + str(data_items['mach']) + '] '
         value = VI.get_input2(prompt,
@@ -1783,6 +1958,8 @@ def _get_mach(data_items):  # pragma: no cover
 
 
 def _get_temp(data_items):  # pragma: no cover
+    from . import val_input as VI
+
     try:
         prompt = 'Temperature = [' + str(data_items['temp']) + '] '
         value = VI.get_input2(prompt,
@@ -1810,6 +1987,8 @@ def _get_temp(data_items):  # pragma: no cover
 
 
 def _get_temp_units(data_items):  # pragma: no cover
+    from . import val_input as VI
+
     if data_items['temp_units'] == 'C':
         prompt = 'Temperature units = [C], F, K, R: '
     elif data_items['temp_units'] == 'F':
@@ -1838,9 +2017,9 @@ def _interactive_mode(data_items):  # pragma: no cover
     """
 
     # data_items = {}
-    data_items['speed_units'] = default_speed_units
-    data_items['alt_units'] = default_alt_units
-    data_items['temp_units'] = default_temp_units
+    data_items['speed_units'] = U.resolve_units(default_speed_units)
+    data_items['alt_units'] = U.resolve_units(default_alt_units)
+    data_items['temp_units'] = U.resolve_units(default_temp_units)
     data_items['function'] = 2
 
     _interactive_interface(data_items)
@@ -1850,6 +2029,10 @@ def _interactive_interface(data_items):  # pragma: no cover
     """Provide interactive interface to screen.
     """
 
+    import ast
+    import sys
+    from . import val_input as VI
+
     func_list = [
         ['i_cas2eas(data_items)', 'CAS to EAS'],
         ['i_cas2tas(data_items)', 'CAS to TAS'],
@@ -1894,7 +2077,7 @@ def _interactive_interface(data_items):  # pragma: no cover
     func_list_num = item - 1
     ast.literal_eval(func_list[func_list_num][0])
     prompt = '\nDo another calculation [Y/n]'
-    input_data = ast.literal_eval(safe_input(prompt))
+    input_data = ast.literal_eval(VI.safe_input(prompt))
     #  input_data = input(prompt)
     if input_data == '' or input_data == 'Y' or input_data == 'y':
         print('\n')
@@ -0,0 +1,395 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# #############################################################################
+# Copyright (c) 2008, Kevin Horton
+# All rights reserved.
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# *
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * The name of Kevin Horton may not be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+# *
+# THIS SOFTWARE IS PROVIDED BY KEVIN HORTON ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO
+# EVENT SHALL KEVIN HORTON BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+# OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+# ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# #############################################################################
+#
+# version 0.10, 18 Oct 2026
+#
+# Version History:
+# vers     date     Notes
+# 0.10   18 Oct 26  First version.
+# #############################################################################
+
+"""
+Convert delimited (CSV or TSV) air data files with the airspeed functions,
+without prompting.
+
+The first line of the input is a header.  Columns named after the arguments
+of the selected airspeed function are its inputs, with the units in square
+brackets after the name, e.g. 'cas[kt]', 'alt[ft]' or 'ioat[C]'.  The
+altitude may be named 'alt' or 'altitude', and the mach number 'mach' or
+'M', whatever the function calls them.  Columns without units are in the
+default units.  Other columns, e.g. a time
+stamp, are passed through unchanged, and the results are appended to each
+line as new columns.
+
+The input is read, converted and written in chunks of lines, with one call
+of the vectorized function per chunk, so files of any length are converted
+in constant memory.
+
+Usage, from the command line:
+
+    python -m aerocalc.batch FUNCTION [-i INPUT] [-o OUTPUT]
+                             [-s NAME=VALUE[UNITS]] [-u KIND=UNITS]
+
+e.g.:
+
+    python -m aerocalc.batch ioat2tas -s recovery_factor=0.98 < flight.csv
+
+The input and output default to stdin and stdout.  --set gives a value for
+an argument that has no column, and --units selects the units of the
+results (the kinds are 'alt', 'density', 'press', 'speed' and 'temp').
+
+Example:
+
+>>> import io
+>>> out = io.StringIO()
+>>> convert('cas2tas', io.StringIO(u'time,cas[kt],altitude[ft]\\n'
+...                                u'0.0,250,10000\\n'), out)
+>>> print(out.getvalue().strip())
+time,cas[kt],altitude[ft],tas[kt]
+0.0,250,10000,288.702279729
+"""
+
+import itertools
+import sys
+
+import numpy as np
+
+from . import airspeed as A
+from . import unit_conversion as U
+
+FUNCTIONS = (
+    'dp2cas', 'dp2eas', 'dp2tas', 'cas2dp', 'eas2dp', 'tas2dp',
+    'cas2eas', 'cas2tas', 'eas2cas', 'eas2tas', 'tas2cas', 'tas2eas',
+    'dp_over_p2mach', 'mach2dp_over_p', 'cas_mach2alt', 'cas_alt2mach',
+    'mach_alt2cas', 'mach2tas', 'tas2mach', 'mach2temp', 'tas2temp',
+    'ioat2tas', 'air_data',
+)
+
+CHUNK_SIZE = 65536  # lines
+
+# the units argument of the airspeed functions that applies to each input
+# or result, and the unit_conversion quantity of each units argument
+
+_ARGUMENT_UNITS = {
+    'dp': 'press_units',
+    'Ps': 'press_units',
+    'cas': 'speed_units',
+    'eas': 'speed_units',
+    'tas': 'speed_units',
+    'alt': 'alt_units',
+    'altitude': 'alt_units',
+    'press_alt': 'alt_units',
+    'temp': 'temp_units',
+    'ioat': 'temp_units',
+    'indicated_temp': 'temp_units',
+    'density': 'density_units',
+}
+
+# other names of the arguments that are not named alike in all the functions
+
+_ALIASES = {
+    'alt': 'altitude',
+    'altitude': 'alt',
+    'mach': 'M',
+    'M': 'mach',
+}
+
+_QUANTITIES = {
+    'alt_units': 'length',
+    'density_units': 'density',
+    'press_units': 'press',
+    'speed_units': 'speed',
+    'temp_units': 'temp',
+}
+
+
+def _split_units(text):
+    """
+    Split 'name[units]' into (name, units).  units is None if there are no
+    square brackets, or if they are empty or hold '-' (no units).
+    """
+
+    text = text.strip().strip('"')
+    if text.endswith(']') and '[' in text:
+        (name, units) = text[:-1].split('[', 1)
+        return (name.strip(), units.strip().strip('-') or None)
+    return (text, None)
+
+
+def _arguments(function):
+    """
+    Return the argument names of function, and a dict of the defaults of
+    the arguments that have them.
+    """
+
+    function = getattr(function, '__wrapped__', function)
+    code = function.__code__
+    names = code.co_varnames[:code.co_argcount]
+    defaults = function.__defaults__ or ()
+    return (names, dict(zip(names[len(names) - len(defaults):], defaults)))
+
+
+def _result_names(function):
+    """
+    Return the names of the results of function, e.g. 'tas' for cas2tas.
+    """
+
+    if function == 'air_data':
+        return A._AIR_DATA_DTYPE.names
+    return (function.rsplit('2', 1)[1],)
+
+
+def convert(
+    function,
+    infile,
+    outfile,
+    delimiter=None,
+    values=None,
+    units=None,
+    chunk_size=CHUNK_SIZE,
+    fmt='%.12g',
+):
+    """
+    Convert the delimited data read from infile with the airspeed function
+    named function, and write it and the results to outfile.
+
+    infile and outfile are open text files.  The first line of infile is
+    the header, described in the module docstring.  The delimiter is
+    detected from the header if it is not given: a tab if the header
+    contains one, or else a comma.
+
+    values is a dict of argument name to a value, or to a (value, units)
+    tuple, for arguments that have no column.  units is a dict of units
+    kind ('alt', 'density', 'press', 'speed' or 'temp') to the units of the
+    results.  The results are formatted with fmt.
+
+    A ValueError is raised if a required argument has no column or value,
+    or if the data can not be read or converted.
+    """
+
+    if function not in FUNCTIONS:
+        raise ValueError('function must be one of "' +
+                         '", "'.join(FUNCTIONS) + '".')
+    func = getattr(A, function)
+    (arg_names, defaults) = _arguments(func)
+
+    header = infile.readline().rstrip('\r\n')
+    if not header:
+        raise ValueError('The input has no header line.')
+    if delimiter is None:
+        delimiter = '\t' if '\t' in header else ','
+
+    # the function's inputs are (name, units, column index or value)
+
+    inputs = []
+    for (column, field) in enumerate(header.split(delimiter)):
+        (name, in_units) = _split_units(field)
+        if name not in arg_names:
+            name = _ALIASES.get(name)
+        if name in arg_names:
+            inputs.append((name, in_units, column))
+    for (name, value) in (values or {}).items():
+        if name not in arg_names and _ALIASES.get(name) in arg_names:
+            name = _ALIASES[name]
+        if name not in arg_names:
+            raise ValueError('%s is not an argument of %s.' % (name, function))
+        if isinstance(value, tuple):
+            inputs.append((name, value[1], value))
+        else:
+            inputs.append((name, None, (value, None)))
+
+    names = [name for (name, _, _) in inputs]
+    for name in names:
+        if names.count(name) > 1:
+            raise ValueError('%s is given more than once.' % name)
+    missing = [name for name in arg_names
+               if name not in defaults and name not in names]
+    if missing:
+        raise ValueError('%s needs %s.' % (function, ', '.join(missing)))
+    columns = [column for (_, _, column) in inputs if isinstance(column, int)]
+    if not columns:
+        raise ValueError('No column of the header is an argument of %s.'
+                         % function)
+
+    # the units of the results are those requested, or else those of the
+    # first input of the same kind.  Inputs in other units are converted.
+
+    kwargs = {}
+    for (kind, to_units) in (units or {}).items():
+        if kind + '_units' not in _QUANTITIES:
+            raise ValueError('units kind must be one of "' +
+                             '", "'.join(sorted(k[:-len('_units')] for k in
+                                                _QUANTITIES)) + '".')
+        if kind + '_units' in arg_names:
+            kwargs[kind + '_units'] = to_units
+    for (name, in_units, _) in inputs:
+        units_arg = _ARGUMENT_UNITS.get(name)
+        if in_units and units_arg in arg_names:
+            kwargs.setdefault(units_arg, in_units)
+
+    converters = {}
+    for (name, in_units, column) in inputs:
+        units_arg = _ARGUMENT_UNITS.get(name)
+        if units_arg not in arg_names:
+            if in_units:
+                raise ValueError('%s has no units.' % name)
+        elif units_arg in kwargs:
+            from_units = U.resolve_units(in_units or defaults[units_arg])
+            to_units = U.resolve_units(kwargs[units_arg])
+            if from_units != to_units:
+                converters[name] = U.converter(_QUANTITIES[units_arg],
+                                               from_units, to_units)
+        if not isinstance(column, int):
+            value = column[0]
+            if name in converters and not isinstance(value, str):
+                value = converters[name](value)
+            kwargs[name] = value
+
+    result_names = _result_names(function)
+    result_header = []
+    for name in result_names:
+        units_arg = _ARGUMENT_UNITS.get(name)
+        if units_arg in arg_names:
+            name += '[%s]' % U.resolve_units(kwargs.get(units_arg,
+                                                        defaults[units_arg]))
+        result_header.append(name)
+    outfile.write(delimiter.join([header] + result_header) + '\n')
+
+    column_inputs = [(name, column) for (name, _, column) in inputs
+                     if isinstance(column, int)]
+    line_number = 1
+    while True:
+        chunk = list(itertools.islice(infile, chunk_size))
+        if not chunk:
+            break
+        line_number += len(chunk)
+        lines = ''.join(chunk).splitlines()
+        if not all(lines):
+            lines = [line for line in lines if line]
+            if not lines:
+                continue
+
+        try:
+            data = np.loadtxt(lines, delimiter=delimiter, usecols=columns,
+                              ndmin=2, comments=None)
+        except ValueError as error:
+            raise ValueError('lines %d to %d: %s' % (
+                line_number - len(chunk) + 1, line_number, error))
+        for (i, (name, _)) in enumerate(column_inputs):
+            kwargs[name] = data[:, i]
+            if name in converters:
+                kwargs[name] = converters[name](kwargs[name])
+
+        result = func(**kwargs)
+        if len(result_names) > 1:
+            result = [result[name] for name in result_names]
+        else:
+            result = [result]
+        text = [map(fmt.__mod__,
+                    np.broadcast_to(column, (len(lines),)).tolist())
+                for column in result]
+        outfile.write('\n'.join(map(delimiter.join, zip(lines, *text))))
+        outfile.write('\n')
+
+
+def _name_value(text, option):
+    """
+    Split a NAME=VALUE command line option.
+    """
+
+    if '=' not in text:
+        raise ValueError('%s must be NAME=VALUE, not %r.' % (option, text))
+    return [item.strip() for item in text.split('=', 1)]
+
+
+def main(argv=None):
+    """
+    Run the batch conversion from the command line, with the arguments in
+    argv (sys.argv[1:] by default).  Return the exit status.
+    """
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='python -m aerocalc.batch',
+        description='Convert delimited air data with an airspeed function.  '
+                    'The header names the function arguments, with units in '
+                    'square brackets, e.g. cas[kt],altitude[ft].')
+    parser.add_argument('function', choices=FUNCTIONS, metavar='FUNCTION',
+                        help='the airspeed function: ' + ', '.join(FUNCTIONS))
+    parser.add_argument('-i', '--input', default='-',
+                        help='input file (default stdin)')
+    parser.add_argument('-o', '--output', default='-',
+                        help='output file (default stdout)')
+    parser.add_argument('-d', '--delimiter',
+                        help='field delimiter (default tab if the header '
+                             'has one, or else comma)')
+    parser.add_argument('-s', '--set', action='append', default=[],
+                        metavar='NAME=VALUE[UNITS]',
+                        help='value of an argument that has no column')
+    parser.add_argument('-u', '--units', action='append', default=[],
+                        metavar='KIND=UNITS',
+                        help='units of the results, e.g. speed=km/h')
+    parser.add_argument('-f', '--format', default='%.12g',
+                        help='format of the results (default %%.12g)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help='lines converted at a time (default %d)'
+                             % CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    infile = sys.stdin if args.input == '-' else open(args.input)
+    outfile = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        values = {}
+        for text in args.set:
+            (name, value) = _name_value(text, '--set')
+            (value, value_units) = _split_units(value)
+            try:
+                value = float(value)
+            except ValueError:
+                pass
+            values[name] = (value, value_units)
+        units = dict(_name_value(text, '--units') for text in args.units)
+
+        convert(args.function, infile, outfile, delimiter=args.delimiter,
+                values=values, units=units, chunk_size=args.chunk_size,
+                fmt=args.format)
+    except ValueError as error:
+        parser.exit(1, '%s: error: %s\n' % (parser.prog, error))
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
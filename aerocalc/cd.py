@@ -27,22 +27,30 @@
 # ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 # #############################################################################
 #
-# version 0.11, 30 Jun 2009
+# version 0.12, 18 Oct 2026
 #
 # Version History:
 # vers     date     Notes
 # 0.10   09 May 08  First public release.
 # 0.11   30 Jun 09  Python 3.0 compatibility.  Removed "from __future__
 #                   import division"
+# 0.12   18 Oct 26  cl2cd, cd2drag and eas2drag accept arrays, which are
+#                   broadcast against each other.  eas2drag converts its
+#                   inputs to SI units once.
 # #############################################################################
 
 """
 Various functions related to drag coefficients.
+
+The coefficients, speeds, weights, wing areas and polar parameters may be
+scalars or arrays.  Arrays are broadcast against each other, so a drag
+polar sweep over speeds and weights is a single call.
 """
 
 # import airspeed as A
 from . import cl
 import numpy as np
+from .std_atm import _to_array, _from_array
 # import std_atm as SA
 from . import unit_conversion as U
 from . import constants
@@ -96,9 +104,16 @@ def cl2cd(Cl, Cd0, AR, e):
     0.13784904952137844
     """
 
-    Cd = Cd0 + Cl ** 2 / ((np.pi * e) * AR)
+    return _from_array(_cl2cd(_to_array(Cl), _to_array(Cd0), _to_array(AR),
+                              _to_array(e)))
+
 
-    return Cd
+def _cl2cd(Cl, Cd0, AR, e):
+    """
+    Return the drag coefficient, as cl2cd, for array arguments.
+    """
+
+    return Cd0 + Cl ** 2 / ((np.pi * e) * AR)
 
 
 # #############################################################################
@@ -128,14 +143,24 @@ def cd2drag(
     652.19907407407425
     """
 
-    eas = U.speed_conv(eas, from_units=speed_units, to_units='m/s')
-    wing_area = U.area_conv(wing_area, from_units=area_units,
+    eas = U.speed_conv(_to_array(eas), from_units=speed_units,
+                       to_units='m/s')
+    wing_area = U.area_conv(_to_array(wing_area), from_units=area_units,
                             to_units='m**2')
 
-    drag = (((0.5 * Rho0) * eas ** 2) * wing_area) * Cd
+    drag = _cd2drag(_to_array(Cd), eas, wing_area)
     drag = U.force_conv(drag, from_units='N', to_units=drag_units)
 
-    return drag
+    return _from_array(drag)
+
+
+def _cd2drag(Cd, eas, wing_area):
+    """
+    Return the drag in N, given the drag coefficient, EAS in m/s and wing
+    area in m**2.
+    """
+
+    return (((0.5 * Rho0) * eas ** 2) * wing_area) * Cd
 
 
 # #############################################################################
@@ -182,26 +207,17 @@ def eas2drag(
     136.76711702310882
     """
 
-    Cl = cl.eas2cl(
-        eas,
-        weight,
-        wing_area,
-        load_factor,
-        speed_units,
-        weight_units,
-        area_units,
-    )
-    Cd = cl2cd(Cl, Cd0, AR, e)
-    drag = cd2drag(
-        Cd,
-        eas,
-        wing_area,
-        speed_units,
-        area_units,
-        drag_units,
-    )
-
-    return drag
+    eas = U.speed_conv(_to_array(eas), from_units=speed_units,
+                       to_units='m/s')
+    (weight, wing_area, load_factor) = cl._lift_inputs(
+        weight, wing_area, load_factor, weight_units, area_units)
+
+    Cl = cl._eas2cl(eas, weight, wing_area, load_factor)
+    Cd = _cl2cd(Cl, _to_array(Cd0), _to_array(AR), _to_array(e))
+    drag = _cd2drag(Cd, eas, wing_area)
+    drag = U.force_conv(drag, from_units='N', to_units=drag_units)
+
+    return _from_array(drag)
 
 
 def drag2drag_area(drag, eas, drag_units=default_weight_units,
@@ -34,6 +34,9 @@
 # 0.10   04 May 08  First public release.
 # 0.11   30 Jun 09  Python 3.0 compatibility.  Removed from __future__
 #                   import division
+# 0.12   18 Oct 26  All functions accept arrays, which are broadcast against
+#                   each other.  The inputs are converted to SI units once,
+#                   and the speed conversions are done in m/s.
 # #############################################################################
 #
 # To Do:  1. Add doctests or unit tests for all functions.
@@ -43,9 +46,15 @@
 
 """
 Various functions related to lift coefficients.
+
+The speeds, weights, wing areas, altitudes, temperatures, load factors and
+lift coefficients may be scalars or arrays.  Arrays are broadcast against
+each other, e.g. a column of speeds and a row of weights give a grid of
+lift coefficients.
 """
 
 from . import airspeed as A
+from .std_atm import _to_array, _from_array
 from . import unit_conversion as U
 from . import constants
 
@@ -67,6 +76,50 @@ Rho0 = constants.Rho0  # Density at sea level, kg/m**3
 A0 = constants.A0  # speed of sound at sea level, std day, m/s
 g = constants.g
 
+_N2lb = U.converter('force', 'N', 'lb')
+_lb2kg = U.converter('mass', 'lb', 'kg')
+
+
+def _lift_inputs(weight, wing_area, load_factor, weight_units, area_units):
+    """
+    Return the weight in kg, wing area in m**2 and load factor as arrays.
+    """
+
+    weight = U.wt_conv(_to_array(weight), from_units=weight_units,
+                       to_units='kg')
+    wing_area = U.area_conv(_to_array(wing_area), from_units=area_units,
+                            to_units='m**2')
+    return (weight, wing_area, _to_array(load_factor))
+
+
+def _eas2cl(eas, weight, wing_area, load_factor):
+    """
+    Return the lift coefficient, given the EAS in m/s, weight in kg and wing
+    area in m**2.
+    """
+
+    return (((2. * weight) * g) * load_factor) / ((Rho0 * wing_area) * eas
+                                                  ** 2.)
+
+
+def _cl2eas(Cl, weight, wing_area, load_factor):
+    """
+    Return the EAS in m/s, given the lift coefficient, weight in kg and wing
+    area in m**2.
+    """
+
+    return ((((2. * weight) * g) * load_factor) / ((Rho0 * wing_area)
+                                                   * Cl)) ** 0.5
+
+
+def _cl2lift(Cl, eas, wing_area):
+    """
+    Return the lift in N, given the lift coefficient, EAS in m/s and wing
+    area in m**2.  Also the drag, given the drag coefficient.
+    """
+
+    return (((0.5 * Rho0) * eas ** 2.) * wing_area) * Cl
+
 # #############################################################################
 #
 # eas2cl
@@ -103,18 +156,15 @@ def eas2cl(
     >>> W = 1800
     >>> EAS = 55
     >>> eas2cl(EAS, W, S, speed_units='kt', weight_units='lb', area_units='ft**2')
-    1.597820083228606
+    1.5978200832286058
     """
 
-    eas = U.speed_conv(eas, from_units=speed_units, to_units='m/s')
-    weight = U.wt_conv(weight, from_units=weight_units, to_units='kg')
-    wing_area = U.area_conv(wing_area, from_units=area_units,
-                            to_units='m**2')
-
-    Cl = (((2. * weight) * g) * load_factor) / ((Rho0 * wing_area) * eas
-                                                ** 2.)
+    eas = U.speed_conv(_to_array(eas), from_units=speed_units,
+                       to_units='m/s')
+    (weight, wing_area, load_factor) = _lift_inputs(
+        weight, wing_area, load_factor, weight_units, area_units)
 
-    return Cl
+    return _from_array(_eas2cl(eas, weight, wing_area, load_factor))
 
 
 # #############################################################################
@@ -161,19 +211,13 @@ def cas2cl(
 
     """
 
-    eas = A.cas2eas(cas, altitude, speed_units, alt_units)
+    cas = U.speed_conv(_to_array(cas), from_units=speed_units,
+                       to_units='m/s')
+    eas = A.cas2eas(cas, altitude, speed_units='m/s', alt_units=alt_units)
+    (weight, wing_area, load_factor) = _lift_inputs(
+        weight, wing_area, load_factor, weight_units, area_units)
 
-    Cl = eas2cl(
-        eas,
-        weight,
-        wing_area,
-        load_factor,
-        speed_units,
-        weight_units,
-        area_units,
-    )
-
-    return Cl
+    return _from_array(_eas2cl(eas, weight, wing_area, load_factor))
 
 
 # #############################################################################
@@ -203,30 +247,19 @@ def tas2cl(
     and wing area.
 
     Temperature and load factor are optional inputs.  The temperature, if
-    not provided, defaults to the standard temperature for the altitude.
+    not provided, defaults to the standard temperature for the altitude.  It
+    may also be a std_atm.Atmosphere, for a non-standard day.
     The load factor, if not provided, defaults to 1.
     """
 
-    eas = A.tas2eas(
-        tas,
-        altitude,
-        temperature,
-        speed_units,
-        alt_units,
-        temp_units,
-    )
-
-    Cl = eas2cl(
-        eas,
-        weight,
-        wing_area,
-        load_factor,
-        speed_units,
-        weight_units,
-        area_units,
-    )
+    tas = U.speed_conv(_to_array(tas), from_units=speed_units,
+                       to_units='m/s')
+    eas = A.tas2eas(tas, altitude, temperature, speed_units='m/s',
+                    alt_units=alt_units, temp_units=temp_units)
+    (weight, wing_area, load_factor) = _lift_inputs(
+        weight, wing_area, load_factor, weight_units, area_units)
 
-    return Cl
+    return _from_array(_eas2cl(eas, weight, wing_area, load_factor))
 
 
 # #############################################################################
@@ -255,14 +288,13 @@ def cl2eas(
     defaults to 1.
     """
 
-    weight = U.wt_conv(weight, from_units=weight_units, to_units='kg')
-    wing_area = U.area_conv(wing_area, from_units=area_units,
-                            to_units='m**2')
+    (weight, wing_area, load_factor) = _lift_inputs(
+        weight, wing_area, load_factor, weight_units, area_units)
 
-    eas = ((((2. * weight) * g) * load_factor) / ((Rho0 * wing_area)
-                                                  * Cl)) ** 0.5
+    eas = _cl2eas(_to_array(Cl), weight, wing_area, load_factor)
     eas = U.speed_conv(eas, from_units='m/s', to_units=speed_units)
-    return eas
+
+    return _from_array(eas)
 
 
 # #############################################################################
@@ -293,16 +325,14 @@ def cl2cas(
     defaults to 1.
     """
 
-    weight = U.wt_conv(weight, from_units=weight_units, to_units='kg')
-    wing_area = U.area_conv(wing_area, from_units=area_units,
-                            to_units='m**2')
+    (weight, wing_area, load_factor) = _lift_inputs(
+        weight, wing_area, load_factor, weight_units, area_units)
 
-    eas = ((((2. * weight) * g) * load_factor) / ((Rho0 * wing_area)
-                                                  * Cl)) ** 0.5
-    eas = U.speed_conv(eas, from_units='m/s', to_units=speed_units)
-    cas = A.eas2cas(eas, altitude, speed_units, alt_units)
+    eas = _cl2eas(_to_array(Cl), weight, wing_area, load_factor)
+    cas = A.eas2cas(eas, altitude, speed_units='m/s', alt_units=alt_units)
+    cas = U.speed_conv(cas, from_units='m/s', to_units=speed_units)
 
-    return cas
+    return _from_array(cas)
 
 
 # #############################################################################
@@ -332,27 +362,20 @@ def cl2tas(
     and wing area.
 
     Temperature and load factor are optional inputs.  The temperature, if
-    not provided, defaults to the standard temperature for the altitude.
+    not provided, defaults to the standard temperature for the altitude.  It
+    may also be a std_atm.Atmosphere, for a non-standard day.
     The load factor, if not provided, defaults to 1.
     """
 
-    weight = U.wt_conv(weight, from_units=weight_units, to_units='kg')
-    wing_area = U.area_conv(wing_area, from_units=area_units,
-                            to_units='m**2')
+    (weight, wing_area, load_factor) = _lift_inputs(
+        weight, wing_area, load_factor, weight_units, area_units)
 
-    eas = ((((2. * weight) * g) * load_factor) / ((Rho0 * wing_area)
-                                                  * Cl)) ** 0.5
-    eas = U.speed_conv(eas, from_units='m/s', to_units=speed_units)
-    tas = A.eas2tas(
-        eas,
-        altitude,
-        temperature,
-        speed_units,
-        alt_units,
-        temp_units=temp_units,
-    )
+    eas = _cl2eas(_to_array(Cl), weight, wing_area, load_factor)
+    tas = A.eas2tas(eas, altitude, temperature, speed_units='m/s',
+                    alt_units=alt_units, temp_units=temp_units)
+    tas = U.speed_conv(tas, from_units='m/s', to_units=speed_units)
 
-    return tas
+    return _from_array(tas)
 
 
 # #############################################################################
@@ -377,18 +400,18 @@ def cl2lift(
     area.
     """
 
-    eas = U.speed_conv(eas, from_units=speed_units, to_units='m/s')
-    wing_area = U.area_conv(wing_area, from_units=area_units,
+    eas = U.speed_conv(_to_array(eas), from_units=speed_units,
+                       to_units='m/s')
+    wing_area = U.area_conv(_to_array(wing_area), from_units=area_units,
                             to_units='m**2')
 
-    lift = (((0.5 * Rho0) * eas ** 2.) * wing_area) * Cl
-    if lift_units == 'kg':
-        lift = U.force_conv(lift, 'N', 'lb')
-        lift = U.mass_conv(lift, 'lb', 'kg')
+    lift = _cl2lift(_to_array(Cl), eas, wing_area)
+    if U.resolve_units(lift_units) == 'kg':
+        lift = _lb2kg(_N2lb(lift))
     else:
         lift = U.force_conv(lift, 'N', lift_units)
 
-    return lift
+    return _from_array(lift)
 
 
 if __name__ == '__main__':  # pragma: no cover
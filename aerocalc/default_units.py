@@ -33,6 +33,8 @@
 # 0.10   17 Mar 08   Initial version.
 # 0.11   30 Jun 09   Python 3.0 changes
 # 0.20   18 Apr 10   Add viscosity units
+# 0.21   18 Oct 26   Add the units context, to change the default units per
+#                    thread or asyncio task, without reloading modules
 # #############################################################################
 #
 # To Do: 1. Add option to use config file in user's home directory to override
@@ -42,19 +44,139 @@
 
 """
 Defines the default units to be used for various modules.
+
+The defaults are bound into the function signatures when the modules are
+imported, but each one is a DefaultUnits string that the unit conversions
+look up in the current unit context.  The context is changed with units(),
+for the current thread or asyncio task only:
+
+>>> from aerocalc import std_atm
+>>> from aerocalc.default_units import units
+>>> with units(alt='m', temp='K'):
+...     std_atm.alt2temp(11000)
+216.64999999999998
+
+Units passed explicitly are always used as given.
 """
 
-default_area_units = 'ft**2'
-default_avgas_units = 'lb'
-default_density_units = 'lb/ft**3'
-default_length_units = 'ft'
-default_power_units = 'hp'
-default_press_units = 'in HG'
-default_speed_units = 'kt'
-default_temp_units = 'C'
-default_weight_units = 'lb'
-default_vol_units = 'ft**3'
-default_dynamic_viscosity_units = 'Pa s'
-default_kinematic_viscosity_units = 'm**2/s'
-
-default_alt_units = default_length_units
+import contextlib
+import threading
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # Python < 3.7
+    ContextVar = None
+
+__all__ = [
+    'default_area_units', 'default_avgas_units', 'default_density_units',
+    'default_length_units', 'default_power_units', 'default_press_units',
+    'default_speed_units', 'default_temp_units', 'default_weight_units',
+    'default_vol_units', 'default_dynamic_viscosity_units',
+    'default_kinematic_viscosity_units', 'default_alt_units',
+]
+
+
+class _ThreadLocalVar(object):
+
+    """
+    The get, set and reset methods of a ContextVar, per thread, for Pythons
+    without contextvars.
+    """
+
+    def __init__(self, default):
+        self._local = threading.local()
+        self._default = default
+
+    def get(self):
+        return getattr(self._local, 'value', self._default)
+
+    def set(self, value):
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        self._local.value = token
+
+
+if ContextVar is None:
+    _context = _ThreadLocalVar({})
+else:
+    _context = ContextVar('aerocalc_units', default={})
+
+# the kind to look up when a kind is not set in the context
+
+_FALLBACK = {'alt': 'length'}
+
+
+class DefaultUnits(str):
+
+    """
+    A default units string.  It compares equal to the units in this file,
+    and resolve() returns the units for its kind in the current context.
+    """
+
+    def __new__(cls, units, kind):
+        self = str.__new__(cls, units)
+        self.kind = kind
+        self.units = str(units)
+        return self
+
+    def resolve(self):
+        context = _context.get()
+        if context:
+            kind = self.kind
+            while kind not in context:
+                if kind not in _FALLBACK:
+                    return self.units
+                kind = _FALLBACK[kind]
+            return context[kind]
+        return self.units
+
+
+@contextlib.contextmanager
+def units(**kinds):
+    """
+    Set the default units for a block of code, in the current thread or
+    asyncio task, e.g. units(speed='km/h', alt='m').
+
+    The kinds are area, avgas, density, length, power, press, speed, temp,
+    weight, vol, dynamic_viscosity, kinematic_viscosity and alt.  alt
+    defaults to the length units.  Contexts may be nested.
+    """
+
+    for kind in kinds:
+        if 'default_' + kind + '_units' not in __all__:
+            raise ValueError('Unknown kind of units: ' + kind)
+    token = _context.set(dict(_context.get(), **kinds))
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def get_units(kind):
+    """
+    Return the default units for a kind, in the current context.
+    """
+
+    if 'default_' + kind + '_units' not in __all__:
+        raise ValueError('Unknown kind of units: ' + kind)
+    return globals()['default_' + kind + '_units'].resolve()
+
+
+default_area_units = DefaultUnits('ft**2', 'area')
+default_avgas_units = DefaultUnits('lb', 'avgas')
+default_density_units = DefaultUnits('lb/ft**3', 'density')
+default_length_units = DefaultUnits('ft', 'length')
+default_power_units = DefaultUnits('hp', 'power')
+default_press_units = DefaultUnits('in HG', 'press')
+default_speed_units = DefaultUnits('kt', 'speed')
+default_temp_units = DefaultUnits('C', 'temp')
+default_weight_units = DefaultUnits('lb', 'weight')
+default_vol_units = DefaultUnits('ft**3', 'vol')
+default_dynamic_viscosity_units = DefaultUnits('Pa s', 'dynamic_viscosity')
+default_kinematic_viscosity_units = DefaultUnits('m**2/s',
+                                                 'kinematic_viscosity')
+
+default_alt_units = DefaultUnits(default_length_units, 'alt')
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# #############################################################################
+# Copyright (c) 2008, Kevin Horton
+# All rights reserved.
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# *
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * The name of Kevin Horton may not be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+# *
+# THIS SOFTWARE IS PROVIDED BY KEVIN HORTON ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO
+# EVENT SHALL KEVIN HORTON BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+# OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+# OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+# ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# #############################################################################
+#
+# version 0.10, 18 Oct 2026
+#
+# Version History:
+# vers     date     Notes
+# 0.10   18 Oct 26  First version.
+# #############################################################################
+
+"""
+An opt-in memo of the scalar airspeed and standard atmosphere conversions.
+
+Performance tables and sweeps often repeat the same conversion, e.g. the
+same altitude and temperature for every speed.  When the memo is enabled,
+a call of one of the memoized functions with scalar arguments returns the
+result of an earlier call with the same arguments and units, if there was
+one.  The memo holds the most recently used results, up to its maximum
+size.
+
+The numeric arguments are rounded to a number of significant digits (12 by
+default) to form the memo key, and the function is evaluated with the
+rounded values, so arguments that round alike share one result.  Default
+units are looked up in the unit context (see default_units.units) when the
+key is formed.  Calls with array arguments, NaN, or a std_atm.Atmosphere,
+are not memoized.
+
+The memo is disabled by default, and is shared by all threads.
+
+Example:
+
+>>> from aerocalc import airspeed, memo
+>>> memo.enable(maxsize=1000)
+>>> for cas in (100, 120, 100):
+...     tas = airspeed.cas2tas(cas, 8000, temp=10)
+>>> memo.info()  # cas2tas, and the conversions it calls
+MemoInfo(hits=2, misses=5, maxsize=1000, currsize=5)
+>>> memo.disable()
+"""
+
+import collections
+import functools
+import threading
+
+try:
+    from .default_units import DefaultUnits
+except ImportError:
+    DefaultUnits = None
+
+MemoInfo = collections.namedtuple('MemoInfo',
+                                  'hits misses maxsize currsize')
+
+_memo = None  # the OrderedDict of results, least recently used first
+_maxsize = 0
+_digits = 12
+_hits = 0
+_misses = 0
+_lock = threading.Lock()
+
+
+def enable(maxsize=4096, digits=12):
+    """
+    Enable the memo, holding up to maxsize results, with the numeric
+    arguments rounded to digits significant digits.  If the memo is already
+    enabled, its size and rounding are changed, and the results it holds are
+    kept unless the rounding changed.
+    """
+
+    global _memo, _maxsize, _digits
+
+    if maxsize < 1:
+        raise ValueError('maxsize must be at least 1.')
+    if digits < 1 or digits > 17:
+        raise ValueError('digits must be between 1 and 17.')
+    with _lock:
+        if _memo is None or digits != _digits:
+            _memo = collections.OrderedDict()
+        (_maxsize, _digits) = (maxsize, digits)
+        while len(_memo) > _maxsize:
+            _memo.popitem(last=False)
+
+
+def disable():
+    """
+    Disable the memo, and discard the results it holds.  The statistics
+    are kept until clear() is called.
+    """
+
+    global _memo
+
+    with _lock:
+        _memo = None
+
+
+def clear():
+    """
+    Discard the results held in the memo, and reset the hit and miss
+    counts.
+    """
+
+    global _hits, _misses
+
+    with _lock:
+        if _memo is not None:
+            _memo.clear()
+        _hits = _misses = 0
+
+
+def info():
+    """
+    Return the memo statistics, as a MemoInfo of the number of hits and
+    misses, the maximum size and the current size.  The maximum size is 0
+    when the memo is disabled.
+    """
+
+    with _lock:
+        if _memo is None:
+            return MemoInfo(_hits, _misses, 0, 0)
+        return MemoInfo(_hits, _misses, _maxsize, len(_memo))
+
+
+def _key(value, digits):
+    """
+    Return the key for an argument value, or raise TypeError if a call with
+    it can not be memoized.
+    """
+
+    kind = type(value)
+    if kind is float or kind is int:
+        return _number_key(value, digits)
+    if kind is str or value is None:
+        return value
+    if kind is DefaultUnits:
+        return value.resolve()
+    if isinstance(value, float):  # e.g. numpy.float64
+        return _number_key(value, digits)
+    raise TypeError
+
+
+def _number_key(value, digits):
+    """
+    Return the key for a number, rounded to digits significant digits.  A
+    NaN raises TypeError, since its key would never match (NaN != NaN).
+    """
+
+    key = float('%.*g' % (digits, value))
+    if key != key:
+        raise TypeError
+    return key
+
+
+def memoize(function):
+    """
+    Decorate a function so that its scalar calls use the memo, when it is
+    enabled.
+    """
+
+    code = function.__code__
+    names = code.co_varnames[:code.co_argcount]
+    defaults = function.__defaults__ or ()
+    defaults = dict(zip(names[len(names) - len(defaults):], defaults))
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        global _hits, _misses
+
+        memo = _memo
+        if memo is None or len(args) > len(names):
+            return function(*args, **kwargs)
+        try:
+            for name in kwargs:
+                if name not in names[len(args):]:
+                    raise TypeError
+            values = list(args) + [kwargs[name] if name in kwargs
+                                   else defaults[name]
+                                   for name in names[len(args):]]
+            digits = _digits
+            key = tuple([function] + [_key(value, digits)
+                                      for value in values])
+        except (KeyError, TypeError):
+            return function(*args, **kwargs)
+
+        with _lock:
+            if key in memo:
+                _hits += 1
+                result = memo.pop(key)
+                memo[key] = result
+                return result
+            _misses += 1
+
+        result = function(*key[1:])
+
+        with _lock:
+            memo[key] = result
+            while len(memo) > _maxsize:
+                memo.popitem(last=False)
+        return result
+
+    wrapper.__wrapped__ = function
+    return wrapper
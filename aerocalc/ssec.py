@@ -62,6 +62,8 @@ from .default_units import (
 
 # P0 = constants.P0  # Pressure at sea level, pa
 
+_mps2kt = unit.converter('speed', 'm/s', 'kt')
+
 
 # #############################################################################
 #
@@ -371,7 +373,7 @@ def tas2ssec2(tas, ind_alt, oat, ias, std_alt=0,
         press_units=press_units) - std_alt
 
     delta_std_alt = std_atm.alt2press_ratio(std_alt, alt_units='ft')
-    asl = unit.speed_conv(constants.A0, 'm/s', 'kt')
+    asl = _mps2kt(constants.A0)
     delta_Vpc_std_alt = deltaPp_over_Ps * delta_std_alt * \
         asl**2 / (1.4 * ias * (1 + 0.2 * (ias / asl)**2)**2.5)
 
@@ -53,6 +53,36 @@
 # 0.19   30 Jun 09  Python 3.0 compatible.  Tested with 2.5, 2.6 and 3.0.
 #
 # 0.20   18 Apr 10  Added dynamic and kinematic viscosity.
+#
+# 0.21   18 Oct 26  Altitude to temperature, pressure and density functions
+#                   accept arrays, with the layer selected for each element.
+#                   Pressure and density to altitude functions accept arrays,
+#                   returning NaN for out of range elements.
+#                   Add table mode (set_mode), interpolating temperature and
+#                   pressure ratio from precomputed tables.
+#                   Extended to 1000 km geometric altitude, with the upper
+#                   atmosphere of the 1976 model.
+#                   density_alt2temp solves for the temperature directly,
+#                   instead of by bisection, and accepts humidity.
+#                   density_alt, sat_press and pressure_alt accept arrays.
+#                   A missing dew point or relative humidity is NaN.
+#                   Saturation pressure polynomial evaluated with np.polyval
+#                   for arrays, with an optional memo for scalars
+#                   (set_sat_press_memo).
+#                   density_alt_table computes its rows as arrays, and
+#                   writes text, csv, html or array tables, to a file object.
+#                   Viscosity and Reynold's number functions accept arrays.
+#                   Add alt2Re.
+#                   Add Atmosphere, for non-standard atmospheres from an ISA
+#                   deviation or a sounding.
+#                   Add geometric2geopotential, geopotential2geometric and
+#                   gravity, with Lambert's equation for latitude.  Altitude
+#                   functions accept altitude_type='geometric'.
+#                   Default units follow the unit context of default_units.
+#                   The layer constants and equation coefficients are held in
+#                   one structured array, _LAYERS.
+#                   The scalar altitude, temperature, pressure and density
+#                   functions use the memo module, when it is enabled.
 # #############################################################################
 #
 # To Do: 1. Done.
@@ -78,7 +108,7 @@
 #
 #        9. Review API for all public functions for consistency of units, etc.
 #
-#       10. Extend module above 86 km altitude.
+#       10. Done.
 #
 #       11. Add examples for all functions.
 #
@@ -106,6 +136,8 @@
 #           pressure_alt
 #           sat_press
 #           density_alt2temp
+#
+#       10. Extended module above 86 km altitude, to 1000 km.
 # #############################################################################
 
 """Calculate standard atmosphere parametres.
@@ -115,9 +147,24 @@ Standard Atmosphere.  The default units for the input and output are defined
 in default_units.py
 
 All altitudes are geopotential altitudes (i.e. it is assumed that there is
-no variation with altitude of the acceleration due to gravity).
-
-Works up to 84.852 km (278,386 ft) altitude.
+no variation with altitude of the acceleration due to gravity), unless
+altitude_type='geometric' is passed to the altitude functions.
+geometric2geopotential, geopotential2geometric and gravity account for the
+variation of gravity with altitude and latitude.
+
+Works up to 864.071 km (1000 km geometric) altitude.  Above 84.852 km (86 km
+geometric), the temperature, pressure and density are from the upper
+atmosphere of the 1976 model.  Its pressure and density come from the number
+density of each gas, found by numerical integration, which is done once, the
+first time an altitude above 84.852 km is used.  The temperature above
+84.852 km is the kinetic temperature, rather than the molecular scale
+temperature used below, so it is 0.08 deg K lower at the boundary.
+
+The altitude to temperature, pressure and density functions have two modes,
+selected with set_mode().  In 'exact' mode (the default), the equations for
+each layer are evaluated.  In 'table' mode, the values are interpolated from
+precomputed tables, which is two to three times faster for large arrays
+(see test/bench_std_atm.py), with a relative error of less than 2e-11.
 
 The 1976 US Standard Atmosphere is defined in NASA-TM-X-74335:
 http://ntrs.nasa.gov/archive/nasa/casi.ntrs.nasa.gov/19770009539_1977009539.pdf
@@ -129,9 +176,9 @@ http://www.atmosculator.com/The%20Standard%20Atmosphere.html?
 """
 
 from . import constants
+from . import memo
 from . import unit_conversion as U
 import numpy as np
-import locale as L
 try:
     from .default_units import *
 except ImportError:
@@ -151,6 +198,7 @@ except ImportError:
 
 g = constants.g  # Acceleration of gravity at 45.542 deg latitude, m/s**s
 Rd = constants.Rd  # Gas constant for dry air, J/kg K
+Rv = 461.495  # Gas constant for water vapour, J/kg K
 
 # conditions starting at sea level, in a region with temperature gradient
 
@@ -205,6 +253,787 @@ L71 = -2.  # temperature lapse rate, starting at 71,000 m, deg K/km
 P71 = PR71 * P0
 Rho71 = (Rho0 * PR71) * (T0 / T71)
 
+# conditions at 84.852 km (86 km geometric), the top of the layers above.  The
+# upper atmosphere model is used at higher altitudes.
+
+H85 = 84.852  # top of the layers, km geopotential
+T85 = T71 + (H85 - 71) * L71
+PR85 = PR71 * (T85 / T71) ** ((-1000 * g) / (Rd * L71))
+P85 = PR85 * P0
+Rho85 = (Rho0 * PR85) * (T0 / T85)
+
+# #############################################################################
+#
+# Layer table
+#
+# One row per layer, with the base altitude (km), temperature (deg K), lapse
+# rate (deg K/km), pressure ratio, pressure (pa) and density (kg/m**3), and
+# the coefficients of the layer equations:
+#
+#   gradient layers                         isothermal layers
+#   T = T + L * dH
+#   PR = PR * (1 + L_T * dH) ** PR_exp      PR = PR * exp(-dH * k)
+#   H = H + T_L * ((P / P) ** H_P_exp - 1)  H = H - RT * log(P / P) / (1000 g)
+#   H = H + T_L * ((Rho / Rho) ** H_Rho_exp - 1)
+#
+# where dH is the height above the layer base.  The gradient coefficients are
+# zero in the isothermal layers, so that the gradient equations are finite
+# there, and each function evaluates both forms and selects one with
+# np.where, rather than splitting the elements by layer type.
+#
+# #############################################################################
+
+_LAYERS = np.zeros(7, dtype=[
+    ('H', float), ('T', float), ('L', float), ('PR', float), ('P', float),
+    ('Rho', float), ('isothermal', bool), ('L_T', float), ('T_L', float),
+    ('PR_exp', float), ('H_P_exp', float), ('H_Rho_exp', float),
+    ('k', float), ('RT', float)])
+
+_LAYERS['H'] = [0., 11., 20., 32., 47., 51., 71.]
+_LAYERS['T'] = [T0, T11, T20, T32, T47, T51, T71]
+_LAYERS['L'] = [L0, 0., L20, L32, 0., L51, L71]
+_LAYERS['P'] = [P0, P11, P20, P32, P47, P51, P71]
+_LAYERS['PR'] = _LAYERS['P'] / P0
+_LAYERS['Rho'] = [Rho0, Rho11, Rho20, Rho32, Rho47, Rho51, Rho71]
+_LAYERS['isothermal'] = _LAYERS['L'] == 0
+
+
+def _layer_coefficients(layers):
+    """
+    Fill in the equation coefficients of the layer table.
+    """
+
+    grad = ~layers['isothermal']
+    L = layers['L'][grad]
+    T = layers['T'][grad]
+    layers['L_T'][grad] = L / T
+    layers['T_L'][grad] = T / L
+    layers['PR_exp'][grad] = (-1000 * g) / (Rd * L)
+    layers['H_P_exp'][grad] = ((-1 * Rd) * L) / (1000 * g)
+    layers['H_Rho_exp'][grad] = -1 / ((1000 * g) / (Rd * L) + 1)
+    layers['k'] = (1000 * g) / (Rd * layers['T'])
+    layers['RT'] = Rd * layers['T']
+
+
+_layer_coefficients(_LAYERS)
+
+# base altitude and the reversed pressure and density at the layer bases,
+# for the layer searches
+
+_LAYER_H = _LAYERS['H'].copy()
+_LAYER_P_REV = _LAYERS['P'][:0:-1].copy()
+_LAYER_RHO_REV = _LAYERS['Rho'][:0:-1].copy()
+
+# unit converters for the fixed unit pairs used below
+
+_hpa2in_hg = U.converter('press', 'hpa', 'in HG')
+_pa2in_hg = U.converter('press', 'pa', 'in HG')
+_C2F = U.converter('temp', 'C', 'F')
+_K2C = U.converter('temp', 'K', 'C')
+
+# #############################################################################
+#
+# Array support
+#
+# #############################################################################
+
+
+def _to_array(value):
+    """
+    Return a float array copy of value.  The copy may be modified in place
+    without changing the caller's data.
+    """
+
+    return np.array(value, dtype=float)
+
+
+def _from_array(value):
+    """
+    Return a zero dimensional array as a float, so that scalar inputs give
+    scalar results.  Other arrays are returned unchanged.
+    """
+
+    if np.ndim(value) == 0:
+        return float(value)
+    return value
+
+
+def _alt2layer(H):
+    """
+    Return the index of the layer containing each altitude in km.
+
+    Altitudes at a layer boundary belong to the lower layer, and altitudes
+    below sea level belong to the first layer.
+    """
+
+    layer = np.searchsorted(_LAYER_H, H, side='left') - 1
+    return np.clip(layer, 0, len(_LAYERS) - 1)
+
+
+def _check_alt_range(H):
+    """
+    Raise a ValueError if any altitude in km is above the top of the model.
+    """
+
+    if np.any(H > _H_TOP):
+        raise ValueError(_ALT_RANGE_MSG)
+
+
+def _base2layer(value, reversed_base):
+    """
+    Return the index of the layer containing each value of a quantity that
+    decreases with altitude (e.g. pressure or density), given the values of
+    that quantity at the layer bases above the first, from the top down.
+
+    Values equal to a layer base value belong to the lower layer, and values
+    greater than the sea level value belong to the first layer.
+    """
+
+    return len(reversed_base) - np.searchsorted(reversed_base, value,
+                                                side='left')
+
+
+def _inverse_range2nan(H, value):
+    """
+    Check the altitudes in km returned by an inverse function (e.g. pressure
+    to altitude).  value is the input pressure or density.
+
+    A scalar altitude above the top of the model raises a ValueError, as
+    does a scalar pressure or density that is not positive.  In an array,
+    these out of range elements are set to NaN instead, so that one bad
+    sample does not abort the rest of the batch.
+    """
+
+    out_of_range = (H > _H_TOP) | (value <= 0)
+    if np.ndim(H) == 0:
+        if out_of_range:
+            raise ValueError(_ALT_RANGE_MSG)
+    else:
+        H[out_of_range] = np.nan
+
+    return H
+
+
+# #############################################################################
+#
+# Upper atmosphere
+#
+# From 86 km to 1000 km geometric altitude, the 1976 model defines the
+# kinetic temperature as a function of geometric altitude, and the number
+# density of each gas species (N2, O, O2, Ar, He and H) by integrating the
+# diffusion equations of NASA-TM-X-74335, section 1.3.  The pressure and
+# density follow from the number densities:
+#
+#     P = k * T * sum(n)
+#     Rho = sum(n * M) / NA
+#
+# The integrals have no closed form, so they are evaluated once, on a
+# uniform geometric altitude grid, the first time an altitude above 84.852 km
+# is requested.  The logarithms of pressure and density are then linearly
+# interpolated.  The relative error in pressure and density, from the
+# integration and interpolation, is less than 1e-4, and the values agree with
+# the published tables to within 0.1%.  The temperature is always evaluated
+# from its equations.
+#
+# The step includes each altitude where the equations change (91, 100, 110,
+# 115, 120, 150 and 500 km), and the integrals use the trapezoidal rule.
+#
+# The top of the layers, 84.852 km geopotential, is 85.99995 km geometric.
+# The grid is extended down to it from its first step, and the integrated
+# pressure and density, which differ from the values of the layers (P85 and
+# Rho85) by a few parts in 1e6, are scaled to match there.  Pressure and
+# density then decrease continuously across the boundary, and press2alt and
+# density2alt have a single answer there.
+#
+# Within this section, altitudes are geometric, in km.
+#
+# #############################################################################
+
+_R0 = 6356.766  # effective earth radius for geopotential altitude, km
+_Z7 = 86.  # base of the upper atmosphere, km geometric
+_Z_TOP = 1000.  # top of the model, km geometric
+_UPPER_STEP = 0.05  # altitude step of the integration grid, km
+
+_K_BOLTZMANN = 1.380622e-23  # Boltzmann constant, J/K
+_R_STAR = 8.31432  # universal gas constant, J/(mol K)
+_N_AVOGADRO = 6.022169e23  # Avogadro constant, 1/mol
+_M0 = 0.0289644  # molar mass of air at sea level, kg/mol
+
+# temperature profile: isothermal from 86 km, elliptical from 91 km, linear
+# from 110 km, and approaching the exospheric temperature from 120 km
+
+_T7 = 186.8673  # kinetic temperature at 86 km, deg K
+_TC = 263.1905  # elliptical layer constants, deg K, deg K and km
+_A_ELLIPSE = -76.3232
+_a_ELLIPSE = -19.9429
+_LK9 = 12.  # temperature gradient from 110 km, deg K/km
+_T10 = 360.  # temperature at 120 km, deg K
+_T_INF = 1000.  # exospheric temperature, deg K
+_LAMBDA = 0.01875  # exponential temperature constant, 1/km
+
+# for each species: molar mass (kg/mol), number density at 86 km (1/m**3),
+# thermal diffusion factor, and the diffusion coefficient constants a
+# (1/(m s)) and b
+
+_SPECIES = ('N2', 'O', 'O2', 'Ar', 'He', 'H')
+_M = {'N2': 0.0280134, 'O': 0.01599939, 'O2': 0.0319988, 'Ar': 0.039948,
+      'He': 0.0040026, 'H': 0.00100797}
+_N7 = {'N2': 1.129794e20, 'O': 8.6e16, 'O2': 3.030898e19, 'Ar': 1.3514e18,
+       'He': 7.5817e14}
+_ALPHA = {'O': 0., 'O2': 0., 'Ar': 0., 'He': -0.4, 'H': -0.25}
+_DIFFUSION = {'O': (6.986e20, 0.75), 'O2': (4.863e20, 0.75),
+              'Ar': (4.487e20, 0.87), 'He': (1.7e21, 0.691),
+              'H': (3.305e21, 0.5)}
+
+# vertical transport constants (Q, U, W), in km, for 86 to 150 km.  Atomic
+# oxygen has a second term, below 97 km.
+
+_VELOCITY = {'O': (-5.809644e-4, 56.90311, 2.706240e-5),
+             'O2': (1.366212e-4, 86., 8.333333e-5),
+             'Ar': (9.434079e-5, 86., 8.333333e-5),
+             'He': (-2.457369e-4, 86., 6.666667e-4)}
+_O_VELOCITY = (-3.416248e-3, 97., 5.008765e-4)
+
+# hydrogen: number density at 500 km (1/m**3) and escape flux (1/(m**2 s))
+
+_N_H11 = 8.0e10
+_PHI = 7.2e11
+
+
+def _geopotential2geometric(H):
+    """
+    Return the geometric altitude for a geopotential altitude, both in km.
+    """
+
+    return _R0 * H / (_R0 - H)
+
+
+def _geometric2geopotential(Z):
+    """
+    Return the geopotential altitude for a geometric altitude, both in km.
+    """
+
+    return _R0 * Z / (_R0 + Z)
+
+
+_H_TOP = _geometric2geopotential(_Z_TOP)  # top of the model, km geopotential
+_ALT_RANGE_MSG = ('This function is only implemented for altitudes of '
+                  '%.3f km (1000 km geometric) and below.' % _H_TOP)
+
+_upper = None
+
+
+def _upper_temp(Z):
+    """
+    Return the kinetic temperature in deg K, and its gradient in deg K/km,
+    for an array of geometric altitudes in km from 86 km to 1000 km.
+    """
+
+    T = np.full_like(Z, _T7)
+    dT = np.zeros_like(Z)
+
+    ellipse = (Z > 91) & (Z <= 110)
+    x = (Z[ellipse] - 91) / _a_ELLIPSE
+    root = np.sqrt(1 - x ** 2)
+    T[ellipse] = _TC + _A_ELLIPSE * root
+    dT[ellipse] = (-_A_ELLIPSE / _a_ELLIPSE) * x / root
+
+    linear = (Z > 110) & (Z <= 120)
+    T[linear] = 240 + _LK9 * (Z[linear] - 110)
+    dT[linear] = _LK9
+
+    thermo = Z > 120
+    xi = (Z[thermo] - 120) * (_R0 + 120) / (_R0 + Z[thermo])
+    decay = (_T_INF - _T10) * np.exp(-_LAMBDA * xi)
+    T[thermo] = _T_INF - decay
+    dT[thermo] = _LAMBDA * decay * ((_R0 + 120) / (_R0 + Z[thermo])) ** 2
+
+    return (T, dT)
+
+
+def _cumtrapz(y, dx):
+    """
+    Return the cumulative integral of y, sampled at a uniform step dx, by
+    the trapezoidal rule.  The first element is zero.
+    """
+
+    out = np.zeros_like(y)
+    np.cumsum((y[1:] + y[:-1]) * (0.5 * dx), out=out[1:])
+
+    return out
+
+
+def _eddy_diffusion(Z):
+    """
+    Return the eddy diffusion coefficient in m**2/s for an array of
+    geometric altitudes in km.
+    """
+
+    K = np.zeros_like(Z)
+    K[Z <= 95] = 120.
+    mid = (Z > 95) & (Z < 115)
+    K[mid] = 120. * np.exp(1 - 400 / (400 - (Z[mid] - 95) ** 2))
+
+    return K
+
+
+def _velocity_term(species, Z):
+    """
+    Return the vertical transport term in 1/km for a species, for an array
+    of geometric altitudes in km.
+    """
+
+    v = np.zeros_like(Z)
+    low = Z <= 150
+    (Q, U, W) = _VELOCITY[species]
+    v[low] = Q * (Z[low] - U) ** 2 * np.exp(-W * (Z[low] - U) ** 3)
+    if species == 'O':
+        low = Z <= 97
+        (q, u, w) = _O_VELOCITY
+        v[low] += q * (u - Z[low]) ** 2 * np.exp(-w * (u - Z[low]) ** 3)
+
+    return v
+
+
+def _build_upper():
+    """
+    Integrate the number densities on the grid, and return (Z, ln(P),
+    ln(Rho)) with the altitude in km geometric, pressure in pa and density
+    in kg/m**3.
+    """
+
+    n = int(round((_Z_TOP - _Z7) / _UPPER_STEP))
+    Z = _Z7 + _UPPER_STEP * np.arange(n + 1)
+    (T, dT) = _upper_temp(Z)
+
+    # gravity is in m/s**2 and the temperature gradient in deg K/m, while
+    # y = g / (R* T) is per km, so that the integrals are over km
+
+    grav = g * (_R0 / (_R0 + Z)) ** 2
+    dT_m = dT / 1000.
+    y = 1000. * grav / (_R_STAR * T)
+    K = _eddy_diffusion(Z)
+
+    # N2 is mixed up to 100 km, then in diffusive equilibrium.  M is the
+    # mean molar mass for the mixing terms.  It steps at 100 km, so the
+    # trapezoidal rule needs the mean of the two values there.
+
+    i100 = int(round((100 - _Z7) / _UPPER_STEP))
+    M = np.full_like(Z, _M['N2'])
+    M[:i100] = _M0
+    M[i100] = 0.5 * (_M0 + _M['N2'])
+    n = {'N2': _N7['N2'] * (_T7 / T)
+         * np.exp(-_cumtrapz(M * y, _UPPER_STEP))}
+
+    # O and O2 diffuse through N2, and Ar and He through N2, O and O2
+
+    for species in ('O', 'O2', 'Ar', 'He'):
+        if species in ('O', 'O2'):
+            background = n['N2']
+        else:
+            background = n['N2'] + n['O'] + n['O2']
+        (a, b) = _DIFFUSION[species]
+        D = a / background * (T / 273.15) ** b
+        f = y * (D * (_M[species] + _ALPHA[species] * _R_STAR * dT_m / grav)
+                 + K * M) / (D + K)
+        f += _velocity_term(species, Z)
+        n[species] = (_N7[species] * (_T7 / T)
+                      * np.exp(-_cumtrapz(f, _UPPER_STEP)))
+
+    # H is zero below 150 km.  Above, it is fixed at 500 km, with a constant
+    # escape flux below 500 km, and in diffusive equilibrium above.
+
+    n['H'] = np.zeros_like(Z)
+    s = slice(int(round((150 - _Z7) / _UPPER_STEP)), None)
+    i500 = int(round((500 - _Z7) / _UPPER_STEP)) - s.start
+    T_H = T[s]
+    (a, b) = _DIFFUSION['H']
+    background = sum(n[species][s] for species in _SPECIES[:-1])
+    D = a / background * (T_H / 273.15) ** b
+    tau = _cumtrapz(_M['H'] * y[s], _UPPER_STEP)
+    tau -= tau[i500]
+    power = 1 + _ALPHA['H']
+    flux = _cumtrapz(1000. * _PHI / D * (T_H / T_H[i500]) ** power
+                     * np.exp(tau), _UPPER_STEP)
+    flux = np.maximum(flux[i500] - flux, 0.)
+    n['H'][s] = (_N_H11 + flux) * (T_H[i500] / T_H) ** power * np.exp(-tau)
+
+    P = _K_BOLTZMANN * T * sum(n[species] for species in _SPECIES)
+    Rho = sum(n[species] * _M[species] for species in _SPECIES) / _N_AVOGADRO
+
+    # extend the grid down to the top of the layers, and scale to the values
+    # of the layers there
+
+    Z85 = _geopotential2geometric(H85)
+    t = (Z85 - Z[0]) / _UPPER_STEP
+    Z = np.concatenate(([Z85], Z))
+    (lnP, lnRho) = (np.log(P), np.log(Rho))
+    lnP = np.concatenate(([lnP[0] + t * (lnP[1] - lnP[0])], lnP))
+    lnRho = np.concatenate(([lnRho[0] + t * (lnRho[1] - lnRho[0])], lnRho))
+    lnP += np.log(P85) - lnP[0]
+    lnRho += np.log(Rho85) - lnRho[0]
+
+    return (Z, lnP, lnRho)
+
+
+def _upper_table():
+    """
+    Return the upper atmosphere grid, building it on first use.
+    """
+
+    global _upper
+
+    if _upper is None:
+        _upper = _build_upper()
+
+    return _upper
+
+
+def _upper_alt2temp(H):
+    """
+    Return the kinetic temperature in deg K for an array of altitudes in km
+    geopotential, above 84.852 km.
+    """
+
+    return _upper_temp(_geopotential2geometric(H))[0]
+
+
+def _upper_alt2press(H):
+    """
+    Return the pressure in pa for an array of altitudes in km geopotential,
+    above 84.852 km.
+    """
+
+    (Z, lnP, lnRho) = _upper_table()
+    return np.exp(np.interp(_geopotential2geometric(H), Z, lnP))
+
+
+def _upper_alt2density(H):
+    """
+    Return the density in kg/m**3 for an array of altitudes in km
+    geopotential, above 84.852 km.
+    """
+
+    (Z, lnP, lnRho) = _upper_table()
+    return np.exp(np.interp(_geopotential2geometric(H), Z, lnRho))
+
+
+def _upper_inverse(value, table):
+    """
+    Return the altitude in km geopotential for an array of pressures or
+    densities below their values at 84.852 km.  table is the logarithm of
+    the quantity on the grid.  Values below the top of the model return inf.
+    """
+
+    Z = _upper_table()[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Z = np.interp(-np.log(value), -table, Z, right=np.inf)
+        H = _geometric2geopotential(Z)
+    H[Z == np.inf] = np.inf
+
+    return H
+
+
+# #############################################################################
+#
+# Geometric altitude and gravity
+#
+# The model uses geopotential altitude, for which the acceleration of gravity
+# is constant.  The altitude to and from functions accept
+# altitude_type='geometric', to convert from and to geometric altitude with
+# the 1976 earth radius.  The default of 'geopotential' adds no work.
+#
+# The variation of gravity with latitude is given by Lambert's equation, which
+# the 1976 model uses to define g and the earth radius at 45.5425 deg
+# latitude.  The sea level gravity and effective earth radius for each
+# latitude are cached.
+#
+# #############################################################################
+
+_gravity_memo = {}
+
+
+def _alt2km(H, alt_units, altitude_type):
+    """
+    Return the geopotential altitude in km, given an altitude of type
+    altitude_type ('geopotential' or 'geometric').
+    """
+
+    H = U.length_conv(_to_array(H), from_units=alt_units, to_units='km')
+    if altitude_type == 'geopotential':
+        return H
+    if altitude_type == 'geometric':
+        return _geometric2geopotential(H)
+    raise ValueError('altitude_type must be "geopotential" or "geometric".')
+
+
+def _km2alt(H, alt_units, altitude_type):
+    """
+    Return the geopotential altitude in km converted to an altitude of type
+    altitude_type, in alt_units.
+    """
+
+    if altitude_type == 'geometric':
+        H = _geopotential2geometric(H)
+    elif altitude_type != 'geopotential':
+        raise ValueError(
+            'altitude_type must be "geopotential" or "geometric".')
+    return U.length_conv(H, from_units='km', to_units=alt_units)
+
+
+def _latitude2gravity(latitude):
+    """
+    Return the acceleration of gravity at sea level in m/s**2, and the
+    effective earth radius in km, at a latitude in degrees.  With no latitude,
+    return the values used by the 1976 model.
+    """
+
+    if latitude is None:
+        return (g, _R0)
+    if np.ndim(latitude) == 0:
+        latitude = float(latitude)
+        if latitude not in _gravity_memo:
+            _gravity_memo[latitude] = _lambert_gravity(latitude)
+        return _gravity_memo[latitude]
+    return _lambert_gravity(_to_array(latitude))
+
+
+def _lambert_gravity(latitude):
+    """
+    Return the acceleration of gravity at sea level in m/s**2, and the
+    effective earth radius in km, from Lambert's equation
+    (NASA-TM-X-74335, section 1.2.2).
+    """
+
+    cos2 = np.cos(np.radians(2 * latitude))
+    cos4 = np.cos(np.radians(4 * latitude))
+    g_phi = 9.80616 * (1 - 0.0026373 * cos2 + 0.0000059 * cos2 ** 2)
+    r_phi = 2e-3 * g_phi / (3.085462e-6 + 2.27e-9 * cos2 - 2e-12 * cos4)
+
+    return (g_phi, r_phi)
+
+
+def geometric2geopotential(Z, alt_units=default_alt_units, latitude=None):
+    """
+    Return the geopotential altitude for a geometric altitude, both in
+    alt_units.
+
+    The latitude, in degrees, selects the gravity and earth radius from
+    Lambert's equation.  If it is not specified, the 1976 model values
+    (45.5425 deg latitude) are used.
+
+    The altitude and latitude may be scalars or arrays.
+
+    Examples:
+
+    The geopotential altitude in km at 1000 km geometric:
+    >>> geometric2geopotential(1000, alt_units='km')
+    864.0707071558345
+    """
+
+    Z = U.length_conv(_to_array(Z), from_units=alt_units, to_units='km')
+    (g_phi, r_phi) = _latitude2gravity(latitude)
+    H = (g_phi / g) * r_phi * Z / (r_phi + Z)
+
+    return _from_array(U.length_conv(H, from_units='km', to_units=alt_units))
+
+
+def geopotential2geometric(H, alt_units=default_alt_units, latitude=None):
+    """
+    Return the geometric altitude for a geopotential altitude, both in
+    alt_units.
+
+    The latitude, in degrees, selects the gravity and earth radius from
+    Lambert's equation.  If it is not specified, the 1976 model values
+    (45.5425 deg latitude) are used.
+
+    The altitude and latitude may be scalars or arrays.
+
+    Examples:
+
+    The geometric altitude in ft at 36,089 ft geopotential, at the equator:
+    >>> geopotential2geometric(36089, latitude=0)
+    36249.13466229158
+    """
+
+    H = U.length_conv(_to_array(H), from_units=alt_units, to_units='km')
+    (g_phi, r_phi) = _latitude2gravity(latitude)
+    H = H * (g / g_phi)
+    Z = r_phi * H / (r_phi - H)
+
+    return _from_array(U.length_conv(Z, from_units='km', to_units=alt_units))
+
+
+def gravity(Z, alt_units=default_alt_units, latitude=None):
+    """
+    Return the acceleration of gravity in m/s**2 at a geometric altitude.
+
+    The latitude, in degrees, selects the gravity and earth radius from
+    Lambert's equation.  If it is not specified, the 1976 model values
+    (45.5425 deg latitude) are used.
+
+    The altitude and latitude may be scalars or arrays.
+
+    Examples:
+
+    Gravity at 100 km geometric, at the pole:
+    >>> gravity(100, alt_units='km', latitude=90)
+    9.530863274653065
+    """
+
+    Z = U.length_conv(_to_array(Z), from_units=alt_units, to_units='km')
+    (g_phi, r_phi) = _latitude2gravity(latitude)
+
+    return _from_array(g_phi * (r_phi / (r_phi + Z)) ** 2)
+
+
+# #############################################################################
+#
+# Table mode
+#
+# In table mode, the temperature and pressure ratio are interpolated from
+# tables on a uniform altitude grid, instead of being evaluated from the
+# layer equations.  The grid includes each layer base, so linear
+# interpolation of the temperature is exact.  The pressure ratio is
+# interpolated with a cubic Hermite polynomial in each interval, using the
+# analytic derivative:
+#
+#     d(PR)/dH = -PR * (1000 * g) / (Rd * T)
+#
+# The interpolation error is of order (step / scale height)**4 / 384.  The
+# maximum relative error in pressure ratio (and so in pressure, density and
+# density ratio) versus the exact equations is 1.3e-11, at 0.05 km steps.
+#
+# The tables are only built when table mode is first selected.
+#
+# #############################################################################
+
+_TABLE_H0 = -5.  # lowest altitude in the table, km
+_TABLE_H1 = 85.  # highest altitude in the table, km
+_TABLE_STEP = 0.05  # altitude step, km
+
+_mode = 'exact'
+_table = None
+
+
+def _build_table():
+    """
+    Return the interpolation coefficients for each interval of the grid:
+    (T0, T1, PR0, PR1, PR2, PR3), such that within the interval
+
+        T = T0 + T1 * t
+        PR = PR0 + PR1 * t + PR2 * t**2 + PR3 * t**3
+
+    where t is the fraction of the altitude step from the interval base.
+    """
+
+    n = int(round((_TABLE_H1 - _TABLE_H0) / _TABLE_STEP))
+    H = _TABLE_H0 + _TABLE_STEP * np.arange(n + 1)
+    T = _layer_alt2temp(H)
+    PR = _layer_alt2press_ratio(H)
+
+    # derivative of pressure ratio with respect to t
+
+    slope = (-_TABLE_STEP * PR) * ((1000 * g) / (Rd * T))
+
+    (p0, p1) = (PR[:-1], PR[1:])
+    (m0, m1) = (slope[:-1], slope[1:])
+
+    return (T[:-1], np.diff(T), p0, m0, 3 * (p1 - p0) - 2 * m0 - m1,
+            2 * (p0 - p1) + m0 + m1)
+
+
+def _in_table(H):
+    """
+    Return True if all the altitudes in km are within the table.  The table
+    extends a little above 84.852 km, but is not used above it.
+    """
+
+    return bool(np.all((H >= _TABLE_H0) & (H <= H85)))
+
+
+def _table_index(H):
+    """
+    Return the interval index, and the fraction of the step from the
+    interval base, for an array of altitudes in km.
+    """
+
+    x = (H - _TABLE_H0) * (1. / _TABLE_STEP)
+    i = np.minimum(x.astype(np.intp), len(_table[0]) - 1)
+
+    return (i, x - i)
+
+
+def _table_alt2temp(H):
+    """
+    Return the standard temperature in deg K for an array of altitudes in km,
+    by interpolation in the table.
+    """
+
+    (i, t) = _table_index(H)
+    (T0, T1) = _table[:2]
+
+    return T0[i] + T1[i] * t
+
+
+def _table_alt2press_ratio(H):
+    """
+    Return the pressure ratio for an array of altitudes in km, by
+    interpolation in the table.
+    """
+
+    (i, t) = _table_index(H)
+    (PR0, PR1, PR2, PR3) = _table[2:]
+
+    return ((PR3[i] * t + PR2[i]) * t + PR1[i]) * t + PR0[i]
+
+
+def set_mode(mode):
+    """
+    Select how the altitude to temperature, pressure and density functions
+    are evaluated.
+
+    'exact' (the default) evaluates the equations for each layer of the
+    atmosphere.
+
+    'table' interpolates from tables, which covers altitudes from -5 km to
+    84.852 km.  It is two to three times faster for large arrays, with a
+    relative error in pressure and density of less than 2e-11.  Altitudes
+    outside the tables are evaluated exactly, or from the upper atmosphere
+    model above 84.852 km.  The functions that return altitude (e.g.
+    press2alt) are always exact.
+
+    Changing the mode clears the memo of results (see the memo module).
+
+    Examples:
+
+    >>> set_mode('table')
+    >>> get_mode()
+    'table'
+    >>> set_mode('exact')
+    """
+
+    global _mode, _table
+
+    if mode == 'table':
+        if _table is None:
+            _table = _build_table()
+    elif mode != 'exact':
+        raise ValueError('mode must be one of "exact" or "table".')
+
+    if mode != _mode:
+        memo.clear()
+    _mode = mode
+
+
+def get_mode():
+    """
+    Return the current mode, 'exact' or 'table'.  See set_mode().
+    """
+
+    return _mode
+
+
 # #############################################################################
 #
 # Altitude to temperature
@@ -212,13 +1041,56 @@ Rho71 = (Rho0 * PR71) * (T0 / T71)
 # #############################################################################
 
 
+def _layer_alt2temp(H):
+    """
+    Return the standard temperature in deg K for an array of altitudes in km,
+    from the layers up to 84.852 km.
+    """
+
+    layer = _alt2layer(H)
+    return (_LAYERS['T'][layer]
+            + (H - _LAYERS['H'][layer]) * _LAYERS['L'][layer])
+
+
+def _exact_alt2temp(H):
+    """
+    Return the standard temperature in deg K for an array of altitudes in km.
+    """
+
+    upper = H > H85
+    if not np.any(upper):
+        return _layer_alt2temp(H)
+
+    lower = ~upper
+    T = np.empty_like(H)
+    T[lower] = _layer_alt2temp(H[lower])
+    T[upper] = _upper_alt2temp(H[upper])
+
+    return T
+
+
+def _alt2temp(H):
+    """
+    Return the standard temperature in deg K for an array of altitudes in km,
+    using the table in table mode.
+    """
+
+    if _mode == 'table' and _in_table(H):
+        return _table_alt2temp(H)
+    return _exact_alt2temp(H)
+
+
+@memo.memoize
 def alt2temp(H, alt_units=default_alt_units,
-             temp_units=default_temp_units):
+             temp_units=default_temp_units, altitude_type='geopotential'):
     """Return the standard temperature for the specified altitude.  Altitude
     units may be feet ('ft'), metres ('m'), statute miles, ('sm') or
     nautical miles ('nm').  Temperature units may be degrees C, F, K or R
     ('C', 'F', 'K' or 'R')
 
+    The altitude may be a scalar or an array.  If it is an array, the result
+    is an array of the same shape.
+
     If the units are not specified, the units in default_units.py are used.
 
     Examples:
@@ -251,30 +1123,17 @@ def alt2temp(H, alt_units=default_alt_units,
 
     # function tested in tests/test_std_atm.py
 
-    H = U.length_conv(H, from_units=alt_units, to_units='km')
-
-    if H <= 11:
-        temp = T0 + H * L0
-    elif H <= 20:
-        temp = T11
-    elif H <= 32:
-        temp = T20 + (H - 20) * L20
-    elif H <= 47:
-        temp = T32 + (H - 32) * L32
-    elif H <= 51:
-        temp = T47
-    elif H <= 71:
-        temp = T51 + (H - 51) * L51
-    elif H <= 84.852:
-        temp = T71 + (H - 71) * L71
-    else:
-        raise ValueError(
-            'This function is only implemented for altitudes of 84.852 km and below.')
+    H = _alt2km(H, alt_units, altitude_type)
+    _check_alt_range(H)
 
-    return U.temp_conv(temp, to_units=temp_units, from_units='K')
+    temp = _alt2temp(H)
 
+    return _from_array(U.temp_conv(temp, to_units=temp_units, from_units='K'))
 
-def alt2temp_ratio(H, alt_units=default_alt_units):
+
+@memo.memoize
+def alt2temp_ratio(H, alt_units=default_alt_units,
+                   altitude_type='geopotential'):
     """
     Return the temperature ratio (temperature / standard temperature for
     sea level).  The altitude is specified in feet ('ft'), metres ('m'),
@@ -295,7 +1154,8 @@ def alt2temp_ratio(H, alt_units=default_alt_units):
 
     # function tested in tests/test_std_atm.py
 
-    return alt2temp(H, alt_units, temp_units='K') / T0
+    return alt2temp(H, alt_units, temp_units='K',
+                    altitude_type=altitude_type) / T0
 
 
 # #############################################################################
@@ -337,9 +1197,9 @@ def isa2temp(
 
     # function tested in tests/test_std_atm.py
 
-    temp = ISA_dev + alt2temp(altitude, alt_units, temp_units)
+    temp = np.add(ISA_dev, alt2temp(altitude, alt_units, temp_units))
 
-    return temp
+    return _from_array(temp)
 
 
 # #############################################################################
@@ -382,9 +1242,9 @@ def temp2isa(
     # function tested in tests/test_std_atm.py
 
     std_temp = alt2temp(altitude, alt_units, temp_units)
-    ISA_dev = temp - std_temp
+    ISA_dev = np.subtract(temp, std_temp)
 
-    return ISA_dev
+    return _from_array(ISA_dev)
 
 
 # #############################################################################
@@ -397,9 +1257,10 @@ def temp2temp_ratio(temp, temp_units=default_temp_units):
     """
     Return the temperature ratio
     """
-    theta = U.temp_conv(temp, from_units=temp_units, to_units='K') / T0
+    theta = U.temp_conv(_to_array(temp), from_units=temp_units,
+                        to_units='K') / T0
 
-    return theta
+    return _from_array(theta)
 
 
 # #############################################################################
@@ -409,38 +1270,64 @@ def temp2temp_ratio(temp, temp_units=default_temp_units):
 # #############################################################################
 
 
-def _alt2press_ratio_gradient(
-    H,
-    Hb,
-    Pb,
-    Tb,
-    L,
-):
+def _alt2press_ratio(H):
+    """
+    Return the pressure ratio for an array of altitudes in km, using the
+    table in table mode.
+    """
 
-    # eqn from USAF TPS PEC binder, page PS1-31
+    if _mode == 'table' and _in_table(H):
+        return _table_alt2press_ratio(H)
+    return _exact_alt2press_ratio(H)
 
-    return (Pb / P0) * (1 + (L / Tb) * (H - Hb)) ** ((-1000 * g) / (Rd
-                                                                    * L))
 
+def _exact_alt2press_ratio(H):
+    """
+    Return the pressure ratio for an array of altitudes in km.
+    """
 
-def _alt2press_ratio_isothermal(
-    H,
-    Hb,
-    Pb,
-    Tb,
-):
+    upper = H > H85
+    if not np.any(upper):
+        return _layer_alt2press_ratio(H)
+
+    lower = ~upper
+    PR = np.empty_like(H)
+    PR[lower] = _layer_alt2press_ratio(H[lower])
+    PR[upper] = _upper_alt2press(H[upper]) / P0
+
+    return PR
+
+
+def _layer_alt2press_ratio(H):
+    """
+    Return the pressure ratio for an array of altitudes in km, from the
+    layers up to 84.852 km.  Each element is evaluated with the equation for
+    its own layer.
+    """
 
-    # eqn from USAF TPS PEC binder, page PS1-26
+    layer = _alt2layer(H)
+    dH = H - _LAYERS['H'][layer]
 
-    return (Pb / P0) * np.exp((-1 * (H - Hb)) * ((1000 * g) / (Rd * Tb)))
+    # eqns from USAF TPS PEC binder, pages PS1-26 (isothermal) and PS1-31.
+    # np.power, rather than **, so that a scalar altitude is evaluated by the
+    # same loop as an array (** on numpy scalars may differ by 1 ulp).
 
+    return _LAYERS['PR'][layer] * np.where(
+        _LAYERS['isothermal'][layer], np.exp((-1 * dH) * _LAYERS['k'][layer]),
+        np.power(1 + _LAYERS['L_T'][layer] * dH, _LAYERS['PR_exp'][layer]))
 
-def alt2press_ratio(H, alt_units=default_alt_units):
+
+@memo.memoize
+def alt2press_ratio(H, alt_units=default_alt_units,
+                    altitude_type='geopotential'):
     """
     Return the pressure ratio (atmospheric pressure / standard pressure
     for sea level).  The altitude is specified in feet ('ft'), metres ('m'),
     statute miles, ('sm') or nautical miles ('nm').
 
+    The altitude may be a scalar or an array.  If it is an array, the result
+    is an array of the same shape.
+
     If the units are not specified, the units in default_units.py are used.
 
     Examples:
@@ -453,42 +1340,29 @@ def alt2press_ratio(H, alt_units=default_alt_units):
     >>> alt2press_ratio(1000, alt_units = 'm')
     0.88699304638887044
 
-    The functions are only implemented at altitudes of 84.852 km and lower.
-    >>> alt2press_ratio(90, alt_units = 'km')
+    The functions are only implemented at altitudes of 864.071 km (1000 km
+    geometric) and lower.
+    >>> alt2press_ratio(900, alt_units = 'km')
     Traceback (most recent call last):
       File \"<stdin>\", line 1, in <module>
       File \"std_atm.py\", line 461, in alt2press_ratio
-        'This function is only implemented for altitudes of 84.852 km and below.'
-    ValueError: This function is only implemented for altitudes of 84.852 km and below.
+        raise ValueError(_ALT_RANGE_MSG)
+    ValueError: This function is only implemented for altitudes of 864.071 km (1000 km geometric) and below.
         """
 
     # uses meters and degrees K for the internal calculations
 
     # function tested in tests/test_std_atm.py
 
-    H = U.length_conv(H, from_units=alt_units, to_units='km')
-
-    if H <= 11:
-        return _alt2press_ratio_gradient(H, 0, P0, T0, L0)
-    if H <= 20:
-        return _alt2press_ratio_isothermal(H, 11, P11, T11)
-    if H <= 32:
-        return _alt2press_ratio_gradient(H, 20, P20, T20, L20)
-    if H <= 47:
-        return _alt2press_ratio_gradient(H, 32, P32, T32, L32)
-    if H <= 51:
-        return _alt2press_ratio_isothermal(H, 47, P47, T47)
-    if H <= 71:
-        return _alt2press_ratio_gradient(H, 51, P51, T51, L51)
-    if H <= 84.852:
-        return _alt2press_ratio_gradient(H, 71, P71, T71, L71)
-    else:
-        raise ValueError(
-            'This function is only implemented for altitudes of 84.852 km and below.')
+    H = _alt2km(H, alt_units, altitude_type)
+    _check_alt_range(H)
+
+    return _from_array(_alt2press_ratio(H))
 
 
+@memo.memoize
 def alt2press(H, alt_units=default_alt_units,
-              press_units=default_press_units):
+              press_units=default_press_units, altitude_type='geopotential'):
     """
     Return the atmospheric pressure for a given altitude, with the
     altitude in feet ('ft'), metres ('m'), statute miles, ('sm') or nautical
@@ -518,12 +1392,13 @@ def alt2press(H, alt_units=default_alt_units,
 
     # function tested in tests/test_std_atm.py
 
-    H = U.length_conv(H, from_units=alt_units, to_units='m')
+    H = _alt2km(H, alt_units, altitude_type)
+    _check_alt_range(H)
 
-    press = P0 * alt2press_ratio(H, alt_units='m')
+    press = P0 * _alt2press_ratio(H)
     press = U.press_conv(press, from_units='pa', to_units=press_units)
 
-    return press
+    return _from_array(press)
 
 
 # #############################################################################
@@ -543,6 +1418,9 @@ def pressure_alt(H, alt_setting, alt_units=default_alt_units):
     in HG, otherwise they are assumed to be hpa.  The altimeter setting must
     be in the range of 25 to 35 inches of mercury.
 
+    The altitude and altimeter setting may be scalars or arrays, and each
+    element of the altimeter setting has its units selected separately.
+
     The altitude may have units of feet ('ft'), metres ('m'), statute miles,
     ('sm') or nautical miles ('nm').
 
@@ -566,16 +1444,16 @@ def pressure_alt(H, alt_setting, alt_units=default_alt_units):
     348.59361654048143
     """
 
-    H = U.length_conv(H, from_units=alt_units, to_units='ft')
-    if alt_setting > 35:
-        alt_setting = U.press_conv(alt_setting, from_units='hpa',
-                                   to_units='in HG')
-    if alt_setting < 25 or alt_setting > 35:
+    H = U.length_conv(_to_array(H), from_units=alt_units, to_units='ft')
+    alt_setting = _to_array(alt_setting)
+    hpa = alt_setting > 35
+    alt_setting[hpa] = _hpa2in_hg(alt_setting[hpa])
+    if np.any((alt_setting < 25) | (alt_setting > 35)):
         raise ValueError('Altimeter setting out of range.')
-    base_press = U.press_conv(P0, from_units='pa', to_units='in HG')
+    base_press = _pa2in_hg(P0)
     HP = H + 145442.2 * (1 - (alt_setting / base_press) ** 0.190261)
     HP = U.length_conv(HP, from_units='ft', to_units=alt_units)
-    return HP
+    return _from_array(HP)
 
 
 def QNH(
@@ -605,7 +1483,31 @@ def QNH(
 # #############################################################################
 
 
-def alt2density_ratio(H, alt_units=default_alt_units):
+def _alt2density_ratio(H):
+    """
+    Return the density ratio for an array of altitudes in km.
+
+    Above 84.852 km, the molar mass of the air decreases with altitude, so
+    the density is taken from the upper atmosphere model, rather than from
+    the pressure and temperature ratios.
+    """
+
+    upper = H > H85
+    if not np.any(upper):
+        return _alt2press_ratio(H) / (_alt2temp(H) / T0)
+
+    lower = ~upper
+    H_lower = H[lower]
+    DR = np.empty_like(H)
+    DR[lower] = _alt2press_ratio(H_lower) / (_alt2temp(H_lower) / T0)
+    DR[upper] = _upper_alt2density(H[upper]) / Rho0
+
+    return DR
+
+
+@memo.memoize
+def alt2density_ratio(H, alt_units=default_alt_units,
+                      altitude_type='geopotential'):
     """
     Return the density ratio (atmospheric density / standard density
     for sea level).  The altitude is specified in feet ('ft'), metres ('m'),
@@ -626,11 +1528,16 @@ def alt2density_ratio(H, alt_units=default_alt_units):
 
     # function tested in tests/test_std_atm.py
 
-    return alt2press_ratio(H, alt_units) / alt2temp_ratio(H, alt_units)
+    H = _alt2km(H, alt_units, altitude_type)
+    _check_alt_range(H)
+
+    return _from_array(_alt2density_ratio(H))
 
 
+@memo.memoize
 def alt2density(H, alt_units=default_alt_units,
-                density_units=default_density_units):
+                density_units=default_density_units,
+                altitude_type='geopotential'):
     """
     Return the density given the pressure altitude.  The altitude is
     specified in feet ('ft'), metres ('m'), statute miles, ('sm') or
@@ -664,13 +1571,15 @@ def alt2density(H, alt_units=default_alt_units,
 
     # get density in kg/m**3
 
-    density = Rho0 * alt2density_ratio(H, alt_units)
-    return U.density_conv(density, from_units='kg/m**3',
-                          to_units=density_units)
+    density = Rho0 * alt2density_ratio(H, alt_units, altitude_type)
+    return _from_array(U.density_conv(density, from_units='kg/m**3',
+                                      to_units=density_units))
 
 
+@memo.memoize
 def alt_temp2density_ratio(
-        H, temp, alt_units=default_alt_units, temp_units=default_temp_units):
+        H, temp, alt_units=default_alt_units, temp_units=default_temp_units,
+        altitude_type='geopotential'):
     """
     Return the density ratio (atmospheric density / standard density
     for sea level).  The altitude is specified in feet ('ft'), metres ('m'),
@@ -678,16 +1587,22 @@ def alt_temp2density_ratio(
 
     The temperature may be in deg C, F, K or R.
 
+    The temperature may also be an Atmosphere, giving its temperature at the
+    pressure altitude.
+
     If the units are not specified, the units in default_units.py are used.
 
     """
-    if temp == 'std':
-        temp = alt2temp(H, temp_units=temp_units)
-    press_ratio = alt2press_ratio(H, alt_units=alt_units)
+    H = _alt2km(H, alt_units, altitude_type)
+    if isinstance(temp, str) and temp == 'std':
+        temp = alt2temp(H, alt_units='km', temp_units=temp_units)
+    elif isinstance(temp, Atmosphere):
+        temp = temp.press_alt2temp(H, alt_units='km', temp_units=temp_units)
+    press_ratio = alt2press_ratio(H, alt_units='km')
     temp_ratio = temp2temp_ratio(temp, temp_units=temp_units)
     density_ratio = press_ratio / temp_ratio
 
-    return density_ratio
+    return _from_array(density_ratio)
 
 # #############################################################################
 #
@@ -696,30 +1611,39 @@ def alt_temp2density_ratio(
 # #############################################################################
 
 
-def _density2alt_gradient(
-    Rho,
-    Rhob,
-    Hb,
-    Tb,
-    L,
-):
+def _density2alt(Rho):
+    """
+    Return the altitude in km for an array of densities in kg/m**3.
+    """
+
+    upper = Rho < Rho85
+    if not np.any(upper):
+        return _layer_density2alt(Rho)
+
+    lower = ~upper
+    H = np.empty_like(Rho)
+    H[lower] = _layer_density2alt(Rho[lower])
+    H[upper] = _upper_inverse(Rho[upper], _upper_table()[2])
 
-    return Hb + (Tb / L) * ((Rho / Rhob) ** (-1 / ((1000 * g) / (Rd * L)
-                                                   + 1)) - 1)
+    return H
 
 
-def _density2alt_isothermal(
-    Rho,
-    Rhob,
-    Hb,
-    Tb,
-):
+def _layer_density2alt(Rho):
+    """
+    Return the altitude in km for an array of densities in kg/m**3, from the
+    layers up to 84.852 km.  Each element is evaluated with the equation for
+    its own layer.
+    """
 
-    return Hb - ((Rd * Tb) * np.log(Rho / Rhob)) / (1000 * g)
+    layer = _base2layer(Rho, _LAYER_RHO_REV)
 
+    return _layer_inverse(Rho / _LAYERS['Rho'][layer], layer,
+                          _LAYERS['H_Rho_exp'][layer])
 
+
+@memo.memoize
 def density2alt(Rho, density_units=default_density_units,
-                alt_units=default_alt_units):
+                alt_units=default_alt_units, altitude_type='geopotential'):
     """
     Return the altitude corresponding to the specified density, with
     density in 'lb/ft**3', 'slug/ft**3' or 'kg/m**3'.
@@ -727,6 +1651,10 @@ def density2alt(Rho, density_units=default_density_units,
     The altitude is specified in feet ('ft'), metres ('m'), statute miles,
     ('sm') or nautical miles ('nm').
 
+    The density may be a scalar or an array.  If it is an array, the result
+    is an array of the same shape, and any element that is outside the range
+    of the model returns NaN instead of raising a ValueError.
+
     If the units are not specified, the units in default_units.py are used.
 
     Examples:
@@ -744,32 +1672,17 @@ def density2alt(Rho, density_units=default_density_units,
 
     # function tested in tests/test_std_atm.py
 
-    Rho = U.density_conv(Rho, from_units=density_units,
+    Rho = U.density_conv(_to_array(Rho), from_units=density_units,
                          to_units='kg/m**3')
 
-    if Rho > Rho11:
-        H = _density2alt_gradient(Rho, Rho0, 0, T0, L0)
-    elif Rho > Rho20:
-        H = _density2alt_isothermal(Rho, Rho11, 11, T11)
-    elif Rho > Rho32:
-        H = _density2alt_gradient(Rho, Rho20, 20, T20, L20)
-    elif Rho > Rho47:
-        H = _density2alt_gradient(Rho, Rho32, 32, T32, L32)
-    elif Rho > Rho51:
-        H = _density2alt_isothermal(Rho, Rho47, 47, T47)
-    elif Rho > Rho71:
-        H = _density2alt_gradient(Rho, Rho51, 51, T51, L51)
-    else:
-        H = _density2alt_gradient(Rho, Rho71, 71, T71, L71)
-
-    if H > 84.852:
-        raise ValueError(
-            'This function is only implemented for altitudes of 84.852 km and below.')
+    H = _inverse_range2nan(_density2alt(Rho), Rho)
 
-    return U.length_conv(H, from_units='km', to_units=alt_units)
+    return _from_array(_km2alt(H, alt_units, altitude_type))
 
 
-def density_ratio2alt(DR, alt_units=default_alt_units):
+@memo.memoize
+def density_ratio2alt(DR, alt_units=default_alt_units,
+                      altitude_type='geopotential'):
     """
     Return the altitude for the specified density ratio. The altitude is in
     feet ('ft'), metres ('m'), statute miles, ('sm') or nautical miles
@@ -795,8 +1708,9 @@ def density_ratio2alt(DR, alt_units=default_alt_units):
 
     # function tested in tests/test_std_atm.py
 
-    D = DR * Rho0
-    return density2alt(D, alt_units=alt_units, density_units='kg/m**3')
+    D = _to_array(DR) * Rho0
+    return density2alt(D, alt_units=alt_units, density_units='kg/m**3',
+                       altitude_type=altitude_type)
 
 
 # #############################################################################
@@ -806,11 +1720,12 @@ def density_ratio2alt(DR, alt_units=default_alt_units):
 # #############################################################################
 
 
+@memo.memoize
 def density_alt(
     H,
     T,
     alt_setting=P0 / 100.,
-    DP='FALSE',
+    DP=np.nan,
     RH=0.0,
     alt_units=default_alt_units,
     temp_units=default_temp_units,
@@ -840,6 +1755,13 @@ def density_alt(
     assumed to be completely dry.  If both the dew point and relative humidity
     are specified, the relative humidity value is ignored.
 
+    All the parametres other than the units may be scalars or arrays, which
+    are broadcast against each other, so that each sample may have its own
+    altitude, temperature, altimeter setting and humidity.  In an array of dew
+    points, NaN marks a sample with no dew point, for which the relative
+    humidity is used.  In an array of relative humidities, NaN (or 0) marks a
+    sample of dry air.
+
     If the units are not specified, the units in default_units.py are used.
 
     The method is from: http://wahiduddin.net/calc/density_altitude.htm
@@ -889,14 +1811,12 @@ def density_alt(
     ValueError: The relative humidity must be in the range of 0 to 1.
         """
 
-    Rv = 461.495  # gas constant for water vapour
-
     # saturated vapour pressure
 
-    if DP == 'FALSE' and RH == 0:
-        Pv = 0
-    else:
-        Pv = sat_press(T, DP, RH, temp_units, press_units='pa')
+    (DP, RH) = _humidity(DP, RH, temp_units)
+    T = _to_array(T)
+    Pv = _vapour_press(U.temp_conv(T, from_units=temp_units, to_units='C'),
+                       DP, RH)
 
     # dry air pressure
 
@@ -911,34 +1831,162 @@ def density_alt(
     return density_ratio2alt(DR, alt_units)
 
 
+# saturation pressure polynomial, from:
+# http://wahiduddin.net/calc/density_altitude.htm
+
+_ESO = 6.1078  # saturation pressure at 0 deg C, mb
+_SAT_PRESS_C = (
+    0.99999683,
+    -0.90826951e-2,
+    0.78736169e-4,
+    -0.61117958e-6,
+    0.43884187e-8,
+    -0.29883885e-10,
+    0.21874425e-12,
+    -0.17892321e-14,
+    0.11112018e-16,
+    -0.30994571e-19,
+)
+
+
+_SAT_PRESS_POLY = np.array(_SAT_PRESS_C[::-1])  # for np.polyval
+_SAT_PRESS_SLOPE_POLY = np.polyder(_SAT_PRESS_POLY)
+
+# the memo holds the saturation pressure at each 0.1 deg C step from -100 to
+# 100 deg C.  Weather reports give temperatures and dew points in whole or
+# tenths of a degree, so when the memo is enabled most scalar values are
+# looked up.
+
+_sat_memo = None  # None when the memo is disabled
+
+
+def _build_sat_memo():
+    """
+    Return a dictionary of the saturation pressure in mb, keyed by
+    temperature in deg C, at 0.1 deg C steps.
+    """
+
+    return dict((T, _sat_press_scalar(T))
+                for T in [k / 10. for k in range(-1000, 1001)])
+
+
+def set_sat_press_memo(enabled=True):
+    """
+    Enable or disable the memo of saturation pressures.
+
+    When the memo is enabled, the saturation pressure of water vapour for a
+    scalar temperature or dew point that is a multiple of 0.1 deg C, between
+    -100 and 100 deg C, is looked up in a memo, instead of being evaluated.
+    The memo is filled by the same scalar evaluation, so the results are
+    the same either way.  The memo is disabled by default, and is
+    independent of set_mode().
+
+    Examples:
+
+    >>> set_sat_press_memo()
+    >>> Pv = sat_press(DP=12.3)  # looked up
+    >>> set_sat_press_memo(False)
+    """
+
+    global _sat_memo
+
+    if not enabled:
+        _sat_memo = None
+    elif _sat_memo is None:
+        _sat_memo = _build_sat_memo()
+
+
 def _sat_press(T):
     """
     Return the saturation pressure in mb of the water vapour, given
-    temperature in deg C.  Equation from:
-    http://wahiduddin.net/calc/density_altitude.htm
+    temperature in deg C.
+
+    Arrays are evaluated with np.polyval.  A scalar is evaluated directly,
+    which is faster for one value, and it is first looked up in the memo,
+    if the memo is enabled (see set_sat_press_memo).
+    """
+
+    if not isinstance(T, float):
+        if np.ndim(T):
+            return _ESO / np.polyval(_SAT_PRESS_POLY, T) ** 8
+        T = float(T)
+
+    if _sat_memo is not None:
+        sat_press = _sat_memo.get(T)
+        if sat_press is not None:
+            return sat_press
+
+    return _sat_press_scalar(T)
+
+
+def _sat_press_scalar(T):
+    """
+    Return the saturation pressure in mb of the water vapour, given a float
+    temperature in deg C, by Horner's rule.  This may differ from
+    np.polyval by 1 ulp.
+    """
+
+    p = _SAT_PRESS_C[-1]
+    for c in _SAT_PRESS_C[-2::-1]:
+        p = c + T * p
+    return _ESO / p ** 8
+
+
+def _sat_press_slope(T):
     """
+    Return the rate of change of the saturation pressure of the water vapour
+    with temperature, in mb per deg C, given temperature in deg C.
+    """
+
+    p = np.polyval(_SAT_PRESS_POLY, T)
+    dp = np.polyval(_SAT_PRESS_SLOPE_POLY, T)
+
+    return (-8 * _ESO) * dp / p ** 9
+
+
+def _humidity(DP, RH, temp_units):
+    """
+    Return the dew point in deg C and the relative humidity as arrays, with
+    NaN for a value that is not specified.  The string 'FALSE', used by
+    earlier versions to mark a missing value, is also accepted.
+    """
+
+    if isinstance(DP, str):
+        DP = np.nan
+    if isinstance(RH, str):
+        RH = np.nan
+    DP = U.temp_conv(_to_array(DP), from_units=temp_units, to_units='C')
+
+    return (DP, _to_array(RH))
+
+
+def _vapour_press(T, DP, RH):
+    """
+    Return the water vapour pressure in pa, given arrays of temperature and
+    dew point in deg C, and relative humidity.
+
+    The dew point is used where it is not NaN, and the relative humidity
+    otherwise.  Where both are NaN, the air is dry.
+    """
+
+    dew = ~np.isnan(DP)
+    if np.any(dew & (DP > T)):
+        raise ValueError(
+            'The dew point cannot be greater than the temperature.')
+    if np.any(~dew & ((RH < 0) | (RH > 1))):
+        raise ValueError(
+            'The relative humidity must be in the range of 0 to 1.')
 
-    eso = 6.1078
-    c0 = 0.99999683
-    c1 = -0.90826951e-2
-    c2 = 0.78736169e-4
-    c3 = -0.61117958e-6
-    c4 = 0.43884187e-8
-    c5 = -0.29883885e-10
-    c6 = 0.21874425e-12
-    c7 = -0.17892321e-14
-    c8 = 0.11112018e-16
-    c9 = -0.30994571e-19
+    with np.errstate(invalid='ignore'):
+        Pv = np.where(dew, _sat_press(DP),
+                      np.where(np.isnan(RH), 0., RH * _sat_press(T)))
 
-    p = c0 + T * (c1 + T * (c2 + T * (c3 + T * (c4 + T * (c5 + T * (c6
-                                                                    + T * (c7 + T * (c8 + T * c9))))))))
-    sat_press = eso / p ** 8
-    return sat_press
+    return Pv * 100.
 
 
 def sat_press(
-    T='FALSE',
-    DP='FALSE',
+    T=np.nan,
+    DP=np.nan,
     RH=0.0,
     temp_units=default_temp_units,
     press_units=default_press_units,
@@ -949,6 +1997,10 @@ def sat_press(
     dew point and relative humidity are specified, the relative humidity value
     is ignored.
 
+    The temperature, dew point and relative humidity may be scalars or
+    arrays.  In an array of dew points, NaN marks a sample with no dew
+    point, for which the relative humidity is used.
+
     If the temperature and dew point are both specified, the dew point cannot
     be greater than the temperature:
 
@@ -981,45 +2033,23 @@ def sat_press(
     0.62647666996057927
     """
 
-    if DP != 'FALSE':
-
-        # use dew point method
-
-        if T != 'FALSE':
-            if DP > T:
-                raise ValueError(
-                    'The dew point cannot be greater than the temperature.')
-
-        DP = U.temp_conv(DP, from_units=temp_units, to_units='C')
-
-    # calculate vapour pressure
-
-        Pv = _sat_press(DP) * 100.
-    else:
-
-        if RH == 'FALSE':
-            raise ValueError(
-                'Either DP (dew point) or RH (relative humidity) must be specified.')
-
-    # relative humidity is specified
-    # confirm relative humidity is in range
-
-        if RH < 0 or RH > 1:
-            raise ValueError(
-                'The relative humidity must be in the range of 0 to 1.')
-
-        if T == 'FALSE':
-            raise ValueError(
-                'If the relative humidity is specified, the temperature must also be specified.')
+    if isinstance(T, str):
+        T = np.nan
+    T = U.temp_conv(_to_array(T), from_units=temp_units, to_units='C')
+    (DP, RH) = _humidity(DP, RH, temp_units)
 
-        T = U.temp_conv(T, from_units=temp_units, to_units='C')
-
-        Pv = _sat_press(T) * 100.
-        Pv *= RH
+    relative = np.isnan(DP)
+    if np.any(relative & np.isnan(RH)):
+        raise ValueError(
+            'Either DP (dew point) or RH (relative humidity) must be specified.')
+    if np.any(relative & np.isnan(T)):
+        raise ValueError(
+            'If the relative humidity is specified, the temperature must also be specified.')
 
+    Pv = _vapour_press(T, DP, RH)
     Pv = U.press_conv(Pv, from_units='pa', to_units=press_units)
 
-    return Pv
+    return _from_array(Pv)
 
 
 def dry_press(
@@ -1041,48 +2071,160 @@ def dry_press(
     return Pd
 
 
+@memo.memoize
 def density_alt2temp(
     density_alt_seek,
     press_alt,
     alt_units=default_alt_units,
     temp_units=default_temp_units,
+    alt_setting=P0 / 100.,
+    DP=np.nan,
+    RH=0.0,
 ):
     """
     Return temperature to achieve a desired density altitude.
 
+    This is the inverse of density_alt, and the altimeter setting, dew point
+    and relative humidity have the same meaning.  If the dew point or
+    relative humidity are not specified, the air is assumed to be completely
+    dry.
+
+    The density altitude, pressure altitude, altimeter setting, dew point
+    and relative humidity may be scalars or arrays, with NaN marking a
+    missing dew point or relative humidity, as for density_alt.
+
+    For dry air, or air with a specified dew point, the temperature is
+    calculated directly from the density and pressure.  For a specified
+    relative humidity, the vapour pressure depends on the temperature, and a
+    few iterations of Newton's method are used, starting at the dry air
+    temperature.
+
     If the units are not specified, the units in default_units.py are used.
+
+    Examples:
+
+    Calculate the temperature in deg F for a density altitude of 5000 at a
+    pressure altitude of 3700 (default altitude units):
+    >>> density_alt2temp(5000, 3700, temp_units = 'F')
+    66.01992012963956
     """
 
-    low = -100.  # initial lower guess
-    high = 100.  # initial upper guess
+    Rho = Rho0 * alt2density_ratio(density_alt_seek, alt_units)
+    P = dry_press(_to_array(press_alt), 0., alt_setting=alt_setting,
+                  alt_units=alt_units, press_units='pa')
+
+    (DP, RH) = _humidity(DP, RH, temp_units)
+    dew = ~np.isnan(DP)
+    if np.any(~dew & ((RH < 0) | (RH > 1))):
+        raise ValueError(
+            'The relative humidity must be in the range of 0 to 1.')
+
+    # where the dew point is specified, the vapour pressure is fixed, and
+    # the temperature follows directly
+
+    with np.errstate(invalid='ignore'):
+        Pv = np.where(dew, _sat_press(DP) * 100., 0.)
+    a = 1 / Rd - 1 / Rv
+    T = (P / Rd - a * Pv) / Rho
+
+    # otherwise, solve P / Rd - a * (Pv + RH * sat_press(T)) - Rho * T = 0
+
+    b = a * 100. * np.where(dew | np.isnan(RH), 0., RH)
+    if np.any(b != 0):
+        for i in range(20):
+            T_C = _K2C(T)
+            F = P / Rd - a * Pv - b * _sat_press(T_C) - Rho * T
+            step = F / (-b * _sat_press_slope(T_C) - Rho)
+            T = T - step
+            if not np.any(np.abs(step) > 1e-10 * T):
+                break
+
+    if np.any(dew & (_K2C(T) < DP)):
+        raise ValueError(
+            'The dew point cannot be greater than the temperature.')
+
+    return _from_array(U.temp_conv(T, from_units='K', to_units=temp_units))
 
-    # confirm initial low and high are OK:
 
-    da_low = density_alt(press_alt, low, alt_units=alt_units)
-    if da_low > density_alt_seek:
-        raise ValueError('Initial low guess too high.')
+_TABLE_CHUNK = 1000  # rows computed per pass by density_alt_table
 
-    da_high = density_alt(press_alt, high, alt_units=alt_units)
-    if da_high < density_alt_seek:
-        raise ValueError('Initial high guess too low.')
 
-    guess = (low + high) / 2.
-    da_guess = density_alt(press_alt, guess, alt_units=alt_units)
+def _density_alt_table_rows(density_alt_seek, alt_range, alt_inc, alt_units,
+                            temp_units, multi_units):
+    """
+    Yield the rows of a density altitude table, as arrays with columns of
+    pressure altitude and temperature (or temperature in deg C and deg F if
+    multi_units is True), _TABLE_CHUNK rows at a time.
+    """
 
-    # keep iterating until da is within 1 ft of desired value
+    start = max(density_alt_seek - alt_range / 2., 0)
+    stop = density_alt_seek + alt_range / 2.
+    count = int(np.floor((stop - start) / alt_inc + 1e-9)) + 1
 
-    while np.fabs(da_guess - density_alt_seek) > 1:
-        if da_guess > density_alt_seek:
-            high = guess
+    for i in range(0, count, _TABLE_CHUNK):
+        alt = start + alt_inc * np.arange(i, min(i + _TABLE_CHUNK, count))
+        if multi_units:
+            temp = density_alt2temp(density_alt_seek, alt, alt_units=alt_units,
+                                    temp_units='C')
+            yield np.column_stack((alt, temp, _C2F(temp)))
         else:
-            low = guess
+            temp = density_alt2temp(density_alt_seek, alt, alt_units=alt_units,
+                                    temp_units=temp_units)
+            yield np.column_stack((alt, temp))
+
 
-        guess = (low + high) / 2.
-        da_guess = density_alt(press_alt, guess, alt_units=alt_units)
+def _density_alt_table_lines(rows, density_alt_seek, alt_units, temp_units,
+                             multi_units, format):
+    """
+    Yield the lines of a density altitude table in text, csv or html format,
+    given the row generator.
+    """
 
-    guess = U.temp_conv(guess, from_units='C', to_units=temp_units)
+    import locale as L
+
+    if multi_units:
+        temp_units = ['C', 'F']
+    else:
+        temp_units = [temp_units]
 
-    return guess
+    if format == 'text':
+        yield 'Pressure altitudes and temperatures for a density '
+        yield 'altitude of ' + str(density_alt_seek) + ' ' + alt_units
+        yield '(assuming dry air)\n'
+        yield (' Pressure' + '    Temp  ' * len(temp_units)).rstrip()
+        yield ' Altitude'
+        yield ('   (' + alt_units + ')  '
+               + ''.join(('(deg ' + units + ')').rjust(10)
+                         for units in temp_units))
+        for chunk in rows:
+            for row in chunk:
+                yield (L.format_string('%.*f', (0, row[0]),
+                                       grouping=True).rjust(6)
+                       + ('%.1f' % row[1]).rjust(11)
+                       + ''.join(('%.1f' % temp).rjust(10)
+                                 for temp in row[2:]))
+    elif format == 'csv':
+        yield ','.join(['pressure altitude (' + alt_units + ')']
+                       + ['temperature (deg ' + units + ')'
+                          for units in temp_units])
+        for chunk in rows:
+            for row in chunk:
+                yield ','.join(['%.0f' % row[0]]
+                               + ['%.1f' % temp for temp in row[1:]])
+    elif format == 'html':
+        yield '<table>'
+        yield ('<caption>Pressure altitudes and temperatures for a density '
+               'altitude of ' + str(density_alt_seek) + ' ' + alt_units
+               + ' (assuming dry air)</caption>')
+        yield ('<tr><th>Pressure Altitude (' + alt_units + ')</th>'
+               + ''.join('<th>Temp (deg ' + units + ')</th>'
+                         for units in temp_units) + '</tr>')
+        for chunk in rows:
+            for row in chunk:
+                yield ('<tr><td>%.0f</td>' % row[0]
+                       + ''.join('<td>%.1f</td>' % temp for temp in row[1:])
+                       + '</tr>')
+        yield '</table>'
 
 
 def density_alt_table(
@@ -1096,62 +2238,60 @@ def density_alt_table(
     format='text',
 ):
     """
-    Return a text or html table of required temperature vs pressure altitude.
+    Return a table of the temperature required for a density altitude, vs
+    pressure altitude, assuming dry air.
+
+    The pressure altitudes run from density_alt_seek - alt_range / 2 (but not
+    below zero) to density_alt_seek + alt_range / 2, in steps of alt_inc.  If
+    multi_units is True, the temperature is given in both deg C and deg F.
+
+    format may be 'text', 'csv' or 'html', or 'array' to return a numpy
+    array with a column of pressure altitudes, and a column for each
+    temperature.
+
+    If file is a file name or an open file, the text, csv or html table is
+    written to it, otherwise it is returned as a string.  The rows are
+    computed in groups, and written as they are computed, so a table with
+    many rows does not need to be held in memory.
 
     If the units are not specified, the units in default_units.py are used.
+
+    Examples:
+
+    >>> print(density_alt_table(5000, alt_range=200, format='csv'))
+    pressure altitude (ft),temperature (deg C)
+    4900,6.1
+    5000,5.1
+    5100,4.1
     """
 
-    line_buffer = []
-    if format == 'text':
-        line_buffer.append('Pressure altitudes and temperatures for a density '
-                           )
-        line_buffer.append('altitude of ' + str(density_alt_seek) + ' '
-                           + alt_units)
-        line_buffer.append('(assuming dry air)\n')
-        if multi_units:
-            line_buffer.append(' Pressure    Temp      Temp')
-            line_buffer.append(' Altitude')
-            line_buffer.append('   (' + alt_units
-                               + ')     (deg C)   (deg F)')
-        else:
-            line_buffer.append(' Pressure    Temp')
-            line_buffer.append(' Altitude')
-            line_buffer.append('   (' + alt_units + ')     (deg '
-                               + temp_units + ')')
-    elif format == 'html':
-        print('creating html')
-    else:
-        raise ValueError('Invalid format.  Must be either "text" or "html"')
+    if format not in ('text', 'csv', 'html', 'array'):
+        raise ValueError(
+            'Invalid format.  Must be one of "text", "csv", "html" or "array"')
 
-    if multi_units:
-        for alt in range(max(density_alt_seek - alt_range / 2., 0),
-                         density_alt_seek + alt_range / 2. + alt_inc,
-                         alt_inc):
-            temp_c = density_alt2temp(density_alt_seek, alt,
-                                      alt_units=alt_units)
-            temp_f = U.temp_conv(temp_c, from_units='C', to_units='F')
-            alt_str = L.format('%.*f', (0, alt), grouping=True)
-            temp_c_str = '%.1f' % temp_c
-            temp_f_str = '%.1f' % temp_f
-            line_buffer.append(alt_str.rjust(6) + temp_c_str.rjust(11)
-                               + temp_f_str.rjust(10))
-    else:
-        for alt in range(max(density_alt_seek - alt_range / 2., 0),
-                         density_alt_seek + alt_range / 2. + alt_inc,
-                         alt_inc):
-            alt_str = L.format('%.*f', (0, alt), grouping=True)
-            temp_str = '%.1f' % density_alt2temp(density_alt_seek, alt,
-                                                 temp_units=temp_units, alt_units=alt_units)
-            line_buffer.append(alt_str.rjust(6) + temp_str.rjust(11))
-
-    if file != '':
-        OUT = open(file, 'w')
-        for line in line_buffer:
-            OUT.write(line + '\n')
-
-        print('file selected')
+    # the units are written in the table headings
+
+    alt_units = U.resolve_units(alt_units)
+    temp_units = U.resolve_units(temp_units)
+
+    rows = _density_alt_table_rows(density_alt_seek, alt_range, alt_inc,
+                                   alt_units, temp_units, multi_units)
+    if format == 'array':
+        return np.concatenate(list(rows))
+
+    lines = _density_alt_table_lines(rows, density_alt_seek, alt_units,
+                                     temp_units, multi_units, format)
+
+    if file == '':
+        return '\n'.join(lines)
+
+    if hasattr(file, 'write'):
+        for line in lines:
+            file.write(line + '\n')
     else:
-        return '\n'.join(line_buffer)
+        with open(file, 'w') as OUT:
+            for line in lines:
+                OUT.write(line + '\n')
 
 
 # #############################################################################
@@ -1161,30 +2301,54 @@ def density_alt_table(
 # #############################################################################
 
 
-def _press2alt_gradient(
-    P,
-    Pb,
-    Hb,
-    Tb,
-    L,
-):
+def _layer_inverse(ratio, layer, exponent):
+    """
+    Return the altitude in km, given the ratio of pressure or density to its
+    value at the base of the layer, and the exponent of the gradient layer
+    equation for that quantity.  np.power is used as in
+    _layer_alt2press_ratio.
+    """
 
-    return Hb + (Tb / L) * ((P / Pb) ** (((-1 * Rd) * L) / (1000 * g))
-                            - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _LAYERS['H'][layer] + np.where(
+            _LAYERS['isothermal'][layer],
+            -(_LAYERS['RT'][layer] * np.log(ratio)) / (1000 * g),
+            _LAYERS['T_L'][layer] * (np.power(ratio, exponent) - 1))
 
 
-def _press2alt_isothermal(
-    P,
-    Pb,
-    Hb,
-    Tb,
-):
+def _press2alt(P):
+    """
+    Return the altitude in km for an array of pressures in pa.
+    """
+
+    upper = P < P85
+    if not np.any(upper):
+        return _layer_press2alt(P)
+
+    lower = ~upper
+    H = np.empty_like(P)
+    H[lower] = _layer_press2alt(P[lower])
+    H[upper] = _upper_inverse(P[upper], _upper_table()[1])
+
+    return H
+
 
-    return Hb - ((Rd * Tb) * np.log(P / Pb)) / (1000 * g)
+def _layer_press2alt(P):
+    """
+    Return the altitude in km for an array of pressures in pa, from the
+    layers up to 84.852 km.  Each element is evaluated with the equation for
+    its own layer.
+    """
+
+    layer = _base2layer(P, _LAYER_P_REV)
+
+    return _layer_inverse(P / _LAYERS['P'][layer], layer,
+                          _LAYERS['H_P_exp'][layer])
 
 
+@memo.memoize
 def press2alt(P, press_units=default_press_units,
-              alt_units=default_alt_units):
+              alt_units=default_alt_units, altitude_type='geopotential'):
     """
     Return the altitude corresponding to the specified pressure, with
     pressure in inches of HG, mm of HG, psi, psf (lb per sq. ft), pa, hpa or
@@ -1193,6 +2357,10 @@ def press2alt(P, press_units=default_press_units,
     The altitude is in units of feet ('ft'), metres ('m'), statute miles,
     ('sm') or nautical miles ('nm')
 
+    The pressure may be a scalar or an array.  If it is an array, the result
+    is an array of the same shape, and any element that is outside the range
+    of the model returns NaN instead of raising a ValueError.
+
     If the units are not specified, the units in default_units.py are used.
 
     Examples:
@@ -1220,31 +2388,16 @@ def press2alt(P, press_units=default_press_units,
 
     # function tested in tests/test_std_atm.py
 
-    P = U.press_conv(P, from_units=press_units, to_units='pa')
-
-    if P > P11:
-        H = _press2alt_gradient(P, P0, 0, T0, L0)
-    elif P > P20:
-        H = _press2alt_isothermal(P, P11, 11, T11)
-    elif P > P32:
-        H = _press2alt_gradient(P, P20, 20, T20, L20)
-    elif P > P47:
-        H = _press2alt_gradient(P, P32, 32, T32, L32)
-    elif P > P51:
-        H = _press2alt_isothermal(P, P47, 47, T47)
-    elif P > P71:
-        H = _press2alt_gradient(P, P51, 51, T51, L51)
-    else:
-        H = _press2alt_gradient(P, P71, 71, T71, L71)
+    P = U.press_conv(_to_array(P), from_units=press_units, to_units='pa')
 
-    if H > 84.852:
-        raise ValueError(
-            'This function is only implemented for altitudes of 84.852 km and below.')
+    H = _inverse_range2nan(_press2alt(P), P)
 
-    return U.length_conv(H, from_units='km', to_units=alt_units)
+    return _from_array(_km2alt(H, alt_units, altitude_type))
 
 
-def press_ratio2alt(PR, alt_units=default_alt_units):
+@memo.memoize
+def press_ratio2alt(PR, alt_units=default_alt_units,
+                    altitude_type='geopotential'):
     """
     Return the pressure ratio for the specified altitude.  The altitude is
     specified in feet ('ft'), metres ('m'), statute miles, ('sm') or
@@ -1265,8 +2418,9 @@ def press_ratio2alt(PR, alt_units=default_alt_units):
 
     # function tested in tests/test_std_atm.py
 
-    P = PR * P0
-    return press2alt(P, press_units='pa', alt_units=alt_units)
+    P = _to_array(PR) * P0
+    return press2alt(P, press_units='pa', alt_units=alt_units,
+                     altitude_type=altitude_type)
 
 
 # #############################################################################
@@ -1276,6 +2430,7 @@ def press_ratio2alt(PR, alt_units=default_alt_units):
 # #############################################################################
 
 
+@memo.memoize
 def temp2speed_of_sound(temp, temp_units=default_temp_units,
                         speed_units=default_speed_units):
     """
@@ -1316,33 +2471,50 @@ def temp2speed_of_sound(temp, temp_units=default_temp_units,
 #############################################################################
 
 
-def temp2dynamic_viscosity(T, temp_units=default_temp_units,
-                           dynamic_viscosity_units=default_dynamic_viscosity_units):
+def _dynamic_viscosity(T):
     """
-    Return dynamic viscosity given the air temperature.
+    Return the dynamic viscosity in Pa s for an array of temperatures in
+    deg K.
 
     Formula from US Standard Atmosphere, 1976 section 1.3.11 on page 19.
     """
-    T = U.temp_conv(T, temp_units, 'K')
-    u = 1.458e-6 * T**1.5 / (T + 110.4)
 
-    u = U.dynamic_viscosity_conv(u, 'Pa s', dynamic_viscosity_units)
+    u = np.power(T, 1.5)
+    u *= 1.458e-6
+    u /= T + 110.4
 
     return u
 
 
+def temp2dynamic_viscosity(T, temp_units=default_temp_units,
+                           dynamic_viscosity_units=default_dynamic_viscosity_units):
+    """
+    Return dynamic viscosity given the air temperature.
+
+    The temperature may be a scalar or an array.
+    """
+    T = U.temp_conv(_to_array(T), temp_units, 'K')
+    u = U.dynamic_viscosity_conv(_dynamic_viscosity(T), 'Pa s',
+                                 dynamic_viscosity_units)
+
+    return _from_array(u)
+
+
+@memo.memoize
 def alt2dynamic_viscosity(H, alt_units=default_alt_units,
-                          dynamic_viscosity_units=default_dynamic_viscosity_units):
+                          dynamic_viscosity_units=default_dynamic_viscosity_units,
+                          altitude_type='geopotential'):
     """
     Return dynamic viscosity given the altitude.
-    """
-    T = alt2temp(H, alt_units=alt_units)
-    u = temp2dynamic_viscosity(T)
 
-    # add unit conversion for result
-    u = U.dynamic_viscosity_conv(u, 'Pa s', dynamic_viscosity_units)
+    The altitude may be a scalar or an array.
+    """
+    T = alt2temp(H, alt_units=alt_units, temp_units='K',
+                 altitude_type=altitude_type)
+    u = U.dynamic_viscosity_conv(_dynamic_viscosity(T), 'Pa s',
+                                 dynamic_viscosity_units)
 
-    return u
+    return _from_array(u)
 
 
 def kinematic_viscosity(density, dynamic_viscosity,
@@ -1351,57 +2523,384 @@ def kinematic_viscosity(density, dynamic_viscosity,
                         dynamic_viscosity_units=default_dynamic_viscosity_units):
     """
     Return kinematic viscosity given density and dynamic viscosity.
+
+    The density and dynamic viscosity may be scalars or arrays.
     """
-    density = U.density_conv(density, density_units, 'kg/m**3')
+    density = U.density_conv(_to_array(density), density_units, 'kg/m**3')
     dynamic_viscosity = U.dynamic_viscosity_conv(
-        dynamic_viscosity, dynamic_viscosity_units, 'Pa s')
+        _to_array(dynamic_viscosity), dynamic_viscosity_units, 'Pa s')
     kinematic_viscosity = dynamic_viscosity / density
 
     kinematic_viscosity = U.kinematic_viscosity_conv(
         kinematic_viscosity, 'm**2/s', kinematic_viscosity_units)
 
-    return kinematic_viscosity
+    return _from_array(kinematic_viscosity)
 
 
-def alt2kinematic_viscosity(H, T='std', alt_units=default_alt_units, temp_units=default_temp_units,
-                            kinematic_viscosity_units=default_kinematic_viscosity_units):
+def _alt_temp2density_viscosity(H, T, alt_units, temp_units, altitude_type):
     """
-    Return kinematic viscosity, given altitude and an optional temperature input.
+    Return the density in kg/m**3, and the dynamic viscosity in Pa s, for
+    altitudes and temperatures ('std' for the standard temperature, or an
+    Atmosphere).  The results broadcast against each other.
     """
-    density = alt2density(H, alt_units, density_units='kg/m**3')
-    isa_temp = alt2temp(H, alt_units, 'K')
-    if T != 'std':
-        isa_temp = alt2temp(H, alt_units, 'K')
-        T = U.temp_conv(T, temp_units, 'K')
-        density *= isa_temp / T
+
+    H = _alt2km(H, alt_units, altitude_type)
+    _check_alt_range(H)
+    isa_temp = _alt2temp(H)
+    density = Rho0 * _alt2density_ratio(H)
+    if isinstance(T, str) and T == 'std':
+        T = isa_temp
+    elif isinstance(T, Atmosphere):
+        T = T._press_alt2temp(H)
+        density = density * (isa_temp / T)
     else:
-        T = U.temp_conv(isa_temp, 'K', temp_units)
+        T = U.temp_conv(_to_array(T), temp_units, 'K')
+        density = density * (isa_temp / T)
 
-    u = temp2dynamic_viscosity(T, temp_units, 'Pa s')
-    v = u / density
+    return (density, _dynamic_viscosity(T))
 
-    v = U.kinematic_viscosity_conv(v, 'm**2/s', kinematic_viscosity_units)
 
-    return v
+@memo.memoize
+def alt2kinematic_viscosity(H, T='std', alt_units=default_alt_units, temp_units=default_temp_units,
+                            kinematic_viscosity_units=default_kinematic_viscosity_units,
+                            altitude_type='geopotential'):
+    """
+    Return kinematic viscosity, given altitude and an optional temperature input.
+
+    The altitude and temperature may be scalars or arrays, which are
+    broadcast against each other.
+    """
+    (density, u) = _alt_temp2density_viscosity(H, T, alt_units, temp_units,
+                                               altitude_type)
+
+    v = U.kinematic_viscosity_conv(u / density, 'm**2/s',
+                                   kinematic_viscosity_units)
+
+    return _from_array(v)
 
 
 def Re(V, L, KV, speed_units=default_speed_units, length_units=default_length_units,
-       # kinematic_viscosity_units=default_kinematic_viscosity_units
-       ):
+       kinematic_viscosity_units=default_kinematic_viscosity_units):
     """
     Return Reynold's number, given velocity, characteristic length and kinematic viscosity'
 
     V  = velocity
     L  = characteristic length
     KV = kinematic viscosity
+
+    The inputs may be scalars or arrays, which are broadcast against each
+    other.
     """
-    V = U.speed_conv(V, speed_units, 'm/s')
-    L = U.length_conv(L, length_units, 'm')
-    # KV = U.kinematic_viscosity_conv(KV, kinematic_viscosity_units, '??')
+    V = U.speed_conv(_to_array(V), speed_units, 'm/s')
+    L = U.length_conv(_to_array(L), length_units, 'm')
+    KV = U.kinematic_viscosity_conv(_to_array(KV), kinematic_viscosity_units,
+                                    'm**2/s')
 
     Re = V * L / KV
 
-    return Re
+    return _from_array(Re)
+
+
+def alt2Re(V, L, H, T='std', speed_units=default_speed_units,
+           length_units=default_length_units, alt_units=default_alt_units,
+           temp_units=default_temp_units, altitude_type='geopotential'):
+    """
+    Return Reynold's number, given velocity, characteristic length, altitude
+    and an optional temperature input.
+
+    The inputs may be scalars or arrays, which are broadcast against each
+    other, e.g. to find the Reynold's number over a grid of speeds, lengths,
+    altitudes and temperatures in one call.  The result is allocated once,
+    at the broadcast shape, and the density and viscosity are only computed
+    at the broadcast shape of the altitude and temperature.
+
+    Examples:
+
+    Reynold's number per foot at 100 kt and 5000 ft, standard temperature:
+    >>> alt2Re(100, 1, 5000)
+    950575.2918224637
+    """
+    V = U.speed_conv(_to_array(V), speed_units, 'm/s')
+    L = U.length_conv(_to_array(L), length_units, 'm')
+    (density, u) = _alt_temp2density_viscosity(H, T, alt_units, temp_units,
+                                               altitude_type)
+
+    Re = np.empty(np.broadcast(V, L, density, u).shape)
+    np.multiply(V, L, out=Re)
+    Re *= density
+    Re /= u
+
+    return _from_array(Re)
+
+
+# #############################################################################
+#
+# Non-standard atmosphere
+#
+# An Atmosphere is defined by its temperature at a set of levels, e.g. from a
+# radiosonde sounding, or from the standard atmosphere with an ISA deviation.
+# The temperature is linear in altitude between levels, so the hydrostatic
+# integral of dH / T has a closed form over each segment.  Its cumulative
+# value at the levels is computed once, when the Atmosphere is created, and a
+# query only needs a binary search for the segment, plus the partial integral
+# within it.
+#
+# If the pressure is given at each level, the log of the pressure within a
+# segment is interpolated in proportion to the partial integral, so that it
+# matches the given pressures at both ends of the segment.
+#
+# #############################################################################
+
+
+class Atmosphere(object):
+
+    """
+    A non-standard atmosphere, defined by the temperature at a set of
+    altitudes, with the pressure and density found by hydrostatic
+    integration.
+
+    altitude and temp are one dimensional arrays, with the altitudes
+    (geopotential) increasing.  press is either the pressure at each altitude,
+    or a single pressure at the lowest altitude.
+
+    Use Atmosphere.from_isa_dev() for the standard atmosphere with an ISA
+    deviation.
+
+    An Atmosphere may be used in place of the temperature in the airspeed
+    functions and in alt_temp2density_ratio, alt2kinematic_viscosity and
+    alt2Re, where the temperature is found at the pressure altitude.
+
+    A scalar altitude or pressure outside the levels raises a ValueError.
+    In an array, the results for these elements are NaN.
+
+    Examples:
+
+    A sounding with a low level inversion, and the pressure at the surface:
+    >>> atm = Atmosphere([0, 1000, 3000], [10, 14, 2], 1000,
+    ...                  alt_units='m', temp_units='C', press_units='hpa')
+    >>> atm.alt2temp(500, alt_units='m', temp_units='C')
+    12.0
+    """
+
+    def __init__(self, altitude, temp, press, alt_units=default_alt_units,
+                 temp_units=default_temp_units,
+                 press_units=default_press_units):
+
+        H = U.length_conv(_to_array(altitude), from_units=alt_units,
+                          to_units='km')
+        T = U.temp_conv(_to_array(temp), from_units=temp_units, to_units='K')
+        P = U.press_conv(_to_array(press), from_units=press_units,
+                         to_units='pa')
+
+        if H.ndim != 1 or len(H) < 2 or T.shape != H.shape:
+            raise ValueError('The altitudes and temperatures must be one '
+                             'dimensional arrays of the same length, with at '
+                             'least two levels.')
+        if np.any(np.diff(H) <= 0):
+            raise ValueError('The altitudes must be increasing.')
+        if np.any(T <= 0):
+            raise ValueError('The temperatures must be above absolute zero.')
+        if np.any(P <= 0):
+            raise ValueError('The pressures must be positive.')
+
+        # temperature gradient (deg K/km) and integral of dH / T over each
+        # segment
+
+        dH = np.diff(H)
+        dT = np.diff(T)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gradient = dT / dH
+            integral = np.where(dT == 0, dH / T[:-1],
+                                np.log1p(dT / T[:-1]) / gradient)
+
+        if P.ndim == 0:
+            lnP = np.log(P) - ((1000 * g) / Rd) * np.concatenate(
+                ([0.], np.cumsum(integral)))
+        elif P.shape == H.shape:
+            lnP = np.log(P)
+            if np.any(np.diff(lnP) >= 0):
+                raise ValueError('The pressures must decrease with altitude.')
+        else:
+            raise ValueError('The pressure must be a single value, or one '
+                             'value for each altitude.')
+
+        self._H = H
+        self._T = T
+        self._lnP = lnP
+        self._gradient = gradient
+        self._integral = integral
+
+    @classmethod
+    def from_isa_dev(cls, ISA_dev, temp_units=default_temp_units):
+        """
+        Return the standard atmosphere, with the temperature at each pressure
+        altitude offset by ISA_dev, up to 84.852 km (86 km geometric).  The
+        pressure at sea level is standard, so above sea level the altitude
+        of each pressure level is higher than the pressure altitude on a
+        warm day, and lower on a cold day.
+
+        The temperature units may be deg C, F, K or R ('C', 'F', 'K' or 'R').
+
+        Examples:
+
+        The temperature at 10,000 ft pressure altitude on an ISA+20 day:
+        >>> atm = Atmosphere.from_isa_dev(20)
+        >>> round(atm.press_alt2temp(10000), 6)
+        15.188053
+        """
+
+        dev = ISA_dev * U.converter('temp', temp_units, 'K').scale
+
+        # levels every 250 m of pressure altitude, plus the layer bases.  The
+        # temperature is not quite linear between levels in true altitude,
+        # but the error in the temperature at a pressure altitude is less
+        # than 0.001 deg.
+
+        HP = np.union1d(np.arange(-5., H85, 0.25), np.append(_LAYER_H, H85))
+        T = _layer_alt2temp(HP) + dev
+        P = P0 * _layer_alt2press_ratio(HP)
+
+        # hydrostatic thickness of the temperature deviation
+
+        H = HP + (dev * Rd / (1000 * g)) * np.log(P0 / P)
+
+        return cls(H, T, P, alt_units='km', temp_units='K', press_units='pa')
+
+    def _segment(self, value, levels):
+        """
+        Return the index of the segment containing each value, given the
+        increasing value at each level, and whether each value is outside
+        the levels.
+
+        A scalar value outside the levels raises a ValueError.  In an array,
+        the results for these elements are set to NaN by the caller, as for
+        the standard atmosphere.
+        """
+
+        outside = (value < levels[0]) | (value > levels[-1])
+        if np.ndim(value) == 0 and outside:
+            raise ValueError('Value out of range.  The altitude or pressure '
+                             'is outside the levels of the atmosphere.')
+        k = np.searchsorted(levels, value, side='right') - 1
+        return (np.clip(k, 0, len(levels) - 2), outside)
+
+    def _alt2temp_press(self, H):
+        """
+        Return the temperature in deg K and pressure in pa, given the
+        altitude in km.
+        """
+
+        (k, outside) = self._segment(H, self._H)
+        dH = H - self._H[k]
+        Tk = self._T[k]
+        gradient = self._gradient[k]
+        T = Tk + gradient * dH
+        with np.errstate(divide='ignore', invalid='ignore'):
+            partial = np.where(gradient == 0, dH / Tk,
+                               np.log1p(gradient * dH / Tk) / gradient)
+        lnP = self._lnP[k] + (self._lnP[k + 1] - self._lnP[k]) * (
+            partial / self._integral[k])
+        if np.any(outside):
+            (T, lnP) = (np.where(outside, np.nan, T),
+                        np.where(outside, np.nan, lnP))
+
+        return (T, np.exp(lnP))
+
+    def _press2alt_temp(self, P):
+        """
+        Return the altitude in km and temperature in deg K, given the
+        pressure in pa.
+        """
+
+        lnP = np.log(P)
+        (k, outside) = self._segment(-lnP, -self._lnP)
+        partial = self._integral[k] * (lnP - self._lnP[k]) / (
+            self._lnP[k + 1] - self._lnP[k])
+        Tk = self._T[k]
+        gradient = self._gradient[k]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dH = np.where(gradient == 0, partial * Tk,
+                          Tk * np.expm1(gradient * partial) / gradient)
+        if np.any(outside):
+            dH = np.where(outside, np.nan, dH)
+
+        return (self._H[k] + dH, Tk + gradient * dH)
+
+    def _press_alt2temp(self, HP):
+        """
+        Return the temperature in deg K, given the pressure altitude in km.
+        """
+
+        _check_alt_range(HP)
+        return self._press2alt_temp(P0 * _alt2press_ratio(HP))[1]
+
+    def alt2temp(self, H, alt_units=default_alt_units,
+                 temp_units=default_temp_units, altitude_type='geopotential'):
+        """
+        Return the temperature at an altitude.
+        """
+
+        H = _alt2km(H, alt_units, altitude_type)
+        T = self._alt2temp_press(H)[0]
+        return _from_array(U.temp_conv(T, from_units='K',
+                                       to_units=temp_units))
+
+    def alt2press(self, H, alt_units=default_alt_units,
+                  press_units=default_press_units,
+                  altitude_type='geopotential'):
+        """
+        Return the pressure at an altitude.
+        """
+
+        H = _alt2km(H, alt_units, altitude_type)
+        P = self._alt2temp_press(H)[1]
+        return _from_array(U.press_conv(P, from_units='pa',
+                                        to_units=press_units))
+
+    def alt2density(self, H, alt_units=default_alt_units,
+                    density_units=default_density_units,
+                    altitude_type='geopotential'):
+        """
+        Return the density at an altitude.
+        """
+
+        H = _alt2km(H, alt_units, altitude_type)
+        (T, P) = self._alt2temp_press(H)
+        return _from_array(U.density_conv(P / (Rd * T), from_units='kg/m**3',
+                                          to_units=density_units))
+
+    def alt2speed_of_sound(self, H, alt_units=default_alt_units,
+                           speed_units=default_speed_units,
+                           altitude_type='geopotential'):
+        """
+        Return the speed of sound at an altitude.
+        """
+
+        H = _alt2km(H, alt_units, altitude_type)
+        T = self._alt2temp_press(H)[0]
+        return _from_array(temp2speed_of_sound(T, temp_units='K',
+                                               speed_units=speed_units))
+
+    def press2alt(self, P, press_units=default_press_units,
+                  alt_units=default_alt_units, altitude_type='geopotential'):
+        """
+        Return the altitude of a pressure level.
+        """
+
+        P = U.press_conv(_to_array(P), from_units=press_units, to_units='pa')
+        H = self._press2alt_temp(P)[0]
+        return _from_array(_km2alt(H, alt_units, altitude_type))
+
+    def press_alt2temp(self, HP, alt_units=default_alt_units,
+                       temp_units=default_temp_units):
+        """
+        Return the temperature at a pressure altitude.
+        """
+
+        HP = U.length_conv(_to_array(HP), from_units=alt_units, to_units='km')
+        T = self._press_alt2temp(HP)
+        return _from_array(U.temp_conv(T, from_units='K',
+                                       to_units=temp_units))
 
 
 if __name__ == '__main__':
@@ -48,12 +48,25 @@
 # 0.28   15 Apr 10  Rename len_conv to length_conv
 #                   Add viscosity conversions
 # 0.29   07 Sep 13  Add ft/mn to speed_conv
+# 0.30   18 Oct 26  Replace the if/elif chains with precomputed conversion
+#                   tables.  All conversions work on scalars and arrays.
+# 0.31   18 Oct 26  Add converter(), which returns a cached conversion
+#                   function for a fixed pair of units.
+# 0.32   18 Oct 26  Default units are looked up in the unit context of
+#                   default_units at each conversion.  Add resolve_units.
 # #############################################################################
 
 """
 Convert between various units.
+
+Each conversion is a dictionary lookup of the (from_units, to_units) pair,
+followed by one multiply (and for temperature, a subtract and an add).  The
+values may be scalars or numpy arrays.  Array arguments are never modified
+in place.
 """
 
+from fractions import Fraction
+
 try:
     from .default_units import *
 except ImportError:
@@ -68,6 +81,294 @@ except ImportError:
     default_alt_units = default_length_units
     default_avgas_units = 'lb'
     default_vol_units = 'ft**3'
+    default_dynamic_viscosity_units = 'Pa s'
+    default_kinematic_viscosity_units = 'm**2/s'
+
+try:
+    from .default_units import DefaultUnits
+except ImportError:
+    DefaultUnits = None
+
+
+# #############################################################################
+#
+# Conversion tables
+#
+# Each unit is defined by the scale that converts a value in that unit to
+# the base unit of the quantity.  Temperature units also have a zero, which
+# is the reading in that unit at a common reference point (0 deg C), so that
+#
+#     to_value = (from_value - from_zero) * scale + to_zero
+#
+# The factors are given as strings and combined with exact fractions, so
+# that the factor for each (from_units, to_units) pair is correctly rounded.
+#
+# #############################################################################
+
+_QUANTITIES = {}
+
+
+def _register(quantity, units, description):
+    """
+    Build the conversion table for every pair of units of a quantity.
+
+    units is a dictionary of unit name: scale or (scale, zero), with the
+    scale to the base unit and the reading at the reference point given as
+    strings or Fractions.
+
+    description lists the valid units, and is used in error messages.
+    """
+
+    exact = {}
+    for (name, factors) in units.items():
+        if not isinstance(factors, tuple):
+            factors = (factors, '0')
+        exact[name] = (Fraction(factors[0]), Fraction(factors[1]))
+
+    table = {}
+    for (from_units, (from_scale, from_zero)) in exact.items():
+        for (to_units, (to_scale, to_zero)) in exact.items():
+            table[from_units, to_units] = (float(from_scale / to_scale),
+                                           float(from_zero), float(to_zero))
+
+    _QUANTITIES[quantity] = (table, description)
+
+    return table
+
+
+def _unit_error(quantity, from_units, to_units):
+    """
+    Return a ValueError that names the invalid units argument.
+    """
+
+    (table, description) = _QUANTITIES[quantity]
+    if (from_units, from_units) not in table:
+        return ValueError('from_units must be ' + description)
+    return ValueError('to_units must be ' + description)
+
+
+def resolve_units(units):
+    """
+    Return the units to use for a units argument.  A default from
+    default_units is looked up in the current unit context (see
+    default_units.units).  Other units are returned unchanged.
+    """
+
+    if type(units) is DefaultUnits:
+        return units.resolve()
+    return units
+
+
+def _convert(value, quantity, from_units, to_units):
+    """
+    Convert value between units of quantity, using the precomputed tables.
+    """
+
+    if type(from_units) is DefaultUnits:
+        from_units = from_units.resolve()
+    if type(to_units) is DefaultUnits:
+        to_units = to_units.resolve()
+    try:
+        convert = _CONVERTERS[quantity, from_units, to_units]
+    except KeyError:
+        convert = converter(quantity, from_units, to_units)
+
+    return convert(value)
+
+
+_CONVERTERS = {}
+
+
+def converter(quantity, from_units, to_units):
+    """
+    Return a function that converts values of quantity from from_units to
+    to_units.
+
+    The units are checked once, when the converter is created, so the
+    returned function does no string comparisons.  It is intended for hot
+    loops that convert between the same pair of units many times.  The
+    converter has scale and offset attributes, such that:
+
+        converter(value) = value * scale + offset
+
+    quantity is the name of one of the conversion functions, without the
+    "_conv" suffix: 'area', 'density', 'force', 'length', 'power', 'press',
+    'speed', 'temp', 'vol', 'mass', 'dynamic_viscosity' or
+    'kinematic_viscosity'.
+
+    Converters are cached, so repeated calls with the same arguments return
+    the same function.
+
+    Examples:
+
+    >>> in_hg2pa = converter('press', 'in HG', 'pa')
+    >>> in_hg2pa(29.92)
+    101320.48960000002
+
+    >>> C2F = converter('temp', 'C', 'F')
+    >>> C2F.scale, C2F.offset
+    (1.8, 32.0)
+    """
+
+    from_units = resolve_units(from_units)
+    to_units = resolve_units(to_units)
+    key = (quantity, from_units, to_units)
+    try:
+        return _CONVERTERS[key]
+    except KeyError:
+        pass
+
+    if quantity not in _QUANTITIES:
+        raise ValueError('quantity must be one of "' +
+                         '", "'.join(sorted(_QUANTITIES)) + '".')
+    try:
+        (scale, from_zero, to_zero) = \
+            _QUANTITIES[quantity][0][from_units, to_units]
+    except KeyError:
+        raise _unit_error(quantity, from_units, to_units)
+
+    if from_zero or to_zero:
+
+        def convert(value):
+            return (value - from_zero) * scale + to_zero
+
+    else:
+
+        def convert(value):
+            return value * scale
+
+    convert.scale = scale
+    convert.offset = to_zero - from_zero * scale
+    _CONVERTERS[key] = convert
+
+    return convert
+
+
+# base unit: m**2
+
+_register('area', {
+    'ft**2': '0.09290304',
+    'in**2': '0.00064516',
+    'm**2': '1',
+    'km**2': '1000000',
+    'sm**2': '2589988.110336',
+    'nm**2': '3429904',
+}, '"ft**2" or "in**2" or "m**2" or "km**2" or "sm**2" (square statute '
+   'miles) or "nm**2" (square nautical miles).')
+
+# base unit: kg/m**3
+
+_register('density', {
+    'kg/m**3': '1',
+    'slug/ft**3': '515.37882',
+    'lb/ft**3': '16.018463',
+}, 'one of "kg/m**3", "slug/ft**3" and "lb/ft**3".')
+
+# base unit: N
+
+_register('force', {
+    'N': '1',
+    'lb': '4.4482216',
+}, 'one of "lb" or "N".')
+
+# base unit: m
+
+_register('length', {
+    'ft': '0.3048',
+    'in': '0.0254',
+    'mm': '0.001',
+    'cm': '0.01',
+    'm': '1',
+    'km': '1000',
+    'sm': '1609.344',
+    'nm': '1852',
+}, '"ft", "in", "mm", "cm", "m", "km", "sm" (statute miles) or "nm" '
+   '(nautical miles).')
+
+# base unit: hp
+
+_register('power', {
+    'hp': '1',
+    'ft-lb/mn': Fraction(1, 33000),
+    'ft-lb/s': Fraction(1, 550),
+    'W': Fraction(1) / Fraction('745.69987'),
+    'kW': Fraction(1) / Fraction('0.74569987'),
+}, '"hp", "ft-lb/mn", "ft-lb/s", "W" (watts) or "kW" (kilowatts).')
+
+# base unit: pa
+
+_register('press', {
+    'in HG': '3386.38',  # from NASA Reference Publication 1046 Appendix A28
+    'mm HG': '133.322',  # derived from NASA RP 1046 value of pa to in Hg
+    'psi': '6894.752',  # from NASA Reference Publication 1046 Appendix A27
+    'psf': '47.88026',  # from NASA Reference Publication 1046 Appendix A27
+    'lb/ft**2': '47.88026',
+    'hpa': '100',
+    'mb': '100',
+    'pa': '1',
+    'in H2O': '248.648',  # (using water density at 20 deg C)
+    'cm H2O': Fraction('248.648') / Fraction('2.54'),
+}, '"in HG", "mm HG", "psi", "psf" (lb per sq. ft), "hpa", "mb", "pa", '
+   '"in H2O" or "cm H2O".')
+
+# base unit: m/s
+
+_register('speed', {
+    'kt': Fraction(1852, 3600),
+    'mph': Fraction('1609.344') / 3600,
+    'km/h': Fraction(1000, 3600),
+    'm/s': '1',
+    'ft/s': '0.3048',
+    'ft/mn': Fraction('0.3048') / 60,
+}, 'one of "kt", "mph", "km/h", "m/s", "ft/mn" and "ft/s".')
+
+# base unit: deg K
+
+_register('temp', {
+    'C': ('1', '0'),
+    'F': (Fraction(5, 9), '32'),
+    'K': ('1', '273.15'),
+    'R': (Fraction(5, 9), '491.67'),
+}, 'one of "C", "F", "K" or "R".')
+
+# base unit: m**3
+
+_register('vol', {
+    'ft**3': '0.028316846592',
+    'in**3': '0.000016387064',
+    'm**3': '1',
+    'km**3': '1000000000',
+    'sm**3': '4168181825.440579584',
+    'nm**3': '6352182208',
+    'USG': '0.003785411784',
+    'ImpGal': '0.00454609',
+    'l': '0.001',
+}, '"ft**3", "in**3", "USG", "ImpGal", "l", "m**3", "km**3", "sm**3" '
+   '(cubic statute miles) or "nm**3" (cubic nautical miles).')
+
+# base unit: kg
+
+_register('mass', {
+    'kg': '1',
+    'lb': '0.45359237',
+}, 'one of "lb" or "kg".')
+
+# base unit: Pa s
+
+_register('dynamic_viscosity', {
+    'Pa s': '1',
+    'N s/m**2': '1',
+    'poise': '0.1',
+    'centipoise': '0.001',
+}, 'one of "Pa s", "N s/m**2", "poise" or "centipoise".')
+
+# base unit: m**2/s
+
+_register('kinematic_viscosity', {
+    'm**2/s': '1',
+    'stokes': '0.0001',
+    'centistokes': '0.000001',
+}, 'one of "m**2/s", "stokes" or "centistokes".')
 
 
 def area_conv(A, from_units=default_area_units,
@@ -75,10 +376,6 @@ def area_conv(A, from_units=default_area_units,
     """
     Convert area values between ft**2, in**2, m**2, km**2, sm**2 and nm**2.
 
-    The incoming value is first converted to ft**2, then it is converted to
-    desired return value.
-
-
     The units default to those specified in default_units.py
 
     Examples:
@@ -98,47 +395,13 @@ def area_conv(A, from_units=default_area_units,
     1550003.1000061999
     """
 
-    if from_units == 'ft**2':
-        pass
-    elif from_units == 'in**2':
-        A /= 144.
-    elif from_units == 'm**2':
-        A /= 0.3048 ** 2
-    elif from_units == 'km**2':
-        A /= 0.0003048 ** 2
-    elif from_units == 'sm**2':
-        A *= 5280. ** 2
-    elif from_units == 'nm**2':
-        A *= (1852 / 0.3048) ** 2
-    else:
-        raise ValueError('from_units must be "ft**2" or "in**2" or "m**2" '
-                         'or "km**2" or "sm**2" (square statute miles) or '
-                         '"nm**2" (square nautical miles).')
-
-    if to_units == 'ft**2':
-        return A
-    elif to_units == 'in**2':
-        return A * 144.
-    elif to_units == 'm**2':
-        return A * 0.3048 ** 2
-    elif to_units == 'km**2':
-        return A * 0.0003048 ** 2
-    elif to_units == 'sm**2':
-        return A / 5280. ** 2
-    elif to_units == 'nm**2':
-        return A * (0.3048 / 1852) ** 2
-    else:
-        raise ValueError('from_units must be "ft**2" or "in**2" or "m**2" or '
-                         '"km**2" or "sm**2" (square statute miles) or '
-                         '"nm**2" (square nautical miles).')
+    return _convert(A, 'area', from_units, to_units)
 
 
 def density_conv(D, from_units, to_units):
     """
     Convert density values between kg/m**3, slug/ft**3 and lb/ft**3.
 
-    The incoming value is first converted to kg/m**3, then it is converted
-    to desired return value.
 
     There are no default units. Both the from_units and the to_units must
     be specified.
@@ -151,51 +414,16 @@ def density_conv(D, from_units, to_units):
 
     """
 
-    if from_units == 'kg/m**3':
-        pass
-    elif from_units == 'slug/ft**3':
-        D *= 515.37882
-    elif from_units == 'lb/ft**3':
-        D *= 16.018463
-    else:
-        raise ValueError('from_units must be one of: '
-                         '"kg/m**3", "slug/ft**3" and "lb/ft**3".')
-
-    if to_units == 'kg/m**3':
-        return D
-    elif to_units == 'slug/ft**3':
-        return D / 515.37882
-    elif to_units == 'lb/ft**3':
-        return D / 16.018463
-    else:
-        raise ValueError(
-            'to_units must be one of "kg/m**3", "slug/ft**3" and "lb/ft**3".')
+    return _convert(D, 'density', from_units, to_units)
 
 
 def force_conv(F, from_units=default_weight_units,
                to_units=default_weight_units):
     """
     Convert force values between lb force and N.
-
-    The incoming value is first converted to N, then it is converted to the
-    desired return value.
     """
 
-    if from_units == 'N':
-        pass
-    elif from_units == 'lb':
-        F *= 4.4482216
-    else:
-        raise ValueError('from_units must be one of "lb" or "N".')
-
-    if to_units == 'N':
-        pass
-    elif to_units == 'lb':
-        F /= 4.4482216
-    else:
-        raise ValueError('to_units must be one of "lb" or "N".')
-
-    return F
+    return _convert(F, 'force', from_units, to_units)
 
 
 def length_conv(L, from_units=default_length_units,
@@ -203,8 +431,6 @@ def length_conv(L, from_units=default_length_units,
     """
     Convert length values between ft, in, mm, cm, m, km, sm and nm.
 
-    The incoming value is first converted to ft, then it is converted to
-    desired return value.
 
     The units default to those specified in default_units.py
 
@@ -222,49 +448,10 @@ def length_conv(L, from_units=default_length_units,
 
     Convert 1000 metres to kilometres:
     >>> length_conv(1000, from_units = 'm', to_units = 'km')
-    0.99999999999999989
+    1.0
     """
 
-    if from_units == 'ft':
-        pass
-    elif from_units == 'mm':
-        L /= 304.8
-    elif from_units == 'cm':
-        L /= 30.48
-    elif from_units == 'm':
-        L /= 0.3048
-    elif from_units == 'km':
-        L /= 0.0003048
-    elif from_units == 'sm':
-        L *= 5280.
-    elif from_units == 'nm':
-        L *= 1852 / 0.3048
-    elif from_units == 'in':
-        L /= 12.
-    else:
-        raise ValueError('from_units must be "ft", "in", "mm", "cm", "m", "km"'
-                         ', "sm" (statute miles) or "nm" (nautical miles).')
-
-    if to_units == 'ft':
-        return L
-    elif to_units == 'mm':
-        return L * 304.8
-    elif to_units == 'cm':
-        return L * 30.48
-    elif to_units == 'm':
-        return L * 0.3048
-    elif to_units == 'km':
-        return L * 0.0003048
-    elif to_units == 'sm':
-        return L / 5280.
-    elif to_units == 'nm':
-        return (L * 0.3048) / 1852
-    elif to_units == 'in':
-        return L * 12.
-    else:
-        raise ValueError(
-            'to_units must be "ft", "in", "mm", "cm", "m", "km", "sm" '
-            '(statute miles) or "nm" (nautical miles).')
+    return _convert(L, 'length', from_units, to_units)
 
 
 def power_conv(P, from_units=default_power_units,
@@ -273,49 +460,11 @@ def power_conv(P, from_units=default_power_units,
     Convert power values between horsepower, ft-lb/mn,  ft-lb/s, watts,
     kilowatts, BTU/hr and BTU/mn.
 
-    The incoming value is first converted to hp, then it is converted to the
-    desired return value.
     The units default to those specified in default_units.py
 
     """
 
-    if from_units == 'hp':
-        pass
-    elif from_units == 'ft-lb/mn':
-        P /= 33000.
-    elif from_units == 'ft-lb/s':
-        P /= 550.
-    elif from_units == 'W':
-        P /= 745.69987
-    elif from_units == 'kW':
-        P /= 0.74569987
-    # elif from_units == 'BTU/hr':
-    #     P /= 2544.4332
-    # elif from_units == 'BTU/mn':
-    #     P /= 42.407227
-    else:
-        raise ValueError(
-            'from_units must be "hp", "ft-lb/mn", "ft-lb/s", "W" (watts), '
-            '"kW" (kilowatts), "BTU/hr", or "BTU/mn".')
-
-    if to_units == 'hp':
-        return P
-    elif to_units == 'ft-lb/mn':
-        return P * 33000.
-    elif to_units == 'ft-lb/s':
-        return P * 550.
-    elif to_units == 'W':
-        return P * 745.69987
-    elif to_units == 'kW':
-        return P * 0.74569987
-    # elif to_units == 'BTU/hr':
-    #     return P * 2544.4332
-    # elif to_units == 'BTU/mn':
-    #     return P * 42.407227
-    else:
-        raise ValueError(
-            'to_units must be "hp", "ft-lb/mn", "ft-lb/s", "W" (watts), '
-            '"kW" (kilowatts), "BTU/hr", or "BTU/mn".')
+    return _convert(P, 'power', from_units, to_units)
 
 
 def press_conv(P, from_units=default_press_units,
@@ -325,11 +474,8 @@ def press_conv(P, from_units=default_press_units,
     pa, hpa, mb, inches of water and cm of water (using water density at
     20 deg C).
 
-    The incoming value is first converted to Pa, then it is converted to
-    desired return value.
     The units default to those specified in default_units.py
 
-
     Examples:
 
     Convert 1013.25 hpa to default pressure units:
@@ -345,47 +491,7 @@ def press_conv(P, from_units=default_press_units,
     14.695973160069311
     """
 
-    if from_units == 'in HG':
-        P *= 3386.38  # from NASA Reference Publication 1046 Appendix A28
-    elif from_units == 'mm HG':
-        P *= 133.322  # derived from NASA Reference Publication 1046 value of pa to in Hg
-    elif from_units == 'psi':
-        P *= 6894.752  # from NASA Reference Publication 1046 Appendix A27
-    elif from_units == 'psf' or from_units == 'lb/ft**2':
-        P *= 47.88026  # from NASA Reference Publication 1046 Appendix A27
-    elif from_units == 'hpa' or from_units == 'mb':
-        P *= 100.
-    elif from_units == 'pa':
-        pass
-    elif from_units == 'in H2O':
-        P *= 248.648  # (using water density at 20 deg C)
-    elif from_units == 'cm H2O':
-        P *= 248.648 / 2.54  # (using water density at 20 deg C)
-    else:
-        raise ValueError('from_units must be "in HG", "mm HG", "psi", '
-                         '"psf" (lb per sq. ft), "hpa", "mb", "pa", '
-                         '"in H2O" or, "cm H2O".')
-
-    if to_units == 'in HG':
-        return P / 3386.38  # from NASA Reference Publication 1046 Appendix A28
-    elif to_units == 'mm HG':
-        return P / 133.322  # derived from NASA Reference Publication 1046 value of pa to in HG
-    elif to_units == 'psi':
-        return P / 6894.752  # from NASA Reference Publication 1046 Appendix A27
-    elif to_units == 'psf' or to_units == 'lb/ft**2':
-        return P / 47.88026  # from NASA Reference Publication 1046 Appendix A27
-    elif to_units == 'hpa' or to_units == 'mb':
-        return P / 100.
-    elif to_units == 'pa':
-        return P
-    elif to_units == 'in H2O':
-        return P / 248.648  # (using water density at 20 deg C)
-    elif to_units == 'cm H2O':
-        return P / (248.648 / 2.54)  # (using water density at 20 deg C)
-    else:
-        raise ValueError(
-            'from_units must be "in HG", "mm HG", "psi", "psf" '
-            '(lb per sq. ft), "hpa", "mb", "pa", or "in H2O", or "cm H2O".')
+    return _convert(P, 'press', from_units, to_units)
 
 
 def speed_conv(S, from_units=default_speed_units,
@@ -393,11 +499,8 @@ def speed_conv(S, from_units=default_speed_units,
     """
     Convert speed values between kt, mph, km/h, m/s, ft/mn and ft/s.
 
-    The incoming value is first converted to kt, then it is converted to
-    desired return value.
     The units default to those specified in default_units.py
 
-
     Example:
 
     Convert 230 mph  to kt:
@@ -406,44 +509,7 @@ def speed_conv(S, from_units=default_speed_units,
 
     """
 
-    if from_units == 'kt':
-        pass
-    elif from_units == 'mph':
-        S *= length_conv(1, from_units='sm', to_units='nm')
-    elif from_units == 'km/h':
-        S *= length_conv(1, from_units='km', to_units='nm')
-    elif from_units == 'm/s':
-        S *= length_conv(1, from_units='m', to_units='nm') * 3600.
-    elif from_units == 'ft/s':
-        S *= length_conv(1, from_units=default_length_units, to_units='nm')\
-            * 3600.
-    elif from_units == 'ft/mn':
-        S *= length_conv(1, from_units=default_length_units, to_units='nm')\
-            * 60.
-    else:
-        raise ValueError('from_units must be one of "kt", "mph", "km/h", '
-                         '"m/s", "ft/mn" and "ft/s".')
-
-    if to_units == 'kt':
-        return S
-    elif to_units == 'mph':
-        S *= length_conv(1, from_units='nm', to_units='sm')
-        return S
-    elif to_units == 'km/h':
-        S *= length_conv(1, from_units='nm', to_units='km')
-        return S
-    elif to_units == 'm/s':
-        S *= length_conv(1, from_units='nm', to_units='m')
-        return S / 3600.
-    elif to_units == 'ft/s':
-        S *= length_conv(1, from_units='nm', to_units=default_length_units)
-        return S / 3600.
-    elif to_units == 'ft/mn':
-        S *= length_conv(1, from_units='nm', to_units=default_length_units)
-        return S / 60.
-    else:
-        raise ValueError('to_units must be one of "kt", "mph", "km/h",'
-                         ' "m/s", "ft/mn" and "ft/s".')
+    return _convert(S, 'speed', from_units, to_units)
 
 
 def temp_conv(T, from_units=default_temp_units,
@@ -454,11 +520,8 @@ def temp_conv(T, from_units=default_temp_units,
     This function should not be used for relative temperature conversions,
     i.e. temperature differences.
 
-    The incoming value is first converted to deg K, then it is converted to
-    desired return value.
     The units default to those specified in default_units.py
 
-
     Examples:
 
     Convert 32 deg F to deg C, with deg C as the default units:
@@ -474,27 +537,7 @@ def temp_conv(T, from_units=default_temp_units,
     288.14999999999998
     """
 
-    if from_units == 'C':
-        T += 273.15
-    elif from_units == 'F':
-        T = ((T - 32) * 5.) / 9. + 273.15
-    elif from_units == 'K':
-        pass
-    elif from_units == 'R':
-        T *= 5. / 9.
-    else:
-        raise ValueError('from_units must be one of "C", "F", "K" or "R".')
-
-    if to_units == 'C':
-        return T - 273.15
-    elif to_units == 'F':
-        return (T - 273.15) * 1.8 + 32
-    elif to_units == 'K':
-        return T
-    elif to_units == 'R':
-        return T * 1.8
-    else:
-        raise ValueError('to_units must be one of "C", "F", "K" or "R".')
+    return _convert(T, 'temp', from_units, to_units)
 
 
 def vol_conv(V, from_units=default_vol_units,
@@ -503,10 +546,6 @@ def vol_conv(V, from_units=default_vol_units,
     Convert volume values between USG, ImpGal (Imperial gallons), l (litres),
     ft**3, in**3, m**3, km**3, sm**3 and nm**3.
 
-    The incoming value is first converted to ft**3, then it is converted to
-    desired return value.
-
-
     The units default to those specified in default_units.py
 
     Examples:
@@ -526,53 +565,7 @@ def vol_conv(V, from_units=default_vol_units,
     37.854117840125852
     """
 
-    if from_units == 'ft**3':
-        pass
-    elif from_units == 'in**3':
-        V /= 12. ** 3
-    elif from_units == 'm**3':
-        V /= 0.3048 ** 3
-    elif from_units == 'km**3':
-        V /= 0.0003048 ** 3
-    elif from_units == 'sm**3':
-        V *= 5280. ** 3
-    elif from_units == 'nm**3':
-        V *= (1852 / 0.3048) ** 3
-    elif from_units == 'USG':
-        V *= 0.133680555556
-    elif from_units == 'ImpGal':
-        V *= 0.160543653236
-    elif from_units == 'l':
-        V /= 3.048 ** 3
-    else:
-        raise ValueError(
-            'from_units must be "ft**3", "in**3", "USG", "ImpGal", "l", '
-            '"m**3", "km**3", "sm**3" (cubic statute miles) or '
-            '"nm**3" (cubic nautical miles).')
-
-    if to_units == 'ft**3':
-        return V
-    elif to_units == 'in**3':
-        return V * 12. ** 3
-    elif to_units == 'm**3':
-        return V * 0.3048 ** 3
-    elif to_units == 'km**3':
-        return V * 0.0003048 ** 3
-    elif to_units == 'sm**3':
-        return V / 5280. ** 3
-    elif to_units == 'nm**3':
-        return V * (0.3048 / 1852) ** 3
-    elif to_units == 'USG':
-        return V / 0.133680555556
-    elif to_units == 'ImpGal':
-        return V / 0.160543653236
-    elif to_units == 'l':
-        return V * 3.048 ** 3
-    else:
-        raise ValueError(
-            'to_units must be "ft**3", "in**3", "USG", "ImpGal", "l", '
-            '"m**3", "km**3", "sm**3" (cubic statute miles) or '
-            '"nm**3" (cubic nautical miles).')
+    return _convert(V, 'vol', from_units, to_units)
 
 
 def wt_conv(W, from_units=default_weight_units,
@@ -588,28 +581,11 @@ def mass_conv(M, from_units=default_weight_units,
     """
     Convert mass values between lb and kg.
 
-    The incoming value is first converted to kg, then it is converted to the
-    desired return value.
-
     The units default to those specified in default_units.py
 
     """
 
-    if from_units == 'kg':
-        pass
-    elif from_units == 'lb':
-        M *= 0.45359237
-    else:
-        raise ValueError('from_units must be one of "lb" or "kg".')
-
-    if to_units == 'kg':
-        pass
-    elif to_units == 'lb':
-        M *= 2.204622622
-    else:
-        raise ValueError('to_units must be one of "lb" or "kg".')
-
-    return M
+    return _convert(M, 'mass', from_units, to_units)
 
 
 def avgas_conv(
@@ -675,6 +651,9 @@ def avgas_conv(
     The temperature defaults to 15 deg C if it is not specified.
     """
 
+    from_units = resolve_units(from_units)
+    to_units = resolve_units(to_units)
+
     # nominal density at 15 deg C from Canada Flight Supplement
     lb_per_USG_15_nom = 6.01
 
@@ -708,13 +687,14 @@ def avgas_conv(
     if from_units == 'lb':
         pass
     elif from_units == 'USG':
-        AG *= lb_per_USG
+        AG = AG * lb_per_USG
     elif from_units == 'ImpGal':
-        AG *= vol_conv(lb_per_USG, from_units='ImpGal', to_units='USG')
+        AG = AG * vol_conv(lb_per_USG, from_units='ImpGal',
+                           to_units='USG')
     elif from_units == 'kg':
-        AG = wt_conv(AG, from_units='kg')
+        AG = wt_conv(AG, from_units='kg', to_units='lb')
     elif from_units == 'l':
-        AG *= vol_conv(lb_per_USG, from_units='l', to_units='USG')
+        AG = AG * vol_conv(lb_per_USG, from_units='l', to_units='USG')
     else:
         raise ValueError(
             'from_units must be one of "lb", "USG", "ImpGal", "l", or "kg".')
@@ -722,13 +702,14 @@ def avgas_conv(
     if to_units == 'lb':
         pass
     elif to_units == 'USG':
-        AG /= lb_per_USG
+        AG = AG / lb_per_USG
     elif to_units == 'ImpGal':
-        AG /= vol_conv(lb_per_USG, from_units='ImpGal', to_units='USG')
+        AG = AG / vol_conv(lb_per_USG, from_units='ImpGal',
+                           to_units='USG')
     elif to_units == 'kg':
-        AG = wt_conv(AG, to_units='kg')
+        AG = wt_conv(AG, from_units='lb', to_units='kg')
     elif to_units == 'l':
-        AG /= vol_conv(lb_per_USG, from_units='l', to_units='USG')
+        AG = AG / vol_conv(lb_per_USG, from_units='l', to_units='USG')
     else:
         raise ValueError(
             'from_units must be one of "lb", "USG", "ImpGal", "l", or "kg".')
@@ -739,57 +720,13 @@ def avgas_conv(
 def dynamic_viscosity_conv(u, from_units=default_dynamic_viscosity_units,
                            to_units=default_dynamic_viscosity_units):
 
-    if from_units == 'Pa s':
-        pass
-    elif from_units == 'N s/m**2':
-        pass
-    elif from_units == 'poise':
-        u /= 10.
-    elif from_units == 'centipoise':
-        u /= 1000.
-    else:
-        raise ValueError(
-            'Units must be one of"Pa s", "N s/m**2", "poise" or "centipoise".')
-
-    if to_units == 'Pa s':
-        pass
-    elif to_units == 'N s/m**2':
-        pass
-    elif to_units == 'poise':
-        u *= 10.
-    elif to_units == 'centipoise':
-        u *= 1000.
-    else:
-        raise ValueError(
-            'Units must be one of"Pa s", "N s/m**2", "poise" or "centipoise".')
-
-    return u
+    return _convert(u, 'dynamic_viscosity', from_units, to_units)
 
 
 def kinematic_viscosity_conv(v, from_units=default_kinematic_viscosity_units,
                              to_units=default_kinematic_viscosity_units):
 
-    if from_units == 'm**2/s':
-        pass
-    elif from_units == 'stokes':
-        v /= 10000.
-    elif from_units == 'centistokes':
-        v /= 1000000.
-    else:
-        raise ValueError(
-            'Units must be one of "m**2/s", "stokes" or "centistokes".')
-
-    if to_units == 'm**2/s':
-        pass
-    elif to_units == 'stokes':
-        v *= 10000.
-    elif to_units == 'centistokes':
-        v *= 1000000.
-    else:
-        raise ValueError(
-            'Units must be one of "m**2/s", "stokes" or "centistokes".')
-
-    return v
+    return _convert(v, 'kinematic_viscosity', from_units, to_units)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Benchmark the import time of the aerocalc package.
+Run this script directly, e.g. 'python test/bench_import.py'.
+"""
+
+from test_import import import_times
+
+
+def main():
+    print('%-30s %14s %14s' % ('statement', 'aerocalc (us)', 'total (us)'))
+    for statement in ('import aerocalc', 'import aerocalc.airspeed',
+                      'import aerocalc.std_atm'):
+
+        # the best of five fresh interpreters, for the self time of the
+        # aerocalc modules and the cumulative time of everything imported
+
+        results = []
+        for i in range(5):
+            times = import_times(statement)
+            results.append((sum(t[0] for (name, t) in times.items()
+                                if name.startswith('aerocalc')),
+                            sum(t[0] for t in times.values())))
+        (own, total) = min(results)
+        print('%-30s %14d %14d' % (statement, own, total))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Benchmark the exact and table modes of the std_atm module, and the
+saturation pressure for scalar and array dew points.
+Run this script directly, e.g. 'python test/bench_std_atm.py'.
+"""
+
+import timeit
+
+import numpy as np
+
+import aerocalc.std_atm as SA
+
+
+def bench(function, H, number):
+    """ Return the time per call in seconds, in exact and table modes.
+    """
+
+    times = []
+    for mode in ('exact', 'table'):
+        SA.set_mode(mode)
+        times.append(min(timeit.repeat(lambda: function(H, alt_units='km'),
+                                       number=number, repeat=5)) / number)
+    SA.set_mode('exact')
+
+    return times
+
+
+def main():
+    H_array = np.random.RandomState(0).uniform(0, 84.852, 1000000)
+
+    print('%-20s %12s %12s %12s %8s' % ('function', 'samples', 'exact (s)',
+                                        'table (s)', 'speedup'))
+    for function in (SA.alt2temp, SA.alt2press, SA.alt2density):
+        for (H, number) in ((5., 10000), (H_array, 5)):
+            (exact, table) = bench(function, H, number)
+            print('%-20s %12d %12.3g %12.3g %8.1f' % (
+                function.__name__, np.size(H), exact, table, exact / table))
+
+    SA.set_mode('table')
+    table = SA.alt2press(H_array, alt_units='km')
+    SA.set_mode('exact')
+    exact = SA.alt2press(H_array, alt_units='km')
+    print()
+    print('max relative error in pressure: %.3g'
+          % np.max(np.abs(table / exact - 1)))
+
+    # saturation pressure, per dew point, for scalars computed one at a time,
+    # scalars from the memo, and one array of dew points quantized to
+    # 0.1 deg C
+
+    DP = np.round(np.random.RandomState(0).uniform(-40, 30, 100000), 1)
+    DP_list = DP[:10000].tolist()
+    print()
+    print('%-20s %12s %12s' % ('sat_press', 'samples', 'per sample (s)'))
+    for memo in ('exact', 'memo'):
+        SA.set_sat_press_memo(memo == 'memo')
+        time = min(timeit.repeat(lambda: [SA._sat_press(T) for T in DP_list],
+                                 number=5, repeat=5)) / 5
+        print('%-20s %12d %12.3g' % ('scalar, ' + memo, len(DP_list),
+                                     time / len(DP_list)))
+    SA.set_sat_press_memo(False)
+    time = min(timeit.repeat(lambda: SA._sat_press(DP), number=20,
+                             repeat=5)) / 20
+    print('%-20s %12d %12.3g' % ('array', len(DP), time / len(DP)))
+
+
+if __name__ == '__main__':
+    main()
@@ -9,7 +9,10 @@ Run this script directly to do all the tests.
 import unittest
 import sys
 
+import numpy as np
+
 import aerocalc.airspeed as A
+import aerocalc.std_atm as SA
 
 # These tests assume that default_units.py contains the following defaults:
 # default_area_units = 'ft**2'
@@ -333,6 +336,117 @@ class Test_dp2cas(unittest.TestCase):
         Truth = 1000
         self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_17(self):
+
+        # array spanning the subsonic and supersonic cases
+        # truth values from NASA RP 1046
+
+        Value = A.dp2cas(np.array([34.0493, 5201.59, 249053 / 47.880259]),
+                         press_units='psf')
+        Truth = np.array([100, 1000, 1000])
+        np.testing.assert_allclose(Value, Truth, rtol=1e-5)
+
+    def test_18(self):
+
+        # round trip well beyond the upper limit of the former bisection
+        # solution (approximately 6,600 kt)
+
+        cas = np.array([661.5, 700., 1500., 10000.])
+        Value = [A.dp2cas(A.cas2dp(c)) for c in cas]
+        np.testing.assert_allclose(Value, cas, rtol=1e-12)
+
+
+class Test_dp2eas(unittest.TestCase):
+
+    def test_01(self):
+
+        # EAS is TAS times the square root of the density ratio, for an
+        # array spanning the subsonic and supersonic cases
+
+        dp = np.array([2., 10., 20., 40.])
+        DR = SA.alt_temp2density_ratio(30000, -40)
+        Value = A.dp2eas(dp, 30000)
+        Truth = A.dp2tas(dp, 30000, -40) * np.sqrt(DR)
+        np.testing.assert_allclose(Value, Truth, rtol=1e-12)
+
+    def test_02(self):
+
+        # round trip across mach 1
+
+        eas = np.array([200., 400., 450., 800., 2000.])
+        Value = A.dp2eas(A.eas2dp(eas, 40000, press_units='pa'), 40000,
+                         press_units='pa')
+        np.testing.assert_allclose(Value, eas, rtol=1e-12)
+
+    def test_03(self):
+
+        # supersonic CAS to EAS and TAS agree with air_data (which finds
+        # the TAS from the speed of sound, see Test_dp2tas.test_01)
+
+        data = A.air_data(np.array([10., 25., 40.]), 8, -50, 1.)
+        np.testing.assert_allclose(
+            A.cas2eas(data['cas'], data['press_alt']), data['eas'],
+            rtol=1e-9)
+        np.testing.assert_allclose(
+            A.cas2tas(data['cas'], data['press_alt'], data['temp']),
+            data['tas'], rtol=1e-6)
+        np.testing.assert_allclose(
+            A.tas2eas(data['tas'], data['press_alt'], data['temp']),
+            data['eas'], rtol=1e-6)
+
+
+class Test_dp2tas(unittest.TestCase):
+
+    def test_01(self):
+
+        # agrees with the mach number relations, subsonic and supersonic.
+        # The tolerance allows for the speed of sound implied by the rounded
+        # sea level density (Rho0), which differs from mach2tas's by 3.4e-7.
+
+        M = np.array([0.5, 0.99, 1., 1.01, 2., 3.])
+        P = SA.alt2press(30000, press_units='pa')
+        Value = A.dp2tas(P * A.mach2dp_over_p(M), 30000, -40,
+                         press_units='pa')
+        Truth = A.mach2tas(M, -40)
+        np.testing.assert_allclose(Value, Truth, rtol=1e-6)
+
+    def test_02(self):
+
+        # the inverse, tas2dp
+
+        M = np.array([0.5, 0.99, 1.01, 2., 3.])
+        P = SA.alt2press(30000, press_units='pa')
+        Value = A.tas2dp(A.mach2tas(M, -40), 30000, -40, press_units='pa')
+        Truth = P * A.mach2dp_over_p(M)
+        np.testing.assert_allclose(Value, Truth, rtol=2e-6)
+
+    def test_03(self):
+
+        # round trip, with the altitude and temperature arrays broadcast
+
+        tas = np.array([[300.], [900.]])
+        alt = np.array([0., 20000., 50000.])
+        Value = A.dp2tas(A.tas2dp(tas, alt, 15), alt, 15)
+        np.testing.assert_allclose(Value, np.broadcast_to(tas, (2, 3)),
+                                   rtol=1e-12)
+
+    def test_04(self):
+
+        # an ISA-15 Atmosphere gives the same results as the temperature at
+        # the pressure altitude, both ways
+
+        atm = SA.Atmosphere.from_isa_dev(-15)
+        alt = np.array([0., 20000., 35000.])
+        temp = SA.alt2temp(alt) - 15
+        dp = A.tas2dp([150, 300, 450], alt, atm)
+        np.testing.assert_allclose(dp, A.tas2dp([150, 300, 450], alt, temp),
+                                   rtol=1e-6)
+        np.testing.assert_allclose(A.dp2tas(dp, alt, atm), [150, 300, 450],
+                                   rtol=1e-12)
+        self.assertAlmostEqual(A.dp2tas(0.5, 10000, atm),
+                               A.dp2tas(0.5, 10000, SA.alt2temp(10000) - 15),
+                               delta=1e-4)
+
 
 class Test_cas2tas(unittest.TestCase):
 
@@ -354,6 +468,37 @@ class Test_cas2tas(unittest.TestCase):
         Truth = 586.266
         self.assertLessEqual(RE(Value, Truth), 3e-5)
 
+    def test_03(self):
+
+        # arrays of speed, altitude and temperature
+        # truth values from NASA RP 1046 + correction for non-standard temp
+
+        Value = A.cas2tas(np.array([400, 400]), np.array([30000, 30000]),
+                          np.array([-70, -70]), temp_units='F')
+        Truth = np.array([586.266, 586.266])
+        np.testing.assert_allclose(Value, Truth, rtol=3e-5)
+
+    def test_04(self):
+
+        # array of speeds at a single altitude, std temp, matches the scalar
+        # conversions
+
+        cas = np.array([100, 250, 400])
+        Value = A.cas2tas(cas, 30000)
+        Truth = [A.cas2tas(c, 30000) for c in cas]
+        np.testing.assert_allclose(Value, Truth, rtol=1e-14)
+
+    def test_05(self):
+
+        # an ISA+10 Atmosphere gives the same TAS as the temperature at the
+        # pressure altitude
+
+        atm = SA.Atmosphere.from_isa_dev(10)
+        Value = A.cas2tas(np.array([150, 400]), np.array([5000, 30000]), atm)
+        Truth = A.cas2tas(np.array([150, 400]), np.array([5000, 30000]),
+                          SA.alt2temp(np.array([5000, 30000])) + 10)
+        np.testing.assert_allclose(Value, Truth, rtol=1e-6)
+
 
 class Test_tas2cas(unittest.TestCase):
 
@@ -375,6 +520,17 @@ class Test_tas2cas(unittest.TestCase):
         Truth = 400
         self.assertLessEqual(RE(Value, Truth), 3e-5)
 
+    def test_03(self):
+
+        # aligned arrays of speed, altitude and temperature
+        # truth values from NASA RP 1046
+
+        Value = A.tas2cas(np.array([602.6, 586.266]), np.array([30000, 30000]),
+                          np.array([SA.alt2temp(30000, temp_units='F'), -70]),
+                          temp_units='F')
+        Truth = np.array([400, 400])
+        np.testing.assert_allclose(Value, Truth, rtol=3e-5)
+
 
 class Test_mach2dp_over_p(unittest.TestCase):
 
@@ -426,6 +582,14 @@ class Test_mach2dp_over_p(unittest.TestCase):
         Truth = 31.65347
         self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_05(self):
+
+        # truth values from NASA RP 1046
+
+        Value = A.mach2dp_over_p(np.array([1, 1.001, 5]))
+        Truth = np.array([.89293, .89514, 31.65347])
+        np.testing.assert_allclose(Value, Truth, rtol=1e-5)
+
 
 class Test_dp_over_p2mach(unittest.TestCase):
 
@@ -484,6 +648,24 @@ class Test_dp_over_p2mach(unittest.TestCase):
         Truth = 5
         self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_06(self):
+
+        # truth values from NASA RP 1046
+
+        Value = A.dp_over_p2mach(np.array([.52434, .89072, .89514,
+                                           31.65347]))
+        Truth = np.array([.8, .999, 1.001, 5])
+        np.testing.assert_allclose(Value, Truth, rtol=1e-5)
+
+    def test_07(self):
+
+        # round trip, including mach numbers beyond the upper limit of the
+        # former bisection solution (mach 10)
+
+        mach = np.array([0.1, 0.99, 1., 1.0001, 1.5, 3., 10., 25.])
+        Value = A.dp_over_p2mach(A.mach2dp_over_p(mach))
+        np.testing.assert_allclose(Value, mach, rtol=1e-12)
+
 
 class Test_tas2mach(unittest.TestCase):
 
@@ -533,6 +715,17 @@ class Test_tas2mach(unittest.TestCase):
         Truth = 1
         self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_05(self):
+
+        # Mach 1 at sea level, 10,000 ft and 10,000 m
+        # truth values from NASA RP 1046, converted to kt
+
+        Value = A.tas2mach(np.array([661.48, 734.58 / 1.1507794,
+                                     1078.07 / 1.852]),
+                           altitude=np.array([0, 10000, 32808.4]))
+        Truth = np.ones(3)
+        np.testing.assert_allclose(Value, Truth, rtol=1e-4)
+
 
 class Test_mach2tas(unittest.TestCase):
 
@@ -569,6 +762,61 @@ class Test_mach2tas(unittest.TestCase):
         Truth = 734.58
         self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_04(self):
+
+        # array of mach and temperature
+
+        Value = A.mach2tas(np.array([1, .5]), np.array([15, 59]),
+                           temp_units='F')
+        Truth = np.array([A.mach2tas(1, 15, temp_units='F'),
+                          A.mach2tas(.5, 59, temp_units='F')])
+        np.testing.assert_allclose(Value, Truth, rtol=1e-14)
+
+    def test_05(self):
+
+        # an Atmosphere in place of the temperature
+
+        atm = SA.Atmosphere.from_isa_dev(-20)
+        Value = A.mach2tas(0.8, atm, 30000)
+        Truth = A.mach2tas(0.8, SA.alt2temp(30000) - 20)
+        self.assertLessEqual(RE(Value, Truth), 1e-6)
+
+
+class Test_air_data(unittest.TestCase):
+
+    def test_01(self):
+
+        # subsonic, compared with the individual conversions
+
+        Value = A.air_data(5, 20, 0, 0.95)
+        alt = SA.press2alt(20)
+        mach = A.dp_over_p2mach(5 / 20.)
+        temp = A.mach2temp(mach, 0, 0.95)
+        self.assertLessEqual(RE(Value['cas'], A.dp2cas(5)), 1e-12)
+        self.assertLessEqual(RE(Value['eas'], A.dp2eas(5, alt)), 1e-12)
+        self.assertLessEqual(RE(Value['tas'], A.dp2tas(5, alt, temp)), 1e-6)
+        self.assertLessEqual(RE(Value['mach'], mach), 1e-12)
+        self.assertLessEqual(RE(Value['press_alt'], alt), 1e-12)
+        self.assertLessEqual(RE(Value['temp'], temp), 1e-12)
+        self.assertLessEqual(RE(Value['density'],
+                                SA.alt_temp2density_ratio(alt, temp)
+                                * SA.Rho0 / 16.018463), 1e-6)
+
+    def test_02(self):
+
+        # arrays spanning the subsonic and supersonic cases
+
+        dp = np.array([5, 30])
+        Ps = np.array([20, 10])
+        Value = A.air_data(dp, Ps, np.array([0, 50]), 0.95)
+        self.assertEqual(Value.shape, (2, ))
+        np.testing.assert_allclose(Value['cas'], A.dp2cas(dp), rtol=1e-12)
+        np.testing.assert_allclose(Value['mach'], A.dp_over_p2mach(dp / Ps),
+                                   rtol=1e-12)
+        np.testing.assert_allclose(Value['tas'],
+                                   A.mach2tas(Value['mach'], Value['temp']),
+                                   rtol=1e-12)
+
 
 class Test_mach2temp(unittest.TestCase):
 
@@ -618,6 +866,45 @@ class Test_tas2temp(unittest.TestCase):
         # print(Value, Truth)
         self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_04(self):
+
+        # arrays of TAS and recovery factor
+
+        Value = A.tas2temp(np.array([300, 300]), 15, np.array([0, .8]))
+        Truth = [A.tas2temp(300, 15, 0), A.tas2temp(300, 15, .8)]
+        np.testing.assert_allclose(Value, Truth, rtol=1e-14)
+
+
+class Test_ioat2tas(unittest.TestCase):
+
+    def test_01(self):
+
+        # agrees with iterating cas2tas and mach2temp to convergence, to
+        # within the rounding of the sea level density (1.225 kg/m**3) used
+        # by cas2tas
+
+        temp = 0
+        for i in range(20):
+            tas = A.cas2tas(250, 10000, temp)
+            temp = A.mach2temp(A.tas2mach(tas, temp), 0, 0.95)
+        Value = A.ioat2tas(0, 250, 10000, 0.95)
+        self.assertLessEqual(RE(Value, tas), 1e-6)
+
+    def test_02(self):
+
+        # arrays of temperature, CAS, altitude and recovery factor, subsonic
+        # and supersonic, agree with air_data
+
+        ioat = np.array([0., 10., -20., 50.])
+        cas = np.array([250., 400., 600., 800.])
+        alt = np.array([10000., 30000., 40000., 50000.])
+        recovery_factor = np.array([0.95, 1., 0.9, 1.])
+        Value = A.ioat2tas(ioat, cas, alt, recovery_factor)
+        Truth = A.air_data(A.cas2dp(cas), SA.alt2press(alt), ioat,
+                           recovery_factor)['tas']
+        np.testing.assert_allclose(Value, Truth, rtol=1e-12)
+        self.assertTrue(Value[-1] > 661.48)
+
 
 # create test suites
 
@@ -636,6 +923,9 @@ suite9 = unittest.makeSuite(Test_tas2mach)
 suite10 = unittest.makeSuite(Test_mach2tas)
 suite11 = unittest.makeSuite(Test_mach2temp)
 suite12 = unittest.makeSuite(Test_tas2temp)
+suite13 = unittest.makeSuite(Test_ioat2tas)
+suite14 = unittest.makeSuite(Test_dp2eas)
+suite15 = unittest.makeSuite(Test_dp2tas)
 
 # add test suites to main test suite, so all test results are in one block
 
@@ -653,6 +943,9 @@ main_suite.addTest(suite9)
 main_suite.addTest(suite10)
 main_suite.addTest(suite11)
 main_suite.addTest(suite12)
+main_suite.addTest(suite13)
+main_suite.addTest(suite14)
+main_suite.addTest(suite15)
 
 # run main test suite
 # if we run the main test suite, we get a line for each test, plus any
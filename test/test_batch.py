@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Test cases for batch module.
+Run this script directly to do all the tests.
+"""
+
+import io
+import unittest
+
+import numpy as np
+
+import aerocalc.airspeed as A
+from aerocalc import batch
+
+# These tests assume the defaults in default_units.py, as in test_airspeed.
+
+
+def run(function, text, **kwargs):
+    """
+    Return the lines written by batch.convert for the input text.
+    """
+
+    out = io.StringIO()
+    batch.convert(function, io.StringIO(text), out, **kwargs)
+    return out.getvalue().splitlines()
+
+
+def column(lines, index, delimiter=','):
+    """
+    Return a column of the data lines, after the header, as an array.
+    """
+
+    return np.array([float(line.split(delimiter)[index])
+                     for line in lines[1:]])
+
+
+class Test_convert(unittest.TestCase):
+
+    def test_01(self):
+
+        # inputs are found by name, other columns are passed through, and
+        # the results agree with the function
+
+        lines = run('cas2tas', u'time,cas[kt],alt[ft],note\n'
+                               u'0.0,100,0,a\n'
+                               u'0.1,250,10000,b\n'
+                               u'0.2,400,30000,c\n')
+        self.assertEqual(lines[0], 'time,cas[kt],alt[ft],note,tas[kt]')
+        self.assertEqual([line.rsplit(',', 1)[0] for line in lines[1:]],
+                         ['0.0,100,0,a', '0.1,250,10000,b', '0.2,400,30000,c'])
+        np.testing.assert_allclose(
+            column(lines, 4),
+            A.cas2tas([100, 250, 400], [0, 10000, 30000]), rtol=1e-11)
+
+    def test_02(self):
+
+        # the units of the columns and results, and values given for
+        # arguments that have no column
+
+        lines = run('ioat2tas', u'cas[km/h]\talt[m]\tioat[F]\n'
+                                u'500\t3000\t14\n'
+                                u'1300\t10000\t-40\n',
+                    values={'recovery_factor': 0.98}, units={'speed': 'm/s'})
+        self.assertEqual(lines[0].split('\t')[-1], 'tas[m/s]')
+        np.testing.assert_allclose(
+            column(lines, 3, '\t'),
+            A.ioat2tas([14, -40], [500, 1300], [3000, 10000], 0.98,
+                       temp_units='F', speed_units='km/h', alt_units='m')
+            / 3.6, rtol=1e-11)
+
+    def test_03(self):
+
+        # inputs are converted to the units selected, and a chunk
+        # size smaller than the file gives the same results
+
+        text = u'tas[kt],temp[K]\n' + u''.join(
+            u'%d,%d\n' % (tas, temp) for (tas, temp) in
+            zip(range(100, 600, 50), range(220, 320, 10)))
+        lines = run('tas2mach', text, values={'altitude': (1, 'km')},
+                    units={'temp': 'C'}, chunk_size=3)
+        self.assertEqual(lines[0], 'tas[kt],temp[K],mach')
+        self.assertEqual(lines, run('tas2mach', text,
+                                    values={'altitude': (1000, 'm')},
+                                    units={'temp': 'F'}))
+        np.testing.assert_allclose(
+            column(lines, 2),
+            A.tas2mach(np.arange(100, 600, 50), np.arange(220, 320, 10),
+                       temp_units='K'), rtol=1e-11)
+
+    def test_04(self):
+
+        # air_data writes one column per field
+
+        lines = run('air_data', u'dp,Ps,ioat\n5,20,0\n',
+                    values={'recovery_factor': 0.95})
+        self.assertEqual(lines[0].split(','),
+                         ['dp', 'Ps', 'ioat', 'cas[kt]', 'eas[kt]', 'tas[kt]',
+                          'mach', 'press_alt[ft]', 'temp[C]',
+                          'density[lb/ft**3]'])
+        data = A.air_data(5, 20, 0, 0.95)
+        np.testing.assert_allclose(
+            [float(value) for value in lines[1].split(',')[3:]],
+            [data[name] for name in data.dtype.names], rtol=1e-11)
+
+    def test_05(self):
+
+        # missing arguments, unknown arguments and bad data are errors
+
+        self.assertRaises(ValueError, run, 'cas2tas', u'cas\n100\n')
+        self.assertRaises(ValueError, run, 'cas2tas', u'cas,alt\n100,0\n',
+                          values={'mach': 1})
+        self.assertRaises(ValueError, run, 'cas2tas', u'cas,alt\n100,x\n')
+        self.assertRaises(ValueError, run, 'cas2cas', u'cas,alt\n100,0\n')
+        self.assertRaises(ValueError, run, 'cas2tas', u'')
+
+    def test_06(self):
+
+        # the command line
+
+        (infile, outfile) = (io.StringIO(u'mach,temp[K]\n1,288.15\n'),
+                             io.StringIO())
+        (stdin, stdout) = (batch.sys.stdin, batch.sys.stdout)
+        (batch.sys.stdin, batch.sys.stdout) = (infile, outfile)
+        try:
+            status = batch.main(['mach2tas', '--units', 'speed=m/s',
+                                 '--format', '%.6g'])
+        finally:
+            (batch.sys.stdin, batch.sys.stdout) = (stdin, stdout)
+        self.assertEqual(status, 0)
+        self.assertEqual(outfile.getvalue(),
+                         'mach,temp[K],tas[m/s]\n1,288.15,340.294\n')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
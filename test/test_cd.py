@@ -10,6 +10,8 @@ Run this script directly to do all the tests.
 import unittest
 import sys
 
+import numpy as np
+
 from aerocalc import cd, cl
 
 
@@ -57,6 +59,27 @@ class Test_eas2drag(unittest.TestCase):
     #     Truth = 0.49889058073
     #     self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_03(self):
+
+        # a polar sweep over speed and weight is one call, and agrees with
+        # the scalar calls
+
+        (eas, weight) = (np.arange(70, 150, 10), np.array([[1400], [1650]]))
+        Value = cd.eas2drag(eas, weight, 110, 0.021295, 23**2./110, 0.851,
+                            speed_units='mph')
+        Truth = [[cd.eas2drag(v, w[0], 110, 0.021295, 23**2./110, 0.851,
+                              speed_units='mph') for v in eas]
+                 for w in weight]
+        self.assertEqual(Value.shape, (2, 8))
+        np.testing.assert_allclose(Value, Truth, rtol=1e-14)
+
+        # the same, from the lift and drag coefficients
+
+        Cl = cl.eas2cl(eas, weight, 110, speed_units='mph')
+        Cd = cd.cl2cd(Cl, 0.021295, 23**2./110, 0.851)
+        np.testing.assert_allclose(
+            cd.cd2drag(Cd, eas, 110, speed_units='mph'), Truth, rtol=1e-14)
+
 
 class Test_cas2cl(unittest.TestCase):
 
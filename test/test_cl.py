@@ -10,6 +10,8 @@ Run this script directly to do all the tests.
 import unittest
 import sys
 
+import numpy as np
+
 from aerocalc import cl
 
 
@@ -53,6 +55,17 @@ class Test_eas2cl(unittest.TestCase):
         Truth = 0.49889058073
         self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_03(self):
+
+        # arrays are broadcast, and agree with the scalar calls
+
+        (eas, weight) = ([50, 80, 115], [[1500], [1800]])
+        Value = cl.eas2cl(eas, weight, 110, load_factor=[1, 2, 1])
+        Truth = [[cl.eas2cl(v, w[0], 110, load_factor=n) for (v, n) in
+                  zip(eas, [1, 2, 1])] for w in weight]
+        self.assertEqual(Value.shape, (2, 3))
+        np.testing.assert_allclose(Value, Truth, rtol=1e-14)
+
 
 class Test_cas2cl(unittest.TestCase):
 
@@ -91,6 +104,22 @@ class Test_cas2cl(unittest.TestCase):
         Truth = 2.6721923079
         self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_03(self):
+
+        # a speed x weight x altitude grid
+
+        (cas, altitude, weight) = ([100, 200, 300], [0, 5000], [1200, 1500])
+        Value = cl.cas2cl(np.reshape(cas, (3, 1, 1)),
+                          np.reshape(altitude, (1, 1, 2)),
+                          np.reshape(weight, (1, 2, 1)), 15,
+                          speed_units='km/h', alt_units='m',
+                          weight_units='kg', area_units='m**2')
+        Truth = [[[cl.cas2cl(v, h, w, 15, speed_units='km/h', alt_units='m',
+                             weight_units='kg', area_units='m**2')
+                   for h in altitude] for w in weight] for v in cas]
+        self.assertEqual(Value.shape, (3, 2, 2))
+        np.testing.assert_allclose(Value, Truth, rtol=1e-14)
+
 
 class Test_tas2cl(unittest.TestCase):
 
@@ -243,6 +272,20 @@ class Test_cl2tas(unittest.TestCase):
         Truth = 80
         self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_03(self):
+
+        # tas2cl and cl2tas are inverses over arrays of altitude and
+        # temperature
+
+        Cl = np.array([[0.4], [0.8], [1.2]])
+        tas = cl.cl2tas(Cl, [0, 10000, 20000], 2000, 150,
+                        temperature=[25, 0, -30])
+        self.assertEqual(tas.shape, (3, 3))
+        np.testing.assert_allclose(
+            cl.tas2cl(tas, [0, 10000, 20000], 2000, 150,
+                      temperature=[25, 0, -30]), np.tile(Cl, 3), rtol=1e-12)
+
+
 class Test_cl2lift(unittest.TestCase):
 
     """All truth values hand calculated using a spreadsheet program, using a 
@@ -276,6 +319,14 @@ class Test_cl2lift(unittest.TestCase):
         Truth = 800
         self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_03(self):
+
+        Value = cl.cl2lift([0.41956654, 0.83913308], 80, 110,
+                           lift_units='lb', area_units='ft**2',
+                           speed_units='kt')
+        Truth = [1000, 2000]
+        np.testing.assert_allclose(Value, Truth, rtol=1e-5)
+
 # if we run unittest.main(), we get just a single line of output, plus any
 # tracebacks from failures.
 if __name__ == '__main__':
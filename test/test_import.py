@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Test cases for the import time of the aerocalc package.
+Run this script directly to do all the tests.
+
+Each test imports aerocalc in a fresh interpreter, with -X importtime, and
+checks which modules were imported.  test_04 checks the import time of the
+aerocalc modules against a budget, using the best of several interpreters.
+The budgets are several times the measured times, so that they only fail if
+an expensive import is added.  The import times are reported by
+test/bench_import.py.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+import aerocalc
+
+# import time budgets in microseconds, for the self time of the aerocalc
+# modules, about ten and five times the times measured on a slow machine
+
+PACKAGE_BUDGET = 2000  # import aerocalc
+AIRSPEED_BUDGET = 200000  # import aerocalc.airspeed, including std_atm
+
+
+def import_times(statement):
+    """
+    Return a dict of module name to (self, cumulative) import time in
+    microseconds, for statement run in a fresh interpreter.
+    """
+
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(aerocalc.__file__)))
+    env['PYTHONPATH'] = os.pathsep.join([root, env.get('PYTHONPATH', '')])
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stderr=subprocess.STDOUT, env=env).decode()
+
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        (self_time, cumulative, name) = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_time), int(cumulative))
+
+    return times
+
+
+def aerocalc_import_time(statement, runs=5):
+    """
+    Return the self import time of the aerocalc modules in microseconds, for
+    statement run in a fresh interpreter, as the best of several runs.
+    """
+
+    return min(sum(self_time for (name, (self_time, cumulative))
+                   in import_times(statement).items()
+                   if name.split('.')[0] == 'aerocalc')
+               for i in range(runs))
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'needs -X importtime')
+class Test_import(unittest.TestCase):
+
+    def test_01(self):
+
+        # importing the package does not import the submodules or numpy
+
+        times = import_times('import aerocalc')
+        self.assertNotIn('numpy', times)
+        self.assertEqual([name for name in times
+                          if name.startswith('aerocalc.')], [])
+
+    def test_02(self):
+
+        # the computational path does not import the interactive modules
+
+        times = import_times('import aerocalc.airspeed')
+        self.assertNotIn('aerocalc.val_input', times)
+
+    def test_03(self):
+
+        # submodules are imported on first use
+
+        times = import_times('import aerocalc; aerocalc.std_atm.alt2temp(0)')
+        self.assertIn('aerocalc.std_atm', times)
+        self.assertNotIn('aerocalc.airspeed', times)
+
+    def test_04(self):
+
+        # the import time of the aerocalc modules is within the budgets
+
+        self.assertLess(aerocalc_import_time('import aerocalc'),
+                        PACKAGE_BUDGET)
+        self.assertLess(aerocalc_import_time('import aerocalc.airspeed'),
+                        AIRSPEED_BUDGET)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Test cases for memo module.
+Run this script directly to do all the tests.
+"""
+
+import unittest
+
+import numpy as np
+
+import aerocalc.airspeed as A
+import aerocalc.std_atm as SA
+from aerocalc import memo
+from aerocalc.default_units import units
+
+
+class Test_memo(unittest.TestCase):
+
+    def setUp(self):
+        memo.clear()
+
+    def tearDown(self):
+        memo.disable()
+        memo.clear()
+
+    def test_01(self):
+
+        # disabled by default, and then nothing is counted
+
+        self.assertEqual(memo.info(), (0, 0, 0, 0))
+        Value = A.cas2tas(150, 8000, temp=10)
+        self.assertEqual(Value, A.cas2tas.__wrapped__(150, 8000, temp=10))
+        self.assertEqual(memo.info(), (0, 0, 0, 0))
+
+    def test_02(self):
+
+        # repeated calls hit, whether the arguments are positional or
+        # keyword, and agree with the function
+
+        memo.enable(maxsize=100)
+        Truth = SA.alt2press.__wrapped__(8000, alt_units='m')
+        Value = [SA.alt2press(8000, 'm'), SA.alt2press(8000, alt_units='m'),
+                 SA.alt2press(8000., alt_units='m', press_units='in HG')]
+        self.assertEqual(memo.info(), (2, 1, 100, 1))
+        np.testing.assert_allclose(Value, Truth, rtol=1e-12)
+
+        # different arguments or units miss
+
+        SA.alt2press(8000, 'ft')
+        SA.alt2press(8001, 'm')
+        self.assertEqual(memo.info().misses, 3)
+
+    def test_03(self):
+
+        # the least recently used results are discarded
+
+        memo.enable(maxsize=2)
+        for H in (0, 1000, 0, 2000, 0, 1000):
+            SA.alt2temp(H)
+        self.assertEqual(memo.info(), (2, 4, 2, 2))
+
+    def test_04(self):
+
+        # arrays and Atmosphere temperatures are not memoized
+
+        memo.enable()
+        Value = SA.alt2temp([0, 11000], alt_units='m')
+        np.testing.assert_allclose(Value, [15., -56.5])
+        atm = SA.Atmosphere.from_isa_dev(10)
+        self.assertEqual(memo.info().currsize, 0)
+
+        # (cas2tas memoizes the scalar conversions it calls)
+
+        A.cas2tas(200, 5000, temp=atm)
+        self.assertNotIn(A.cas2tas.__wrapped__,
+                         [key[0] for key in memo._memo])
+
+    def test_05(self):
+
+        # default units are those of the unit context, not of the first call
+
+        memo.enable()
+        Value = A.cas2eas(200, 20000)
+        with units(speed='km/h', alt='m'):
+            self.assertAlmostEqual(A.cas2eas(200, 20000),
+                                   A.cas2eas.__wrapped__(200, 20000), 9)
+        self.assertEqual(A.cas2eas(200, 20000), Value)
+
+    def test_06(self):
+
+        # the numeric arguments are rounded to the requested digits
+
+        memo.enable(digits=4)
+        Value = SA.alt2temp(5000.4)
+        self.assertEqual(SA.alt2temp(5000.2), Value)
+        self.assertEqual(Value, SA.alt2temp.__wrapped__(5000))
+        self.assertEqual(memo.info().hits, 1)
+
+    def test_07(self):
+
+        # clear and set_mode discard the results
+
+        memo.enable()
+        SA.alt2density(10000)
+        memo.clear()
+        self.assertEqual(memo.info(), (0, 0, 4096, 0))
+        SA.alt2density(10000)
+        SA.set_mode('table')
+        try:
+            self.assertEqual(memo.info().currsize, 0)
+        finally:
+            SA.set_mode('exact')
+        self.assertRaises(ValueError, memo.enable, 0)
+
+    def test_08(self):
+
+        # calls with NaN are evaluated but not held, so they do not push out
+        # results that can be reused
+
+        memo.enable(maxsize=2)
+        SA.alt2temp(5000)
+        for value in (float('nan'), np.float64('nan')):
+            self.assertTrue(np.isnan(SA.alt2temp(value)))
+            self.assertTrue(np.isnan(A.tas2mach(value, 15)))
+        self.assertEqual(memo.info(), (0, 1, 2, 1))
+        SA.alt2temp(5000)
+        self.assertEqual(memo.info().hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
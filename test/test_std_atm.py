@@ -16,9 +16,12 @@ Run this script directly to do all the tests.
 # Done    1. 29 Jun 2009 - Ran 2to3 tool and fixed errors
 #         2. 30 Jun 2009 - Manually fixed remaining python3.0 errors.  Works with python2.5, 2.6 and 3.0
 
+import io
 import unittest
 import sys
 
+import numpy as np
+
 import aerocalc.std_atm as SA
 
 # These tests require that default_units.py contain the following defaults:
@@ -104,7 +107,34 @@ class Test_alt2temp(unittest.TestCase):
 
         # confirm out of range error
 
-        self.assertRaises(ValueError, SA.alt2temp, 90, alt_units='km')
+        self.assertRaises(ValueError, SA.alt2temp, 900, alt_units='km')
+
+    def test_10(self):
+
+        # array input, with one altitude in each layer
+
+        H = np.array([-1, 10, 19, 25, 40, 50, 60, 80])
+        Value = SA.alt2temp(H, alt_units='km')
+        Truth = [SA.alt2temp(h, alt_units='km') for h in H]
+        self.assertEqual(Value.shape, H.shape)
+        np.testing.assert_allclose(Value, Truth, rtol=1e-12)
+
+    def test_11(self):
+
+        # layer boundaries belong to the lower layer, and the array input is
+        # not modified
+
+        H = np.array([[11000., 20000.], [32000., 47000.]])
+        Value = SA.alt2temp(H, alt_units='m', temp_units='K')
+        np.testing.assert_allclose(Value, [[216.65, 216.65],
+                                           [228.65, 270.65]], rtol=1e-12)
+        self.assertEqual(H[0, 0], 11000.)
+
+    def test_12(self):
+
+        # confirm out of range error if any element is out of range
+
+        self.assertRaises(ValueError, SA.alt2temp, [10, 900], alt_units='km')
 
 
 class Test_alt2temp_ratio(unittest.TestCase):
@@ -186,6 +216,22 @@ class Test_alt2press_ratio(unittest.TestCase):
         Truth = 5474.87 / 101325
         self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_04(self):
+
+        # list input, with altitudes spanning all layers
+
+        H = [-1000, 0, 20000, 60000, 100000, 160000, 200000, 250000]
+        Value = SA.alt2press_ratio(H)
+        Truth = [SA.alt2press_ratio(h) for h in H]
+        np.testing.assert_allclose(Value, Truth, rtol=1e-12)
+
+    def test_05(self):
+
+        # scalar input gives scalar output
+
+        Value = SA.alt2press_ratio(15, alt_units='km')
+        self.assertIsInstance(Value, float)
+
 
 class Test_alt2press(unittest.TestCase):
 
@@ -257,7 +303,16 @@ class Test_alt2press(unittest.TestCase):
 
         # confirm out of range error
 
-        self.assertRaises(ValueError, SA.alt2press, 90, alt_units='km')
+        self.assertRaises(ValueError, SA.alt2press, 900, alt_units='km')
+
+    def test_09(self):
+
+        # array input
+        # Truth values from NASA RP 1046
+
+        Value = SA.alt2press(np.array([5000, 49000]), press_units='psf')
+        Truth = np.array([24.8959 * 70.726, 254.139])
+        np.testing.assert_allclose(Value, Truth, rtol=1e-4)
 
 
 class Test_alt2density_ratio(unittest.TestCase):
@@ -283,6 +338,15 @@ class Test_alt2density_ratio(unittest.TestCase):
         Truth = .82168
         self.assertLessEqual(RE(Value, Truth), 5e-5)
 
+    def test_04(self):
+
+        # array input
+
+        H = np.linspace(0, 84, 29)
+        Value = SA.alt2density_ratio(H, alt_units='km')
+        Truth = [SA.alt2density_ratio(h, alt_units='km') for h in H]
+        np.testing.assert_allclose(Value, Truth, rtol=1e-12)
+
 
 class Test_alt_temp2density_ratio(unittest.TestCase):
 
@@ -384,7 +448,7 @@ class Test_alt2density(unittest.TestCase):
 
         # confirm out of range error
 
-        self.assertRaises(ValueError, SA.alt2density, 90, alt_units='km'
+        self.assertRaises(ValueError, SA.alt2density, 900, alt_units='km'
                           )
 
 
@@ -453,10 +517,27 @@ class Test_press2alt(unittest.TestCase):
 
     def test_08(self):
 
-        # check for out of range
-        # http://www.sworld.com.au/steven/space/atmosphere/
+        # check for out of range, below the pressure at 1000 km geometric
+
+        self.assertRaises(ValueError, SA.press2alt, 1e-12)
+
+    def test_09(self):
+
+        # array input, with one pressure in each layer
+
+        H = np.array([-1000, 5000, 12000, 25000, 40000, 49000, 60000, 80000])
+        P = SA.alt2press(H, alt_units='m', press_units='pa')
+        Value = SA.press2alt(P, press_units='pa', alt_units='m')
+        np.testing.assert_allclose(Value, H, rtol=1e-9, atol=1e-6)
 
-        self.assertRaises(ValueError, SA.press2alt, 0.00011025)
+    def test_10(self):
+
+        # out of range elements in an array return NaN, rather than raising
+
+        P = [24.8959, 1e-12, 0, -1]
+        Value = SA.press2alt(P)
+        self.assertLessEqual(RE(Value[0], 5000), 2e-5)
+        self.assertTrue(np.isnan(Value[1:]).all())
 
 
 class Test_press_ratio2alt(unittest.TestCase):
@@ -481,6 +562,13 @@ class Test_press_ratio2alt(unittest.TestCase):
         Truth = 20000
         self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_04(self):
+
+        # array input
+
+        Value = SA.press_ratio2alt([1, 22.225 / 29.9213])
+        np.testing.assert_allclose(Value, [0, 8000], rtol=1e-5, atol=1e-9)
+
 
 class Test_density2alt(unittest.TestCase):
 
@@ -552,10 +640,26 @@ class Test_density2alt(unittest.TestCase):
 
     def test_08(self):
 
-        # check for out of range
-        # http://www.sworld.com.au/steven/space/atmosphere/
+        # check for out of range, below the density at 1000 km geometric
+
+        self.assertRaises(ValueError, SA.density2alt, 1e-16)
+
+    def test_09(self):
 
-        self.assertRaises(ValueError, SA.density2alt, 4.3436e-07)
+        # array input, with one density in each layer
+
+        H = np.array([-1000, 5000, 12000, 25000, 40000, 49000, 60000, 80000])
+        D = SA.alt2density(H, alt_units='m', density_units='kg/m**3')
+        Value = SA.density2alt(D, density_units='kg/m**3', alt_units='m')
+        np.testing.assert_allclose(Value, H, rtol=1e-9, atol=1e-6)
+
+    def test_10(self):
+
+        # out of range elements in an array return NaN, rather than raising
+
+        Value = SA.density2alt(np.array([0.06011, 1e-16]))
+        self.assertLessEqual(RE(Value[0], 8000), 1e-5)
+        self.assertTrue(np.isnan(Value[1]))
 
 
 class Test_density_ratio2alt(unittest.TestCase):
@@ -647,6 +751,30 @@ class Test_density_alt(unittest.TestCase):
 
         self.assertRaises(ValueError, SA.density_alt, 5000, 0, DP=1e-2)
 
+    def test_12(self):
+
+        # array input, with NaN marking a missing dew point or relative
+        # humidity, agrees with one sample at a time
+
+        H = np.array([5000., 6000., 7000., 7500.])
+        T = np.array([15., 75., 75., 85.])
+        AS = np.array([29.92, 29.8, 1008., 29.8])
+        DP = np.array([np.nan, np.nan, 45., np.nan])
+        RH = np.array([np.nan, 0., np.nan, 0.8])
+        Value = SA.density_alt(H, T, AS, DP, RH, temp_units='F')
+        Truth = [SA.density_alt(5000, 15, 29.92, temp_units='F'),
+                 SA.density_alt(6000, 75, 29.8, temp_units='F'),
+                 SA.density_alt(7000, 75, 1008, 45, temp_units='F'),
+                 SA.density_alt(7500, 85, 29.8, RH=0.8, temp_units='F')]
+        np.testing.assert_allclose(Value, Truth, rtol=1e-12)
+
+    def test_13(self):
+
+        # out of range dew point in one sample of an array
+
+        self.assertRaises(ValueError, SA.density_alt, [5000, 5000], [0, 10],
+                          DP=[np.nan, 11])
+
 
 class Test_temp2speed_of_sound(unittest.TestCase):
 
@@ -717,6 +845,14 @@ class Test_pressure_alt(unittest.TestCase):
 
         self.assertRaises(ValueError, SA.pressure_alt, 1000, 846.5)
 
+    def test_05(self):
+
+        # array of altimeter settings, in both in HG and hpa
+
+        Value = SA.pressure_alt([1000, 1000], [29.82, 996])
+        Truth = [SA.pressure_alt(1000, 29.82), SA.pressure_alt(1000, 996)]
+        np.testing.assert_allclose(Value, Truth, rtol=1e-12)
+
 
 class Test_sat_press(unittest.TestCase):
 
@@ -783,6 +919,16 @@ class Test_sat_press(unittest.TestCase):
         Truth = 17.54
         self.assertLessEqual(RE(Value, Truth), 1e-3)
 
+    def test_10(self):
+
+        # array input, with the dew point used where it is not NaN
+
+        Value = SA.sat_press(T=[10, 20, 30], DP=[5, np.nan, np.nan],
+                             RH=[np.nan, 0.5, 1.])
+        Truth = [SA.sat_press(DP=5), SA.sat_press(T=20, RH=0.5),
+                 SA.sat_press(DP=30)]
+        np.testing.assert_allclose(Value, Truth, rtol=1e-12)
+
 
 class Test_density_alt2temp(unittest.TestCase):
 
@@ -802,6 +948,74 @@ class Test_density_alt2temp(unittest.TestCase):
         Truth = -22
         self.assertLessEqual(RE(Value, Truth), 1e-3)
 
+    def test_03(self):
+
+        # inverse of density_alt, with the dew point specified
+
+        T = SA.density_alt2temp(8000, 5000, alt_setting=29.5, DP=10)
+        Value = SA.density_alt(5000, T, 29.5, DP=10)
+        self.assertLessEqual(RE(Value, 8000), 1e-12)
+
+    def test_04(self):
+
+        # array input, with the relative humidity specified
+
+        DA = np.array([3000., 8000., 12000.])
+        HP = np.array([5000., 5000., 6000.])
+        RH = np.array([0., 0.5, 1.])
+        T = SA.density_alt2temp(DA, HP, RH=RH)
+        Value = [SA.density_alt(HP[i], T[i], RH=RH[i]) for i in range(3)]
+        np.testing.assert_allclose(Value, DA, rtol=1e-12)
+
+    def test_05(self):
+
+        # dew point greater than the temperature
+
+        self.assertRaises(ValueError, SA.density_alt2temp, 0, 0, DP=20)
+
+
+class Test_density_alt_table(unittest.TestCase):
+
+    def test_01(self):
+        Value = SA.density_alt_table(5000, alt_range=200, format='csv')
+        Truth = 'pressure altitude (ft),temperature (deg C)\n' \
+            '4900,6.1\n5000,5.1\n5100,4.1'
+        self.assertEqual(Value, Truth)
+
+    def test_02(self):
+
+        # array output, with temperatures in deg C and deg F
+
+        Value = SA.density_alt_table(500, alt_range=2000, alt_inc=250,
+                                     multi_units=True, format='array')
+        H = np.arange(0, 1501, 250)
+        self.assertEqual(Value.shape, (7, 3))
+        np.testing.assert_allclose(Value[:, 0], H)
+        np.testing.assert_allclose(
+            Value[:, 1], SA.density_alt2temp(500, H, temp_units='C'),
+            rtol=1e-12)
+        np.testing.assert_allclose(
+            Value[:, 2], SA.density_alt2temp(500, H, temp_units='F'),
+            rtol=1e-12)
+
+    def test_03(self):
+
+        # a table of more rows than are computed in one pass, streamed to
+        # a file object
+
+        out = io.StringIO()
+        SA.density_alt_table(3000, alt_range=6000, alt_inc=2, file=out,
+                             format='html')
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3005)
+        self.assertEqual(lines[-2], '<tr><td>6000</td><td>%.1f</td></tr>'
+                         % SA.density_alt2temp(3000, 6000))
+
+    def test_04(self):
+        self.assertRaises(ValueError, SA.density_alt_table, 5000,
+                          format='pdf')
+
+
 class Test_temp2dynamic_viscosity(unittest.TestCase):
 
     def test_01(self):
@@ -820,6 +1034,15 @@ class Test_temp2dynamic_viscosity(unittest.TestCase):
         Truth = 1.7894e-5
         self.assertLessEqual(RE(Value, Truth), 1e-4)
 
+    def test_03(self):
+
+        # array input
+
+        Value = SA.temp2dynamic_viscosity([15, -56.5], temp_units='C')
+        Truth = [1.7894e-5, 1.4216e-5]
+        np.testing.assert_allclose(Value, Truth, rtol=1e-4)
+
+
 class Test_alt2dynamic_viscosity(unittest.TestCase):
 
     def test_01(self):
@@ -839,6 +1062,400 @@ class Test_alt2dynamic_viscosity(unittest.TestCase):
         self.assertLessEqual(RE(Value, Truth), 1e-4)
 
 
+class Test_alt2kinematic_viscosity(unittest.TestCase):
+
+    def test_01(self):
+
+        # from US Standard Atmosphere, 1976
+
+        Value = SA.alt2kinematic_viscosity([0, 10000], alt_units='m')
+        Truth = [1.4607e-5,
+                 SA.alt2kinematic_viscosity(10000, alt_units='m')]
+        np.testing.assert_allclose(Value, Truth, rtol=1e-4)
+
+    def test_02(self):
+
+        # non-standard temperature, in deg C
+
+        Value = SA.alt2kinematic_viscosity(0, 30, temp_units='C')
+        u = SA.temp2dynamic_viscosity(30, temp_units='C')
+        Truth = u / (1.225 * 288.15 / 303.15)
+        self.assertLessEqual(RE(Value, Truth), 1e-12)
+
+
+class Test_alt2Re(unittest.TestCase):
+
+    def test_01(self):
+
+        # a grid of speeds, lengths, altitudes and temperatures agrees with
+        # Re and alt2kinematic_viscosity
+
+        V = np.array([50., 100., 150.]).reshape(3, 1, 1, 1)
+        L = np.array([0.5, 1., 2.]).reshape(1, 3, 1, 1)
+        H = np.array([0., 5000., 10000.]).reshape(1, 1, 3, 1)
+        T = np.array([-10., 0., 15., 30.])
+        Value = SA.alt2Re(V, L, H, T)
+        self.assertEqual(Value.shape, (3, 3, 3, 4))
+        Truth = SA.Re(V, L, SA.alt2kinematic_viscosity(H, T))
+        np.testing.assert_allclose(Value, Truth, rtol=1e-12)
+
+    def test_02(self):
+
+        # standard temperature, scalar input
+
+        Value = SA.alt2Re(100, 1, 5000)
+        Truth = SA.Re(100, 1, SA.alt2kinematic_viscosity(5000))
+        self.assertIsInstance(Value, float)
+        self.assertLessEqual(RE(Value, Truth), 1e-12)
+
+
+class Test_set_mode(unittest.TestCase):
+
+    def tearDown(self):
+        SA.set_mode('exact')
+
+    def test_01(self):
+
+        # table mode agrees with the exact equations over the whole table
+
+        H = np.linspace(-5, 84.852, 100001)
+        T = SA.alt2temp(H, alt_units='km', temp_units='K')
+        P = SA.alt2press(H, alt_units='km')
+        D = SA.alt2density(H, alt_units='km')
+        SA.set_mode('table')
+        self.assertEqual(SA.get_mode(), 'table')
+        np.testing.assert_allclose(
+            SA.alt2temp(H, alt_units='km', temp_units='K'), T, rtol=1e-14)
+        np.testing.assert_allclose(SA.alt2press(H, alt_units='km'), P,
+                                   rtol=2e-11)
+        np.testing.assert_allclose(SA.alt2density(H, alt_units='km'), D,
+                                   rtol=2e-11)
+
+    def test_02(self):
+
+        # published data, as for the exact mode tests
+
+        SA.set_mode('table')
+        Value = SA.alt2press(20, press_units='pa', alt_units='km')
+        Truth = 5474.89
+        self.assertLessEqual(RE(Value, Truth), 1e-5)
+
+        # altitudes below the table are evaluated exactly
+
+        SA.set_mode('exact')
+        Truth = SA.alt2press(-6, alt_units='km')
+        SA.set_mode('table')
+        self.assertEqual(SA.alt2press(-6, alt_units='km'), Truth)
+
+    def test_03(self):
+        self.assertRaises(ValueError, SA.set_mode, 'fast')
+        self.assertEqual(SA.get_mode(), 'exact')
+
+
+class Test_sat_press_memo(unittest.TestCase):
+
+    def tearDown(self):
+        SA.set_sat_press_memo(False)
+        SA.set_mode('exact')
+
+    def test_01(self):
+
+        # the memo agrees with the polynomial, for scalars and arrays, in
+        # either mode
+
+        DP = [k / 10. for k in range(-1000, 1001)]
+        Truth = [SA._sat_press(T) for T in DP]
+        Pv = SA.sat_press(DP=12.3)
+        SA.set_sat_press_memo()
+        self.assertEqual(sorted(SA._sat_memo), DP)
+        self.assertEqual([SA._sat_press(T) for T in DP], Truth)
+        np.testing.assert_allclose(SA._sat_press(np.array(DP)), Truth,
+                                   rtol=1e-15)
+        self.assertEqual(SA.sat_press(DP=12.3), Pv)
+        SA.set_mode('table')
+        self.assertEqual(SA.sat_press(DP=12.3), Pv)
+
+    def test_02(self):
+
+        # the memo is independent of table mode
+
+        SA.set_mode('table')
+        self.assertIsNone(SA._sat_memo)
+        SA.set_sat_press_memo()
+        SA.set_mode('exact')
+        self.assertIsNotNone(SA._sat_memo)
+        SA.set_sat_press_memo(False)
+        self.assertIsNone(SA._sat_memo)
+
+
+class Test_upper_atmosphere(unittest.TestCase):
+
+    # Truth values from NASA-TM-X-74335, at geometric altitudes of 86, 100,
+    # 150, 200, 500 and 1000 km
+
+    Z = np.array([86., 100., 150., 200., 500., 1000.])
+    H = 6356.766 * Z / (6356.766 + Z)
+
+    def test_01(self):
+        Value = SA.alt2temp(self.H, alt_units='km', temp_units='K')
+        Truth = [186.87, 195.08, 634.39, 854.56, 999.24, 1000.]
+        np.testing.assert_allclose(Value, Truth, rtol=2e-5)
+
+    def test_02(self):
+        Value = SA.alt2press(self.H, alt_units='km', press_units='pa')
+        Truth = [3.7338e-1, 3.2011e-2, 4.5422e-4, 8.4736e-5, 3.0236e-7,
+                 7.5138e-9]
+        np.testing.assert_allclose(Value, Truth, rtol=2e-3)
+
+    def test_03(self):
+        Value = SA.alt2density(self.H, alt_units='km',
+                               density_units='kg/m**3')
+        Truth = [6.958e-6, 5.604e-7, 2.076e-9, 2.541e-10, 5.215e-13,
+                 3.561e-15]
+        np.testing.assert_allclose(Value, Truth, rtol=2e-3)
+
+    def test_04(self):
+
+        # pressure and density to altitude are the inverse of altitude to
+        # pressure and density, across the top of the layers
+
+        H = np.array([5., 80., 84.852, 90., 300., 864.])
+        P = SA.alt2press(H, alt_units='km', press_units='pa')
+        Value = SA.press2alt(P, press_units='pa', alt_units='km')
+        np.testing.assert_allclose(Value, H, rtol=1e-6)
+        D = SA.alt2density(H, alt_units='km', density_units='kg/m**3')
+        Value = SA.density2alt(D, density_units='kg/m**3', alt_units='km')
+        np.testing.assert_allclose(Value, H, rtol=1e-6)
+
+    def test_06(self):
+
+        # pressure and density decrease strictly across the top of the
+        # layers, so that there is one altitude for each value near it
+
+        H = 84.852 + np.array([-1e-6, 0., 1e-6, 1e-5])
+        P = SA.alt2press(H, alt_units='km', press_units='pa')
+        D = SA.alt2density(H, alt_units='km', density_units='kg/m**3')
+        self.assertTrue(np.all(np.diff(P) < 0))
+        self.assertTrue(np.all(np.diff(D) < 0))
+        Value = SA.press2alt(SA.P85 * (1 - 1e-6), press_units='pa',
+                             alt_units='km')
+        self.assertTrue(84.852 < Value < 84.8521)
+
+    def test_05(self):
+
+        # scalar input above the layers, and table mode above the table
+
+        Value = SA.alt2density_ratio(self.H[1], alt_units='km')
+        self.assertIsInstance(Value, float)
+        self.assertLessEqual(RE(Value, 5.604e-7 / 1.225), 2e-3)
+        SA.set_mode('table')
+        try:
+            self.assertEqual(SA.alt2density_ratio(self.H[1], alt_units='km'),
+                             Value)
+        finally:
+            SA.set_mode('exact')
+
+
+class Test_layers(unittest.TestCase):
+
+    def test_01(self):
+
+        # each layer equation, evaluated at the top of the layer (a boundary
+        # belongs to the lower layer), gives the values at the base of the
+        # next layer
+
+        layers = SA._LAYERS
+        top = layers['H'][1:]
+        np.testing.assert_allclose(SA._layer_alt2temp(top), layers['T'][1:],
+                                   rtol=1e-10)
+        np.testing.assert_allclose(SA._layer_alt2press_ratio(top),
+                                   layers['PR'][1:], rtol=1e-10)
+        np.testing.assert_allclose(SA._layer_press2alt(layers['P']),
+                                   layers['H'], atol=1e-12)
+        np.testing.assert_allclose(SA._layer_density2alt(layers['Rho']),
+                                   layers['H'], atol=1e-12)
+
+    def test_02(self):
+
+        # a scalar gives exactly the same result as an array element
+
+        H = np.linspace(-5, 84.852, 1001)
+        P = SA.alt2press(H, alt_units='km', press_units='pa')
+        D = SA.alt2density(H, alt_units='km', density_units='kg/m**3')
+        for (function, values) in ((SA._layer_alt2press_ratio, H),
+                                   (SA._layer_press2alt, P),
+                                   (SA._layer_density2alt, D)):
+            self.assertEqual([function(np.array(value)) for value in values],
+                             function(values).tolist())
+
+
+class Test_geometric(unittest.TestCase):
+
+    def test_01(self):
+
+        # the 1976 model conversions, and their round trip
+
+        Z = np.array([0., 11.019, 86., 1000.])
+        H = SA.geometric2geopotential(Z, alt_units='km')
+        np.testing.assert_allclose(H, [0., 11., 84.852, 864.071], atol=1e-3)
+        np.testing.assert_allclose(
+            SA.geopotential2geometric(H, alt_units='km'), Z, rtol=1e-14)
+
+    def test_02(self):
+
+        # Lambert's equation gives the 1976 model values at 45.5425 deg, and
+        # the usual sea level gravity at the equator and the pole
+
+        Value = SA.gravity(0, latitude=np.array([45.5425, 0., 90.]))
+        np.testing.assert_allclose(Value, [9.80665, 9.78036, 9.83208],
+                                   atol=2e-5)
+        self.assertLessEqual(RE(SA.gravity(20000, latitude=45.5425),
+                                SA.gravity(20000)), 1e-6)
+        Value = SA.geometric2geopotential(100, alt_units='km', latitude=30)
+        Truth = SA.geometric2geopotential(100, alt_units='km',
+                                          latitude=np.array([30.]))
+        self.assertLessEqual(RE(Value, Truth[0]), 1e-15)
+
+    def test_03(self):
+
+        # altitude_type='geometric' converts the input and output altitudes
+
+        Z = np.array([0., 5000., 36000., 200000.])
+        H = SA.geometric2geopotential(Z)
+        np.testing.assert_allclose(
+            SA.alt2temp(Z, altitude_type='geometric'), SA.alt2temp(H),
+            rtol=1e-13)
+        np.testing.assert_allclose(
+            SA.alt2density(Z, altitude_type='geometric'), SA.alt2density(H),
+            rtol=1e-13)
+        P = SA.alt2press(Z, altitude_type='geometric')
+        np.testing.assert_allclose(P, SA.alt2press(H), rtol=1e-13)
+        np.testing.assert_allclose(
+            SA.press2alt(P, altitude_type='geometric'), Z, rtol=1e-9,
+            atol=1e-9)
+        np.testing.assert_allclose(
+            SA.density_ratio2alt(SA.alt2density_ratio(
+                Z, altitude_type='geometric'), altitude_type='geometric'),
+            Z, rtol=1e-9, atol=1e-9)
+
+    def test_04(self):
+
+        # 1000 km geometric is the top of the model
+
+        self.assertLessEqual(RE(SA.alt2temp(1000, alt_units='km',
+                                            altitude_type='geometric',
+                                            temp_units='K'), 1000.), 1e-3)
+        self.assertRaises(ValueError, SA.alt2temp, 1001, alt_units='km',
+                          altitude_type='geometric')
+        self.assertRaises(ValueError, SA.alt2temp, 1000,
+                          altitude_type='geodetic')
+
+
+class Test_Atmosphere(unittest.TestCase):
+
+    def test_01(self):
+
+        # zero ISA deviation is the standard atmosphere
+
+        atm = SA.Atmosphere.from_isa_dev(0)
+        H = np.linspace(-4000, 270000, 101)
+        np.testing.assert_allclose(atm.alt2temp(H, temp_units='K'),
+                                   SA.alt2temp(H, temp_units='K'),
+                                   rtol=1e-12)
+        np.testing.assert_allclose(atm.alt2press(H), SA.alt2press(H),
+                                   rtol=1e-12)
+
+        # Rho0 is rounded to 1.225 kg/m**3 in the standard atmosphere
+
+        np.testing.assert_allclose(atm.alt2density(H), SA.alt2density(H),
+                                   rtol=1e-6)
+        np.testing.assert_allclose(atm.alt2speed_of_sound(H),
+                                   SA.temp2speed_of_sound(SA.alt2temp(H)),
+                                   rtol=1e-12)
+
+    def test_02(self):
+
+        # ISA+20, temperature at pressure altitude, and true altitude of a
+        # pressure level (about 4% higher per 10 deg)
+
+        atm = SA.Atmosphere.from_isa_dev(36, temp_units='F')
+        HP = np.linspace(0, 250000, 101)
+        np.testing.assert_allclose(atm.press_alt2temp(HP),
+                                   SA.alt2temp(HP) + 20, atol=1e-3)
+        Value = atm.press2alt(SA.alt2press(10000))
+        Truth = 10000 + 20 * SA.Rd / SA.g * np.log(
+            101325 / SA.alt2press(10000, press_units='pa')) / 0.3048
+        self.assertLessEqual(RE(Value, Truth), 1e-6)
+
+    def test_03(self):
+
+        # sounding with the surface pressure.  Isothermal layer pressure
+        # follows the exponential, and the inversion is integrated exactly
+
+        atm = SA.Atmosphere([0, 1000, 2000, 5000], [15, 15, 20, -5], 1000,
+                            alt_units='m', temp_units='C', press_units='hpa')
+        Value = atm.alt2press(500, alt_units='m', press_units='hpa')
+        Truth = 1000 * np.exp(-SA.g * 500 / (SA.Rd * 288.15))
+        self.assertLessEqual(RE(Value, Truth), 1e-12)
+        H = np.array([0., 700., 1500., 2000., 4321.])
+        P = atm.alt2press(H, alt_units='m', press_units='pa')
+        np.testing.assert_allclose(atm.press2alt(P, press_units='pa',
+                                                 alt_units='m'), H,
+                                   rtol=1e-12, atol=1e-9)
+
+    def test_04(self):
+
+        # sounding with the pressure at each level is matched at the levels
+
+        H = [0, 1500, 3000]
+        P = [1013, 850, 700]
+        atm = SA.Atmosphere(H, [20, 12, 1], P, alt_units='m',
+                            temp_units='C', press_units='hpa')
+        np.testing.assert_allclose(atm.alt2press(H, alt_units='m',
+                                                 press_units='hpa'), P,
+                                   rtol=1e-12)
+        Value = atm.press2alt(925, press_units='hpa', alt_units='m')
+        self.assertTrue(0 < Value < 1500)
+
+    def test_05(self):
+
+        # out of range, and inconsistent levels
+
+        atm = SA.Atmosphere([0, 1000], [15, 10], 1000, alt_units='m',
+                            temp_units='C', press_units='hpa')
+        self.assertRaises(ValueError, atm.alt2temp, 1001, alt_units='m')
+        self.assertRaises(ValueError, atm.press2alt, 1001,
+                          press_units='hpa')
+
+        # in an array, out of range elements are NaN
+
+        Value = atm.alt2temp([-1, 500, 1001], alt_units='m', temp_units='C')
+        np.testing.assert_allclose(Value, [np.nan, 12.5, np.nan])
+        Value = atm.press2alt([1001, 990, 800], press_units='hpa',
+                              alt_units='m')
+        self.assertTrue(np.isnan(Value[[0, 2]]).all())
+        self.assertTrue(0 < Value[1] < 1000)
+        Value = atm.press_alt2temp([200, 500, 20000], alt_units='m')
+        self.assertTrue(np.isnan(Value[2]) and not np.isnan(Value[:2]).any())
+        self.assertRaises(ValueError, SA.Atmosphere, [0, 1000, 900],
+                          [15, 10, 5], 1000)
+        self.assertRaises(ValueError, SA.Atmosphere, [0, 1000], [15, 10],
+                          [1000, 1001])
+
+    def test_06(self):
+
+        # an Atmosphere in place of the temperature
+
+        atm = SA.Atmosphere.from_isa_dev(10)
+        H = np.array([0., 5000., 10000.])
+        np.testing.assert_allclose(
+            SA.alt_temp2density_ratio(H, atm),
+            SA.alt_temp2density_ratio(H, SA.alt2temp(H) + 10), rtol=1e-6)
+        np.testing.assert_allclose(SA.alt2Re(100, 1, H, atm),
+                                   SA.alt2Re(100, 1, H, SA.alt2temp(H) + 10),
+                                   rtol=1e-6)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
 
@@ -15,7 +15,11 @@ Run this script directly to do all the tests.
 import unittest
 import sys
 
+import numpy as np
+
 import aerocalc.unit_conversion as U
+import aerocalc.std_atm as SA
+from aerocalc.default_units import units, get_units
 
 
 def RE(value, truth):
@@ -127,6 +131,22 @@ class Test_length_conv(unittest.TestCase):
         Truth = 1
         self.assertLessEqual(RE(Value, Truth), 1e-5)
 
+    def test_07(self):
+
+        # integer array input is converted without modifying the argument
+
+        L = np.array([0, 10, 5280])
+        Value = U.length_conv(L, from_units='ft', to_units='m')
+        Truth = np.array([0, 3.048, 1609.344])
+        np.testing.assert_allclose(Value, Truth, rtol=1e-12)
+        np.testing.assert_array_equal(L, [0, 10, 5280])
+
+    def test_08(self):
+        self.assertRaises(ValueError, U.length_conv, 1, from_units='yd',
+                          to_units='m')
+        self.assertRaises(ValueError, U.length_conv, 1, from_units='m',
+                          to_units='yd')
+
 
 class Test_power_conv(unittest.TestCase):
 
@@ -319,6 +339,12 @@ class Test_temp_conv(unittest.TestCase):
         Truth = 173.15
         self.assertLessEqual(RE(Value, Truth), 1e-8)
 
+    def test_15(self):
+        Value = U.temp_conv(np.array([-40, 32, 212]), from_units='F',
+                            to_units='C')
+        Truth = np.array([-40, 0, 100])
+        np.testing.assert_allclose(Value, Truth, atol=1e-12)
+
 
 class Test_vol_conv(unittest.TestCase):
 
@@ -445,6 +471,14 @@ class Test_avgas_conv(unittest.TestCase):
         Truth *= 6.41 / 6.01
         self.assertLessEqual(RE(Value, Truth), 5e-4)
 
+    def test_06(self):
+        V = np.array([10., 20.])
+        Value = U.avgas_conv(V, from_units='USG', to_units='lb')
+        Truth = np.array([60.1, 120.2])
+        np.testing.assert_allclose(Value, Truth, rtol=5e-4)
+        np.testing.assert_array_equal(V, [10., 20.])
+
+
 class Test_mass_conv(unittest.TestCase):
 
     def test_01(self):
@@ -463,5 +497,124 @@ class Test_mass_conv(unittest.TestCase):
         self.assertLessEqual(RE(Value, Truth), 1e-8)
 
 
+class Test_converter(unittest.TestCase):
+
+    def test_01(self):
+        conv = U.converter('press', 'in HG', 'pa')
+        Value = conv(29.92)
+        Truth = 101320.4896
+        self.assertLessEqual(RE(Value, Truth), 1e-12)
+
+    def test_02(self):
+        conv = U.converter('temp', 'C', 'F')
+        self.assertEqual((conv.scale, conv.offset), (1.8, 32.))
+        np.testing.assert_allclose(conv(np.array([-40., 0., 100.])),
+                                   [-40., 32., 212.], rtol=1e-12)
+
+    def test_03(self):
+
+        # converters are cached, and agree with the *_conv functions
+
+        conv = U.converter('speed', 'kt', 'km/h')
+        self.assertIs(conv, U.converter('speed', 'kt', 'km/h'))
+        self.assertEqual(conv(250.), U.speed_conv(250., 'kt', 'km/h'))
+
+    def test_04(self):
+        self.assertRaises(ValueError, U.converter, 'speed', 'kt', 'furlong')
+        self.assertRaises(ValueError, U.converter, 'weight', 'lb', 'kg')
+
+
+class Test_units(unittest.TestCase):
+
+    def test_01(self):
+
+        # the context changes the defaults, but not explicit units, and is
+        # restored on exit
+
+        with units(length='m', temp='K'):
+            self.assertEqual(U.length_conv(1, to_units='ft'),
+                             U.length_conv(1, 'm', 'ft'))
+            self.assertEqual(U.length_conv(1, 'ft', 'm'), 0.3048)
+            self.assertEqual(SA.alt2temp(11000),
+                             SA.alt2temp(11000, 'm', 'K'))
+        self.assertEqual(U.length_conv(1, to_units='m'), 0.3048)
+        self.assertEqual(get_units('length'), 'ft')
+
+    def test_02(self):
+
+        # nested contexts, and the altitude units follow the length units
+
+        with units(length='km'):
+            self.assertEqual(get_units('alt'), 'km')
+            with units(alt='m', speed='m/s'):
+                self.assertEqual(get_units('alt'), 'm')
+                self.assertEqual(get_units('length'), 'km')
+                self.assertEqual(U.speed_conv(1, to_units='kt'),
+                                 U.speed_conv(1, 'm/s', 'kt'))
+            self.assertEqual(get_units('speed'), 'kt')
+        self.assertEqual(get_units('alt'), 'ft')
+
+    def test_03(self):
+
+        # each thread has its own context
+
+        import threading
+
+        results = {}
+
+        def run(alt_units):
+            with units(alt=alt_units):
+                for i in range(200):
+                    value = SA.alt2press_ratio(10)
+                results[alt_units] = value
+
+        threads = [threading.Thread(target=run, args=(alt_units,))
+                   for alt_units in ('ft', 'm', 'km')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for alt_units in ('ft', 'm', 'km'):
+            self.assertEqual(results[alt_units],
+                             SA.alt2press_ratio(10, alt_units=alt_units))
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'needs contextvars')
+    def test_04(self):
+
+        # a context set in a copied context (as for each asyncio task) does
+        # not leak into the caller
+
+        import contextvars
+
+        def run(temp_units):
+            with units(temp=temp_units):
+                inner = contextvars.copy_context().run(SA.alt2temp, 0)
+                return (SA.alt2temp(0), inner)
+
+        Value = [contextvars.copy_context().run(run, temp_units)
+                 for temp_units in ('C', 'F', 'K')]
+        self.assertEqual(Value, [(15., 15.), (59., 59.), (288.15, 288.15)])
+        self.assertEqual(SA.alt2temp(0), 15.)
+
+    def test_05(self):
+
+        # unknown kinds are an error
+
+        self.assertRaises(ValueError, units(altitude='m').__enter__)
+        self.assertRaises(ValueError, get_units, 'altitude')
+
+    def test_06(self):
+
+        # conversions that convert internally through another kind of units
+        # are not changed by a context for that kind
+
+        Truth = (U.avgas_conv(10, 'kg', 'USG'), U.avgas_conv(10, 'USG', 'kg'))
+        with units(weight='kg'):
+            self.assertEqual((U.avgas_conv(10, 'kg', 'USG'),
+                              U.avgas_conv(10, 'USG', 'kg')), Truth)
+        with units(avgas='kg'):
+            self.assertEqual(U.avgas_conv(10, to_units='USG'), Truth[0])
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=5)